@@ -0,0 +1,25 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import asyncio
+from src.core.database.infrastructure import db_helper
+from src.api.v1.organization.repository import OrganizationRepository
+
+
+async def backfill_organization_declensions(only_missing: bool) -> None:
+    async with db_helper.sessionmaker() as session:
+        count = await OrganizationRepository(session).backfill_declensions(only_missing=only_missing)
+        print(f"Обновлено организаций: {count}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--all", action="store_true", help="пересчитать все организации, а не только пустые")
+    args = parser.parse_args()
+    try:
+        asyncio.run(backfill_organization_declensions(only_missing=not args.all))
+    except KeyboardInterrupt:
+        pass
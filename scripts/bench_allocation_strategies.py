@@ -0,0 +1,118 @@
+"""
+Бенчмарк стратегий списания часов на синтетической истории пользователя.
+
+Генерирует N овертаймов за последние годы и бронирует отгулы, пока хватает
+часов. Для каждой стратегии печатает время одного распределения и
+фрагментацию: сколько овертаймов осталось частично списанными и сколько
+строк затрагивает одно списание. БД не используется.
+
+    python scripts/bench_allocation_strategies.py --overtimes 10000 --day-offs 500
+"""
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import random
+import statistics
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+from src.api.v1.day_off.errors import InsufficientOvertimeHours
+from src.api.v1.day_off.overtime_allocator import AllocationStrategy, OvertimeAllocator
+
+
+@dataclass
+class SyntheticOvertime:
+    oid: uuid.UUID
+    o_date: date
+    hours: int
+    remaining_hours: int
+
+
+def generate_history(count: int, today: date, seed: int) -> list[SyntheticOvertime]:
+    rnd = random.Random(seed)
+    history = []
+    for _ in range(count):
+        hours = rnd.choice((1, 2, 2, 3, 4, 4, 6, 8, 12))
+        history.append(
+            SyntheticOvertime(
+                oid=uuid.uuid4(),
+                o_date=today - timedelta(days=rnd.randrange(3 * 365)),
+                hours=hours,
+                remaining_hours=hours,
+            )
+        )
+    return history
+
+
+def run(
+    strategy: AllocationStrategy,
+    history: list[SyntheticOvertime],
+    day_offs: int,
+    required_hours: int,
+    today: date,
+    lifetime_days: int,
+) -> None:
+    overtimes = [
+        SyntheticOvertime(o.oid, o.o_date, o.hours, o.remaining_hours) for o in history
+    ]
+    by_oid = {overtime.oid: overtime for overtime in overtimes}
+    timings = []
+    touched = []
+    booked = 0
+
+    for index in range(day_offs):
+        available = [overtime for overtime in overtimes if overtime.remaining_hours > 0]
+        started = time.perf_counter()
+        try:
+            allocations = OvertimeAllocator.allocate_hours(
+                overtimes=available,
+                required_hours=required_hours,
+                strategy=strategy,
+                on_date=today + timedelta(days=index),
+                lifetime_days=lifetime_days,
+            )
+        except InsufficientOvertimeHours:
+            break
+        timings.append(time.perf_counter() - started)
+        touched.append(len(allocations))
+        booked += 1
+
+        for allocation in allocations:
+            by_oid[allocation["overtime_oid"]].remaining_hours -= allocation["hours_used"]
+
+    partial = sum(1 for o in overtimes if 0 < o.remaining_hours < o.hours)
+    leftover = sum(o.remaining_hours for o in overtimes)
+    p50 = statistics.median(timings) * 1e3 if timings else 0.0
+    p95 = statistics.quantiles(timings, n=20)[-1] * 1e3 if len(timings) > 1 else p50
+    print(
+        f"  {strategy.value:<15} booked {booked:5d}  p50 {p50:7.2f} ms  p95 {p95:7.2f} ms"
+        f"  rows/day off {statistics.mean(touched) if touched else 0:5.2f}"
+        f"  partial {partial:5d}  leftover {leftover:6d} h"
+    )
+
+
+def main(overtimes: int, day_offs: int, required_hours: int, lifetime_days: int, seed: int) -> None:
+    today = date.today()
+    history = generate_history(overtimes, today, seed)
+    print(
+        f"{overtimes} overtimes, {sum(o.hours for o in history)} h, "
+        f"{day_offs} day offs x {required_hours} h, lifetime {lifetime_days or '-'} days"
+    )
+    for strategy in AllocationStrategy:
+        run(strategy, history, day_offs, required_hours, today, lifetime_days)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--overtimes", type=int, default=10000)
+    parser.add_argument("--day-offs", type=int, default=500)
+    parser.add_argument("--required-hours", type=int, default=8)
+    parser.add_argument("--lifetime-days", type=int, default=365)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    main(args.overtimes, args.day_offs, args.required_hours, args.lifetime_days, args.seed)
@@ -0,0 +1,103 @@
+"""
+Микро-бенчмарк накладных расходов NotificationMiddleware на один запрос.
+
+Сравнивает прежнюю реализацию на BaseHTTPMiddleware с ASGI-middleware
+на обычной странице и на StreamingResponse. БД не используется: счётчик
+заранее считается сверенным.
+
+    python scripts/bench_notification_middleware.py --requests 5000
+"""
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.responses import HTMLResponse, StreamingResponse
+from httpx import ASGITransport, AsyncClient
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from src.middlewares.notification.counter import pending_registrations
+from src.middlewares.notification.middleware import NotificationMiddleware, renders_navbar
+
+
+class LegacyNotificationMiddleware(BaseHTTPMiddleware):
+    """Прежняя реализация без запроса к БД, чтобы сравнивать только обёртку."""
+
+    async def dispatch(self, request: Request, call_next):
+        if renders_navbar(request):
+            request.state.notifications_count_user = pending_registrations.value
+        return await call_next(request)
+
+
+def create_app(middleware_class=None) -> FastAPI:
+    app = FastAPI()
+    if middleware_class is not None:
+        app.add_middleware(middleware_class)
+
+    @app.get("/page", response_class=HTMLResponse)
+    async def page(request: Request):
+        return f"<nav>{getattr(request.state, 'notifications_count_user', 0)}</nav>"
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for _ in range(16):
+                yield b"x" * 4096
+
+        return StreamingResponse(chunks(), media_type="application/octet-stream")
+
+    return app
+
+
+async def measure(app: FastAPI, path: str, requests: int) -> list[float]:
+    timings = []
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://localhost") as client:
+        client.cookies.set("access_token", "token")
+        headers = {"Accept": "text/html"}
+        for _ in range(100):
+            await client.get(path, headers=headers)
+
+        for _ in range(requests):
+            started = time.perf_counter()
+            await client.get(path, headers=headers)
+            timings.append(time.perf_counter() - started)
+    return timings
+
+
+async def main(requests: int) -> None:
+    pending_registrations.set(5)
+
+    apps = {
+        "none": create_app(),
+        "BaseHTTPMiddleware": create_app(LegacyNotificationMiddleware),
+        "ASGI": create_app(NotificationMiddleware),
+    }
+
+    for path in ("/page", "/stream"):
+        baseline = None
+        print(f"\n{path} ({requests} requests)")
+        for name, app in apps.items():
+            timings = await measure(app, path, requests)
+            median = statistics.median(timings) * 1e6
+            p95 = statistics.quantiles(timings, n=20)[-1] * 1e6
+            if baseline is None:
+                baseline = median
+                print(f"  {name:<20} p50 {median:8.1f} us  p95 {p95:8.1f} us")
+            else:
+                print(
+                    f"  {name:<20} p50 {median:8.1f} us  p95 {p95:8.1f} us"
+                    f"  overhead {median - baseline:+8.1f} us"
+                )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=3000)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
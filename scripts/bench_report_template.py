@@ -0,0 +1,116 @@
+"""
+Бенчмарк генерации отчёта .docx.
+
+Сравнивает прежний путь (`Document(TEMPLATE_PATH)` на каждый отчёт) с
+кэшированным шаблоном: время на отчёт и выделенная память (tracemalloc).
+Отдельно меряется HTML-просмотр.
+
+    python scripts/bench_report_template.py --reports 500
+"""
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import statistics
+import time
+import tracemalloc
+from io import BytesIO
+
+from docx import Document
+
+from src.api.v1.day_off.generate_report import TEMPLATE_PATH, ReportGenerator, get_template
+from src.api.v1.day_off.report_formats import ReportFormat, render_report
+
+
+DATA = {
+    "date_report": "01.03.2024",
+    "date_day_off": "04.03.2024",
+    "info_overtimes": [
+        {"description": "Дежурство", "hours": 5},
+        {"description": "Выезд на объект", "hours": 3},
+    ],
+    "full_name_user": "И.И. Иванов",
+    "position_user": "Инженер",
+    "rank_user": "лейтенант",
+    "name_organization": "Управления",
+    "organization_name_boss": "Петрову П.П.",
+    "organization_position_boss": "Начальнику",
+    "organization_rank_boss": "полковнику",
+    "department_user": "Отдел связи",
+}
+
+
+class LegacyReportGenerator(ReportGenerator):
+    """
+    Прежняя реализация: шаблон читается и разбирается с диска каждый раз,
+    плейсхолдеры ищутся перебором абзацев по всем ключам.
+    """
+
+    def __init__(self, data: dict):
+        self.data = data
+        self.doc = Document(TEMPLATE_PATH)
+
+    def replace_placeholders(self):
+        for paragraph in self.doc.paragraphs:
+            for key, value in self.data.items():
+                if key in paragraph.text:
+                    if isinstance(value, list):
+                        value = self.format_overtimes(value)
+                    paragraph.text = paragraph.text.replace(key, value)
+                    for run in paragraph.runs:
+                        self.set_font(run)
+
+    def get_report_bytes(self):
+        self.replace_placeholders()
+        file_stream = BytesIO()
+        self.doc.save(file_stream)
+        file_stream.seek(0)
+        return file_stream
+
+
+def measure(generator_class, data: dict, reports: int) -> tuple[list[float], float]:
+    for _ in range(20):
+        generator_class(data=data).get_report_bytes()
+
+    timings = []
+    for _ in range(reports):
+        started = time.perf_counter()
+        generator_class(data=data).get_report_bytes()
+        timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    for _ in range(50):
+        generator_class(data=data).get_report_bytes()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return timings, peak / 1024
+
+
+def main(reports: int) -> None:
+    # Без данных измеряется только загрузка шаблона и сборка пакета
+    for title, data in (("template load + save", {}), ("full report", DATA)):
+        print(f"\n{title} ({reports} reports)")
+        for name, generator_class in (("legacy", LegacyReportGenerator), ("cached", ReportGenerator)):
+            timings, peak_kib = measure(generator_class, data, reports)
+            median = statistics.median(timings) * 1e3
+            p95 = statistics.quantiles(timings, n=20)[-1] * 1e3
+            print(f"  {name:<8} p50 {median:6.2f} ms  p95 {p95:6.2f} ms  peak {peak_kib:8.1f} KiB")
+
+    # Просмотр в браузере: HTML по индексу шаблона, без сборки .docx
+    get_template().get()
+    timings = []
+    for _ in range(reports):
+        started = time.perf_counter()
+        render_report(DATA, ReportFormat.HTML.value)
+        timings.append(time.perf_counter() - started)
+    print(f"\nhtml preview ({reports} reports)")
+    print(f"  {'html':<8} p50 {statistics.median(timings) * 1e3:6.2f} ms  p95 {statistics.quantiles(timings, n=20)[-1] * 1e3:6.2f} ms")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--reports", type=int, default=300)
+    args = parser.parse_args()
+    main(args.reports)
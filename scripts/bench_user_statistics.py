@@ -0,0 +1,149 @@
+"""
+Бенчмарк статистики профиля (`/user/me`, `/user/statistics/{year}`).
+
+Создаёт в БД из настроек временного пользователя с N овертаймами за
+несколько лет и сравнивает прежние четыре запроса по `overtimes` с
+одним запросом по помесячным итогам и балансу. После замера пользователь удаляется вместе с овертаймами и отгулами.
+
+    python scripts/bench_user_statistics.py --overtimes 5000 --runs 200
+"""
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+import uuid
+from datetime import date, timedelta
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.database.infrastructure import db_helper
+from src.models import DayOff, Overtime, Role, User, WorkSchedule
+from src.api.v1.overtime.balance import OvertimeBalanceRepository
+from src.api.v1.overtime.rollup import OvertimeRollupRepository
+from src.api.v1.user.repository import UserRepository
+
+
+async def legacy_statistics(session: AsyncSession, user: User, selected_year: int = None) -> dict:
+    """Прежняя реализация: четыре последовательных запроса."""
+    result = await session.execute(
+        select(func.extract("year", Overtime.o_date).distinct())
+        .where(Overtime.user_oid == user.oid)
+    )
+    available_years = [int(row[0]) for row in result.fetchall() if row[0] is not None]
+    selected_year = selected_year or (max(available_years) if available_years else date.today().year)
+
+    result = await session.execute(
+        select(func.extract("month", Overtime.o_date), func.sum(Overtime.hours))
+        .where(Overtime.user_oid == user.oid, func.extract("year", Overtime.o_date) == selected_year)
+        .group_by(func.extract("month", Overtime.o_date))
+    )
+    monthly_overtime = {int(month): hours for month, hours in result.fetchall()}
+
+    result = await session.execute(
+        select(
+            func.count(Overtime.oid),
+            func.count().filter(Overtime.is_used == True),
+            func.count().filter(Overtime.is_used == False),
+            func.sum(Overtime.remaining_hours),
+        ).where(Overtime.user_oid == user.oid)
+    )
+    overtime_totals = result.first()
+
+    today = date.today()
+    result = await session.execute(
+        select(
+            func.count(DayOff.oid),
+            func.count().filter(DayOff.o_date < today),
+            func.count().filter(DayOff.o_date >= today),
+        ).where(DayOff.user_oid == user.oid)
+    )
+    day_off_totals = result.first()
+    return {"years": available_years, "monthly": monthly_overtime, "totals": (overtime_totals, day_off_totals)}
+
+
+async def seed(session: AsyncSession, overtimes: int, seed_value: int) -> User:
+    rnd = random.Random(seed_value)
+    user = User(
+        username=f"bench_{uuid.uuid4().hex[:12]}",
+        full_name="Bench User",
+        position="user",
+        rank="user",
+        role=Role.USER,
+        work_schedule=WorkSchedule.DAILY,
+        hashed_password="-",
+    )
+    session.add(user)
+    await session.flush()
+
+    today = date.today()
+    rows = []
+    for _ in range(overtimes):
+        hours = rnd.choice((1, 2, 4, 8))
+        rows.append({
+            "oid": uuid.uuid4(),
+            "user_oid": user.oid,
+            "o_date": today - timedelta(days=rnd.randrange(5 * 365)),
+            "hours": hours,
+            "remaining_hours": hours,
+            "description": "bench",
+            "is_used": False,
+        })
+    await session.execute(insert(Overtime), rows)
+    await session.execute(
+        insert(DayOff),
+        [
+            {"oid": uuid.uuid4(), "user_oid": user.oid, "o_date": today - timedelta(days=day), "reason": "bench"}
+            for day in range(0, 5 * 365, 7)
+        ],
+    )
+    await session.commit()
+    await OvertimeBalanceRepository(session).rebuild(user_oid=user.oid)
+    await OvertimeRollupRepository(session).rebuild(user_oid=user.oid)
+    return user
+
+
+async def measure(func_, session: AsyncSession, user: User, runs: int) -> list[float]:
+    for _ in range(10):
+        await func_(session, user)
+
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        await func_(session, user)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+async def single_statement(session: AsyncSession, user: User) -> dict:
+    return await UserRepository(session).get_statistics_current_user(user)
+
+
+async def main(overtimes: int, runs: int, seed_value: int) -> None:
+    async with db_helper.sessionmaker() as session:
+        user = await seed(session, overtimes, seed_value)
+        try:
+            print(f"{overtimes} overtimes, {runs} runs")
+            for name, func_ in (("4 queries", legacy_statistics), ("1 query", single_statement)):
+                timings = await measure(func_, session, user, runs)
+                p50 = statistics.median(timings) * 1e3
+                p95 = statistics.quantiles(timings, n=20)[-1] * 1e3
+                print(f"  {name:<10} p50 {p50:7.2f} ms  p95 {p95:7.2f} ms")
+        finally:
+            await session.execute(delete(User).where(User.oid == user.oid))
+            await session.commit()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--overtimes", type=int, default=5000)
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    asyncio.run(main(args.overtimes, args.runs, args.seed))
@@ -0,0 +1,23 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import asyncio
+import uuid
+from src.core.database.infrastructure import db_helper
+from src.api.v1.overtime.rollup import OvertimeRollupRepository
+
+
+async def rebuild_overtime_rollups(user_oid: uuid.UUID | None = None) -> None:
+    async with db_helper.sessionmaker() as session:
+        rows = await OvertimeRollupRepository(session).rebuild(user_oid=user_oid)
+        print(f"Пересчитано месяцев: {rows}")
+
+
+if __name__ == '__main__':
+    user_oid = uuid.UUID(sys.argv[1]) if len(sys.argv) > 1 else None
+    try:
+        asyncio.run(rebuild_overtime_rollups(user_oid))
+    except KeyboardInterrupt:
+        pass
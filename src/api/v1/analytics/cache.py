@@ -0,0 +1,10 @@
+from src.core.cache import TTLCache
+from src.core.config import settings
+from src.api.v1.analytics.schemas import AnalyticsOut
+
+
+# Сводки по (область, oid, год). Новые записи видны не позже чем через ttl.
+analytics_cache: TTLCache[AnalyticsOut] = TTLCache(
+    maxsize=settings.cache.analytics_maxsize,
+    ttl=settings.cache.analytics_ttl_seconds,
+)
@@ -0,0 +1,7 @@
+from fastapi import HTTPException, status
+
+
+class AnalyticsScopeForbidden(HTTPException):
+    def __init__(self):
+        self.detail = "Статистика доступна только по своему отделу."
+        super().__init__(status_code=status.HTTP_403_FORBIDDEN, detail=self.detail)
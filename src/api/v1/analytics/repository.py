@@ -0,0 +1,117 @@
+import uuid
+
+from datetime import date
+from typing import List, Tuple
+from fastapi import HTTPException
+from sqlalchemy import ColumnElement, Integer, cast, func, select
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.core.repo.base import BaseRepo
+from src.models import DayOff, OvertimeBalance, OvertimeMonthlyRollup, User
+from src.api.v1.analytics.schemas import AnalyticsScope
+
+
+class AnalyticsRepository(BaseRepo):
+    """
+    Агрегаты по отделу или организации. Каждый запрос группирует строки
+    пользователей области: помесячные итоги, балансы и отгулы за год по
+    диапазону дат, без чтения сырых овертаймов.
+    """
+
+    @staticmethod
+    def _in_scope(scope: AnalyticsScope, oid: uuid.UUID) -> ColumnElement[bool]:
+        if scope == AnalyticsScope.DEPARTMENT:
+            return User.department_oid == oid
+        return User.organization_oid == oid
+
+    async def get_overtime_by_month(
+        self,
+        scope: AnalyticsScope,
+        oid: uuid.UUID,
+        year: int,
+    ) -> List[Tuple[int, int, int]]:
+        """(месяц, часы, число овертаймов) за год."""
+        stmt = (
+            select(
+                OvertimeMonthlyRollup.month,
+                func.sum(OvertimeMonthlyRollup.hours),
+                func.sum(OvertimeMonthlyRollup.overtimes_count),
+            )
+            .join(User, User.oid == OvertimeMonthlyRollup.user_oid)
+            .where(self._in_scope(scope, oid), OvertimeMonthlyRollup.year == year)
+            .group_by(OvertimeMonthlyRollup.month)
+            .order_by(OvertimeMonthlyRollup.month)
+        )
+        try:
+            result = await self.session.execute(stmt)
+            return [tuple(row) for row in result.all()]
+        except SQLAlchemyError as e:
+            raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+    async def get_balance(
+        self,
+        scope: AnalyticsScope,
+        oid: uuid.UUID,
+    ) -> Tuple[int, int, int, int]:
+        """(пользователей, всего часов, списано, остаток) по области."""
+        stmt = (
+            select(
+                func.count(User.oid),
+                func.coalesce(func.sum(OvertimeBalance.total_hours), 0),
+                func.coalesce(func.sum(OvertimeBalance.used_hours), 0),
+                func.coalesce(func.sum(OvertimeBalance.remaining_hours), 0),
+            )
+            .select_from(User)
+            .outerjoin(OvertimeBalance, OvertimeBalance.user_oid == User.oid)
+            .where(self._in_scope(scope, oid))
+        )
+        try:
+            result = await self.session.execute(stmt)
+            return tuple(result.one())
+        except SQLAlchemyError as e:
+            raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+    async def get_day_offs_by_month(
+        self,
+        scope: AnalyticsScope,
+        oid: uuid.UUID,
+        year: int,
+    ) -> List[Tuple[int, int]]:
+        """(месяц, число отгулов) за год."""
+        month = cast(func.extract("month", DayOff.o_date), Integer)
+        stmt = (
+            select(month, func.count(DayOff.oid))
+            .join(User, User.oid == DayOff.user_oid)
+            .where(
+                self._in_scope(scope, oid),
+                DayOff.o_date >= date(year, 1, 1),
+                DayOff.o_date < date(year + 1, 1, 1),
+            )
+            .group_by(month)
+            .order_by(month)
+        )
+        try:
+            result = await self.session.execute(stmt)
+            return [tuple(row) for row in result.all()]
+        except SQLAlchemyError as e:
+            raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+    async def get_top_balances(
+        self,
+        scope: AnalyticsScope,
+        oid: uuid.UUID,
+        limit: int,
+    ) -> List[Tuple[uuid.UUID, str, int]]:
+        """Пользователи с наибольшим остатком часов."""
+        stmt = (
+            select(User.oid, User.full_name, OvertimeBalance.remaining_hours)
+            .join(OvertimeBalance, OvertimeBalance.user_oid == User.oid)
+            .where(self._in_scope(scope, oid), OvertimeBalance.remaining_hours > 0)
+            .order_by(OvertimeBalance.remaining_hours.desc(), User.full_name)
+            .limit(limit)
+        )
+        try:
+            result = await self.session.execute(stmt)
+            return [tuple(row) for row in result.all()]
+        except SQLAlchemyError as e:
+            raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
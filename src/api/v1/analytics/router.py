@@ -0,0 +1,64 @@
+from typing import Annotated, Optional
+import uuid
+from fastapi import APIRouter, Depends, Path, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.database.infrastructure import db_helper
+from src.models import Role
+from src.api.v1.auth.dependencies import get_current_claims
+from src.api.v1.auth.permissions import RoleEnforced
+from src.api.v1.auth.schemas import UserClaims
+from src.api.v1.analytics.errors import AnalyticsScopeForbidden
+from src.api.v1.analytics.schemas import AnalyticsOut, AnalyticsScope
+from src.api.v1.analytics.service import AnalyticsService
+
+
+router = APIRouter(
+    prefix="/analytics",
+    tags=["analytics"],
+)
+
+
+@router.get(
+    "/department/{oid}",
+    response_model=AnalyticsOut,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(RoleEnforced([Role.SUPERUSER, Role.MODERATOR]))],
+    name="analytics:department",
+    description="Overtime, balance and day off aggregates for a department",
+)
+async def get_department_analytics(
+    session: Annotated[AsyncSession, Depends(db_helper.get_session)],
+    oid: Annotated[uuid.UUID, Path()],
+    year: Optional[int] = Query(None, ge=2000, le=2100),
+    current_user: UserClaims = Depends(get_current_claims),
+):
+    # Модератор видит только свой отдел
+    if current_user.role != Role.SUPERUSER and current_user.department_oid != oid:
+        raise AnalyticsScopeForbidden()
+
+    return await AnalyticsService(session).get_summary(
+        scope=AnalyticsScope.DEPARTMENT,
+        oid=oid,
+        year=year,
+    )
+
+
+@router.get(
+    "/organization/{oid}",
+    response_model=AnalyticsOut,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(RoleEnforced([Role.SUPERUSER]))],
+    name="analytics:organization",
+    description="Overtime, balance and day off aggregates for an organization",
+)
+async def get_organization_analytics(
+    session: Annotated[AsyncSession, Depends(db_helper.get_session)],
+    oid: Annotated[uuid.UUID, Path()],
+    year: Optional[int] = Query(None, ge=2000, le=2100),
+):
+    return await AnalyticsService(session).get_summary(
+        scope=AnalyticsScope.ORGANIZATION,
+        oid=oid,
+        year=year,
+    )
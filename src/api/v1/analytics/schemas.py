@@ -0,0 +1,43 @@
+import uuid
+from enum import Enum
+from typing import Dict, List
+from pydantic import BaseModel, Field
+
+
+class AnalyticsScope(str, Enum):
+    DEPARTMENT = "department"
+    ORGANIZATION = "organization"
+
+
+class OvertimeSummary(BaseModel):
+    total_hours: int = Field(description='Overtime hours worked in the year')
+    overtimes_count: int
+    monthly: Dict[int, int] = Field(description='Hours by month number')
+
+
+class BalanceSummary(BaseModel):
+    total_hours: int
+    used_hours: int
+    remaining_hours: int = Field(description='Hours not yet spent on day offs')
+
+
+class DayOffSummary(BaseModel):
+    total: int = Field(description='Day offs taken in the year')
+    monthly: Dict[int, int] = Field(description='Day offs by month number')
+
+
+class UserBalance(BaseModel):
+    user_oid: uuid.UUID
+    full_name: str
+    remaining_hours: int
+
+
+class AnalyticsOut(BaseModel):
+    scope: AnalyticsScope
+    oid: uuid.UUID
+    year: int
+    users: int
+    overtime: OvertimeSummary
+    balance: BalanceSummary
+    day_offs: DayOffSummary
+    top_balances: List[UserBalance]
@@ -0,0 +1,69 @@
+import uuid
+from datetime import date
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.v1.analytics.cache import analytics_cache
+from src.api.v1.analytics.repository import AnalyticsRepository
+from src.api.v1.analytics.schemas import (
+    AnalyticsOut,
+    AnalyticsScope,
+    BalanceSummary,
+    DayOffSummary,
+    OvertimeSummary,
+    UserBalance,
+)
+
+
+TOP_BALANCES = 10
+
+
+class AnalyticsService:
+    def __init__(self, session: AsyncSession):
+        self.repository = AnalyticsRepository(session=session)
+
+    async def get_summary(
+        self,
+        scope: AnalyticsScope,
+        oid: uuid.UUID,
+        year: Optional[int] = None,
+    ) -> AnalyticsOut:
+        year = year or date.today().year
+        key = (scope, oid, year)
+
+        summary = analytics_cache.get(key)
+        if summary is None:
+            summary = await self._build_summary(scope=scope, oid=oid, year=year)
+            analytics_cache.set(key, summary)
+        return summary
+
+    async def _build_summary(self, scope: AnalyticsScope, oid: uuid.UUID, year: int) -> AnalyticsOut:
+        overtime_months = await self.repository.get_overtime_by_month(scope=scope, oid=oid, year=year)
+        users, total_hours, used_hours, remaining_hours = await self.repository.get_balance(scope=scope, oid=oid)
+        day_off_months = await self.repository.get_day_offs_by_month(scope=scope, oid=oid, year=year)
+        top_balances = await self.repository.get_top_balances(scope=scope, oid=oid, limit=TOP_BALANCES)
+
+        return AnalyticsOut(
+            scope=scope,
+            oid=oid,
+            year=year,
+            users=users,
+            overtime=OvertimeSummary(
+                total_hours=sum(hours for _, hours, _ in overtime_months),
+                overtimes_count=sum(count for _, _, count in overtime_months),
+                monthly={month: hours for month, hours, _ in overtime_months},
+            ),
+            balance=BalanceSummary(
+                total_hours=total_hours,
+                used_hours=used_hours,
+                remaining_hours=remaining_hours,
+            ),
+            day_offs=DayOffSummary(
+                total=sum(count for _, count in day_off_months),
+                monthly=dict(day_off_months),
+            ),
+            top_balances=[
+                UserBalance(user_oid=user_oid, full_name=full_name, remaining_hours=hours)
+                for user_oid, full_name, hours in top_balances
+            ],
+        )
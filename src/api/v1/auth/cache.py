@@ -0,0 +1,29 @@
+import uuid
+
+from src.core.cache import TTLCache
+from src.core.config import settings
+from src.models import User
+
+
+# Аутентифицированные пользователи вместе с department_rel и organization_rel.
+# Объекты отсоединены от сессии и используются только для чтения.
+user_cache: TTLCache[User] = TTLCache(
+    maxsize=settings.cache.user_maxsize,
+    ttl=settings.cache.user_ttl_seconds,
+)
+
+
+# Версии токенов для проверки токенов с утверждениями без загрузки пользователя.
+token_versions: TTLCache[int] = TTLCache(
+    maxsize=settings.cache.user_maxsize,
+    ttl=settings.cache.token_version_ttl_seconds,
+)
+
+
+def invalidate_user(user_oid: uuid.UUID) -> None:
+    user_cache.invalidate(user_oid)
+    token_versions.invalidate(user_oid)
+
+
+def invalidate_all_users() -> None:
+    user_cache.clear()
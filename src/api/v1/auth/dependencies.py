@@ -1,8 +1,10 @@
+from dataclasses import dataclass
 from typing import Annotated
 from jose import jwt, JWTError
 from fastapi import Depends, HTTPException, Request, Security, status
 from fastapi.security import APIKeyCookie
 from fastapi.responses import RedirectResponse
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.config import settings
@@ -12,45 +14,102 @@ from src.models import User
 from src.api.v1.auth.service import AuthService
 
 from src.api.v1.auth.jwt import ALGORITHM
-from src.api.v1.auth.schemas import TokenPayload
+from src.api.v1.auth.schemas import TokenPayload, UserClaims
 
 
 cookie_scheme = APIKeyCookie(name="access_token", auto_error=False)
 
 
-async def get_current_user(
-    session: Annotated[AsyncSession, Depends(db_helper.get_session)],
-    token: Annotated[str, Security(cookie_scheme)],
-):
-    credentials_exception = HTTPException(
+@dataclass
+class RequestIdentity:
+    """Пользователь и сессия, общие для всех зависимостей одного запроса."""
+
+    user: User
+    session: AsyncSession
+
+
+def credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    not_authenticated = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Not authenticated",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+
+
+def decode_token(token: str) -> TokenPayload:
     if not token:
-        raise not_authenticated
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     try:
         payload = jwt.decode(token, settings.api.secret_key, algorithms=[ALGORITHM])
-        token_data = TokenPayload(**payload)
-    except (JWTError, KeyError):
-        raise credentials_exception
+        return TokenPayload(**payload)
+    except (JWTError, KeyError, ValidationError):
+        raise credentials_exception()
+
+
+async def get_current_user(
+    request: Request,
+    session: Annotated[AsyncSession, Depends(db_helper.get_session)],
+    token: Annotated[str, Security(cookie_scheme)],
+):
+    # Пользователь уже определён в рамках этого запроса
+    user = getattr(request.state, "current_user", None)
+    if user is not None:
+        return user
+
+    token_data = decode_token(token)
 
-    user: User = await AuthService(session).get_user_by_id(user_oid=token_data.user_oid)
+    user: User = await AuthService(session).get_current_user(user_oid=token_data.user_oid)
     if not user:
-        raise credentials_exception
+        raise credentials_exception()
 
+    # Токен выпущен до смены роли, отдела или блокировки
+    if token_data.ver != user.token_version:
+        raise credentials_exception()
+
+    request.state.current_user = user
     return user
 
 
-def get_is_authenticated(request: Request):
-    return "access_token" in request.cookies
+async def get_current_claims(
+    request: Request,
+    session: Annotated[AsyncSession, Depends(db_helper.get_session)],
+    token: Annotated[str, Security(cookie_scheme)],
+) -> UserClaims:
+    """
+    Роль и принадлежность пользователя без загрузки ORM-модели.
+
+    Если токен содержит утверждения, достаточно проверить версию токена
+    по кэшу. Для токенов без утверждений загружается пользователь.
+    """
+    claims = getattr(request.state, "current_claims", None)
+    if claims is not None:
+        return claims
 
+    token_data = decode_token(token)
 
+    if token_data.has_claims:
+        version = await AuthService(session).get_token_version(user_oid=token_data.user_oid)
+        if version is None or version != token_data.ver:
+            raise credentials_exception()
+        claims = UserClaims.from_token(token_data)
+    else:
+        user = await get_current_user(request=request, session=session, token=token)
+        claims = UserClaims.from_user(user)
 
+    request.state.current_claims = claims
+    return claims
 
 
+async def get_request_identity(
+    session: Annotated[AsyncSession, Depends(db_helper.get_session)],
+    current_user: Annotated[User, Depends(get_current_user)],
+) -> RequestIdentity:
+    return RequestIdentity(user=current_user, session=session)
+
+
+def get_is_authenticated(request: Request):
+    return "access_token" in request.cookies
@@ -0,0 +1,11 @@
+from fastapi import HTTPException, status
+
+
+class PasswordHasherBusy(HTTPException):
+    def __init__(self):
+        self.detail = "Слишком много попыток входа. Повторите через несколько секунд."
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=self.detail,
+            headers={"Retry-After": "1"},
+        )
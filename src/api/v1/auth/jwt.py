@@ -1,20 +1,42 @@
-import uuid
+from typing import Optional
 from jose import jwt
 from datetime import datetime, timedelta, timezone
 
 from src.core.config import settings
+from src.models import User
 from src.api.v1.auth.schemas import Token
 
 ALGORITHM = "HS256"
 access_token_jwt_subject = "access"
 
+# Служебные поля, которые выставляются при каждом выпуске токена
+REISSUED_FIELDS = ("exp", "iat", "sub")
 
-def create_token(user_oid: uuid.UUID) -> Token:
+
+def build_token_claims(user: User) -> dict:
+    """Данные пользователя, которые попадают в токен."""
+    data = {
+        "user_oid": str(user.oid),
+        "ver": user.token_version or 0,
+    }
+    if settings.api.token_claims:
+        data.update(
+            {
+                "role": user.role.value,
+                "department_oid": str(user.department_oid) if user.department_oid else None,
+                "organization_oid": str(user.organization_oid) if user.organization_oid else None,
+                "work_schedule": user.work_schedule.value if user.work_schedule else None,
+            }
+        )
+    return data
+
+
+def create_token(user: User) -> Token:
     """Создание токена доступа"""
     access_token_expires = timedelta(minutes=settings.api.access_token_expire_minutes)
 
     access_token = create_access_token(
-        data={"user_oid": str(user_oid)},
+        data=build_token_claims(user),
         expires_delta=access_token_expires,
     )
 
@@ -24,14 +46,64 @@ def create_token(user_oid: uuid.UUID) -> Token:
         access_token_expires=str(access_token_expires),
     )
 
-def create_access_token(*, data: dict, expires_delta: timedelta = None) -> str:
+def create_access_token(
+    *,
+    data: dict,
+    expires_delta: timedelta = None,
+    now: Optional[datetime] = None,
+) -> str:
     """Генерация JWT токена"""
     to_encode = data.copy()
+    now = now or datetime.now(tz=timezone.utc)
 
     if expires_delta:
-        expire = datetime.now(tz=timezone.utc) + expires_delta
+        expire = now + expires_delta
     else:
-        expire = datetime.now(tz=timezone.utc) + timedelta(minutes=15)
-    to_encode.update({"exp": expire, "sub": access_token_jwt_subject})
+        expire = now + timedelta(minutes=15)
+    # auth_time сохраняется при продлении и ограничивает общую длину сессии
+    to_encode.setdefault("auth_time", int(now.timestamp()))
+    to_encode.update({"exp": expire, "iat": int(now.timestamp()), "sub": access_token_jwt_subject})
     encoded_jwt = jwt.encode(to_encode, settings.api.secret_key, algorithm=ALGORITHM)
-    return encoded_jwt
\ No newline at end of file
+    return encoded_jwt
+
+
+def needs_refresh(payload: dict, now: Optional[datetime] = None) -> bool:
+    """
+    Токен пора продлить: до истечения осталось меньше порога, а сессия
+    не превысила SESSION_MAX_AGE_MINUTES.
+    """
+    timestamp = (now or datetime.now(tz=timezone.utc)).timestamp()
+
+    if payload["exp"] - timestamp > settings.api.token_refresh_threshold_minutes * 60:
+        return False
+
+    auth_time = payload.get("auth_time", payload.get("iat", timestamp))
+    return timestamp - auth_time <= settings.api.session_max_age_minutes * 60
+
+
+def refresh_access_token(
+    payload: dict,
+    current_version: Optional[int],
+    now: Optional[datetime] = None,
+) -> Optional[str]:
+    """
+    Перевыпускает токен с теми же данными и новым сроком действия.
+
+    Возвращает None, если продлевать рано, сессия слишком старая или токен
+    отозван (версия не совпадает с текущей версией пользователя).
+    """
+    now = now or datetime.now(tz=timezone.utc)
+
+    if not needs_refresh(payload, now=now):
+        return None
+
+    if current_version is None or current_version != payload.get("ver", 0):
+        return None
+
+    data = {key: value for key, value in payload.items() if key not in REISSUED_FIELDS}
+    data.setdefault("auth_time", payload.get("iat", int(now.timestamp())))
+    return create_access_token(
+        data=data,
+        expires_delta=timedelta(minutes=settings.api.access_token_expire_minutes),
+        now=now,
+    )
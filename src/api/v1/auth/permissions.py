@@ -1,8 +1,9 @@
 from typing import List, Union
 from fastapi import Depends, HTTPException, status
 from fastapi.responses import RedirectResponse
-from src.api.v1.auth.dependencies import get_current_user
-from src.models.user import User, Role
+from src.api.v1.auth.dependencies import get_current_claims
+from src.api.v1.auth.schemas import UserClaims
+from src.models.user import Role
 
 
 class RoleRequired:
@@ -12,10 +13,22 @@ class RoleRequired:
         else:
             self.required_roles = required_roles
 
-    def __call__(self, user: User = Depends(get_current_user)) -> User:
+    def __call__(self, user: UserClaims = Depends(get_current_claims)) -> UserClaims:
         try:
             if user.role not in self.required_roles:
                 raise HTTPException(status_code=403, detail="Not enough permissions")
             return user
         except HTTPException as e:
-            return RedirectResponse(url='/auth/', status_code=status.HTTP_302_FOUND)
\ No newline at end of file
+            return RedirectResponse(url='/auth/', status_code=status.HTTP_302_FOUND)
+
+class RoleEnforced(RoleRequired):
+    """
+    Проверка роли, которая отказывает с 403. Значение, возвращённое
+    зависимостью из `dependencies=[...]`, FastAPI отбрасывает, поэтому
+    редирект `RoleRequired` запрос не останавливает.
+    """
+
+    def __call__(self, user: UserClaims = Depends(get_current_claims)) -> UserClaims:
+        if user.role not in self.required_roles:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
+        return user
@@ -26,6 +26,11 @@ class AuthRepository(BaseRepo):
         result: Result = await self.session.scalar(stmt)
         return result
 
-    
 
-    
+    async def get_token_version(self, user_oid: uuid.UUID) -> Optional[int]:
+        stmt = select(User.token_version).where(
+            User.oid == user_oid,
+            User.is_active == True,
+        )
+        result: Result = await self.session.scalar(stmt)
+        return result
@@ -5,13 +5,15 @@ from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 
-from src.models import User
+from src.models import User, Role
 from src.core.database.infrastructure import db_helper
 from src.core.config import settings
 from src.api.v1.auth.dependencies import get_current_user
 from src.api.conf_static import templates
 from src.api.v1.auth.schemas import Token, LoginForm
 from src.api.v1.auth.service import AuthService
+from src.api.v1.auth.permissions import RoleEnforced
+from src.api.v1.auth.security import PasswordHasherMetrics, password_hasher
 
 
 router = APIRouter(
@@ -107,4 +109,16 @@ async def logout(
     redirect_response = RedirectResponse(url="/auth/", status_code=status.HTTP_302_FOUND)
     redirect_response.delete_cookie(key="access_token", httponly=True)
     
-    return redirect_response
\ No newline at end of file
+    return redirect_response
+
+
+@router.get(
+    path="/metrics/password-hashing",
+    response_model=PasswordHasherMetrics,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(RoleEnforced(Role.SUPERUSER))],
+    name="auth:password_hashing_metrics",
+    description="Queue depth and latency of the password hashing pool",
+)
+async def password_hashing_metrics() -> PasswordHasherMetrics:
+    return password_hasher.metrics()
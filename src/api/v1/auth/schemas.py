@@ -2,6 +2,8 @@ import uuid
 from fastapi import Form
 from pydantic import BaseModel
 
+from src.models import Role, User, WorkSchedule
+
 
 
 class Token(BaseModel):
@@ -11,6 +13,48 @@ class Token(BaseModel):
 
 class TokenPayload(BaseModel):
     user_oid: uuid.UUID
+    ver: int = 0
+    role: Role | None = None
+    department_oid: uuid.UUID | None = None
+    organization_oid: uuid.UUID | None = None
+    work_schedule: WorkSchedule | None = None
+
+    @property
+    def has_claims(self) -> bool:
+        return self.role is not None
+
+
+class UserClaims(BaseModel):
+    """
+    Данные пользователя, достаточные для проверки прав и построения
+    запросов по роли (`_build_stmt_for_role`).
+    """
+
+    oid: uuid.UUID
+    role: Role
+    department_oid: uuid.UUID | None = None
+    organization_oid: uuid.UUID | None = None
+    work_schedule: WorkSchedule | None = None
+
+    @classmethod
+    def from_token(cls, token_data: TokenPayload) -> "UserClaims":
+        return cls(
+            oid=token_data.user_oid,
+            role=token_data.role,
+            department_oid=token_data.department_oid,
+            organization_oid=token_data.organization_oid,
+            work_schedule=token_data.work_schedule,
+        )
+
+    @classmethod
+    def from_user(cls, user: User) -> "UserClaims":
+        return cls(
+            oid=user.oid,
+            role=user.role,
+            department_oid=user.department_oid,
+            organization_oid=user.organization_oid,
+            work_schedule=user.work_schedule,
+        )
 
 
 class LoginResponse(BaseModel):
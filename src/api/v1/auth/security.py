@@ -1,8 +1,20 @@
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Tuple, TypeVar
+
 from passlib.context import CryptContext
+from pydantic import BaseModel
+
+from src.core.config import settings
+from src.api.v1.auth.errors import PasswordHasherBusy
 
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+T = TypeVar("T")
+
 
 def verify_password(plain_password: str, hashed_password: str):
     return pwd_context.verify(plain_password, hashed_password)
@@ -10,3 +22,89 @@ def verify_password(plain_password: str, hashed_password: str):
 
 def get_password_hash(password: str):
     return pwd_context.hash(password)
+
+
+def _timed(func: Callable[..., T], *args) -> Tuple[T, float]:
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+
+class PasswordHasherMetrics(BaseModel):
+    max_workers: int
+    max_queue: int
+    in_flight: int
+    queue_depth: int
+    completed: int
+    rejected: int
+    avg_latency_ms: float
+    p95_latency_ms: float
+
+
+class PasswordHasher:
+    """
+    Выполняет bcrypt в ограниченном пуле потоков, не блокируя event loop.
+
+    bcrypt отпускает GIL, поэтому потоки работают параллельно. Если в очереди
+    уже `max_queue` задач, новые попытки отклоняются с 503 вместо того, чтобы
+    копить задержку во время массового входа в начале смены.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int, latency_window: int = 512):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="password-hasher",
+        )
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+        self._latencies: deque[float] = deque(maxlen=latency_window)
+
+    async def _run(self, func: Callable[..., T], *args) -> T:
+        if self._pending >= self.max_workers + self.max_queue:
+            self._rejected += 1
+            raise PasswordHasherBusy()
+
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result, elapsed = await loop.run_in_executor(self._executor, _timed, func, *args)
+        finally:
+            self._pending -= 1
+
+        self._completed += 1
+        self._latencies.append(elapsed)
+        return result
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(get_password_hash, password)
+
+    def metrics(self) -> PasswordHasherMetrics:
+        latencies = sorted(self._latencies)
+        if latencies:
+            avg_latency = sum(latencies) / len(latencies)
+            p95_latency = latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)]
+        else:
+            avg_latency = p95_latency = 0.0
+
+        return PasswordHasherMetrics(
+            max_workers=self.max_workers,
+            max_queue=self.max_queue,
+            in_flight=min(self._pending, self.max_workers),
+            queue_depth=max(self._pending - self.max_workers, 0),
+            completed=self._completed,
+            rejected=self._rejected,
+            avg_latency_ms=round(avg_latency * 1000, 2),
+            p95_latency_ms=round(p95_latency * 1000, 2),
+        )
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.api.password_hash_workers,
+    max_queue=settings.api.password_hash_queue,
+)
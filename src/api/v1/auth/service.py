@@ -5,10 +5,11 @@ from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .repository import AuthRepository
+from .cache import user_cache, token_versions
 from src.models import User
 
 from .schemas import Token
-from .security import verify_password
+from .security import password_hasher
 from .jwt import create_token
 
 
@@ -30,6 +31,34 @@ class AuthService:
         return user
 
 
+    async def get_current_user(self, user_oid: uuid.UUID) -> Optional[User]:
+        """Пользователь из кэша процесса, при промахе загружается из БД."""
+        user = user_cache.get(user_oid)
+        if user is not None:
+            return user
+
+        user = await self.repository.get_user_by_id(user_oid=user_oid)
+        if user is None:
+            return None
+
+        # Отсоединяем объект, чтобы его могли читать параллельные запросы
+        self.repository.session.expunge(user)
+        user_cache.set(user.oid, user)
+        return user
+
+
+    async def get_token_version(self, user_oid: uuid.UUID) -> Optional[int]:
+        """Текущая версия токенов пользователя; None, если вход запрещён."""
+        version = token_versions.get(user_oid)
+        if version is not None:
+            return version
+
+        version = await self.repository.get_token_version(user_oid=user_oid)
+        if version is not None:
+            token_versions.set(user_oid, version)
+        return version
+
+
     async def authenticate_and_create_token(self, oauth_form_data: OAuth2PasswordRequestForm) -> Token:
         user = await self.get_user(oauth_form_data.username)  # Получаем пользователя по имени
         if not user:
@@ -40,8 +69,8 @@ class AuthService:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Ваш аккаунт не подтверждён. Пожалуйста, подождите.")
 
         # Проверка пароля
-        if not verify_password(oauth_form_data.password, user.hashed_password):
+        if not await password_hasher.verify(oauth_form_data.password, user.hashed_password):
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Неверное имя пользователя или пароль")
 
-        return create_token(user_oid=user.oid)
+        return create_token(user=user)
 
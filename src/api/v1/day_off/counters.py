@@ -0,0 +1,50 @@
+import uuid
+from typing import Hashable, Optional, Tuple
+
+from src.core.cache import TTLCache
+from src.core.config import settings
+from src.models import Role, User
+
+
+class UnapprovedDayOffCounters:
+    """
+    Счётчики неподтверждённых отгулов для бейджа в навбаре.
+
+    Ключи: ("user", oid) для пользователя, ("department", oid) для модератора
+    и ("all",) для суперпользователя. Отсутствующий счётчик загружается
+    одним COUNT и дальше поддерживается приращениями.
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 4096):
+        self._cache: TTLCache[int] = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    @staticmethod
+    def scope_for(current_user: User) -> Hashable:
+        if current_user.role == Role.USER:
+            return ("user", current_user.oid)
+        elif current_user.role == Role.MODERATOR:
+            return ("department", current_user.department_oid)
+        return ("all",)
+
+    @staticmethod
+    def _scopes(user_oid: uuid.UUID, department_oid: Optional[uuid.UUID]) -> Tuple[Hashable, ...]:
+        return ("user", user_oid), ("department", department_oid), ("all",)
+
+    def get(self, current_user: User) -> Optional[int]:
+        return self._cache.get(self.scope_for(current_user))
+
+    def set(self, current_user: User, value: int) -> None:
+        self._cache.set(self.scope_for(current_user), value)
+
+    def add(self, user_oid: uuid.UUID, department_oid: Optional[uuid.UUID], delta: int) -> None:
+        """Применяет изменение ко всем загруженным счётчикам, которые видят отгул."""
+        for scope in self._scopes(user_oid, department_oid):
+            self._cache.update(scope, lambda value: max(value + delta, 0))
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+unapproved_day_offs = UnapprovedDayOffCounters(
+    ttl=settings.cache.day_off_counters_ttl_seconds,
+)
@@ -5,9 +5,9 @@ from fastapi import Path, status, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.database.infrastructure import db_helper
-from src.models import DayOff, User
+from src.models import DayOff
 from src.api.v1.day_off.service import DayOffService
-from src.api.v1.auth.dependencies import get_current_user
+from src.api.v1.auth.dependencies import RequestIdentity, get_request_identity
 from src.api.v1.day_off.errors import DayOffNotFoundError
 
 
@@ -30,7 +30,8 @@ async def day_off_by_oid(
 
 
 async def count_notifications_day_offs(
-    current_user: Annotated[User, Depends(get_current_user)],
-    session: Annotated[AsyncSession, Depends(db_helper.get_session)],
+    identity: Annotated[RequestIdentity, Depends(get_request_identity)],
 ):
-    return await DayOffService(session).count_notifications(current_user=current_user)
+    return await DayOffService(identity.session).count_notifications(
+        current_user=identity.user,
+    )
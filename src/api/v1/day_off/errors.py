@@ -12,3 +12,32 @@ class InsufficientOvertimeHours(HTTPException):
     def __init__(self):
         self.detail = f"Недостаточно часов для отгула!"
         super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail=self.detail)
+
+class InvalidDayOffRange(HTTPException):
+    def __init__(self, max_days: int):
+        self.detail = f"Укажите период не длиннее {max_days} дней, дата окончания не раньше даты начала."
+        super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail=self.detail)
+
+class ReportRendererBusy(HTTPException):
+    def __init__(self):
+        self.detail = "Слишком много отчётов формируется одновременно. Повторите через несколько секунд."
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=self.detail,
+            headers={"Retry-After": "5"},
+        )
+
+class ReportRenderTimeout(HTTPException):
+    def __init__(self):
+        self.detail = "Отчёт формируется слишком долго. Повторите позже."
+        super().__init__(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=self.detail)
+
+class DayOffExportTooLarge(HTTPException):
+    def __init__(self, limit: int):
+        self.detail = f"Под фильтр попадает больше {limit} отгулов. Сузьте период или отдел."
+        super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail=self.detail)
+
+class ReportFormatUnavailable(HTTPException):
+    def __init__(self, report_format: str):
+        self.detail = f"Формат отчёта {report_format} недоступен на сервере."
+        super().__init__(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail=self.detail)
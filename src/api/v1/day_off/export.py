@@ -0,0 +1,112 @@
+import asyncio
+import logging
+import zipfile
+from collections import deque
+from typing import AsyncIterator, Deque, Iterable, List, Optional, Tuple
+
+from fastapi import HTTPException
+
+from src.api.v1.day_off.errors import ReportRendererBusy
+from src.api.v1.day_off.report_renderer import ReportRenderer
+
+# Пауза перед повтором, если очередь рендеринга заполнена
+BUSY_RETRY_SECONDS = 0.5
+# Список отчётов, которые не удалось построить
+ERRORS_MANIFEST = "errors.txt"
+
+logger = logging.getLogger(__name__)
+
+
+class _ChunkBuffer:
+    """
+    Поток без seek/tell для ZipFile: записанные байты копятся до `drain()`.
+    ZipFile в таком потоке пишет размеры записей после данных, поэтому
+    архив можно отдавать клиенту по мере сборки.
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def _render(renderer: ReportRenderer, data: dict) -> bytes:
+    while True:
+        try:
+            return await renderer.render(data)
+        except ReportRendererBusy:
+            await asyncio.sleep(BUSY_RETRY_SECONDS)
+
+
+async def _collect(filename: str, task: asyncio.Task, failed: List[str]) -> Optional[bytes]:
+    """
+    Результат рендера записи. Ответ 200 к этому моменту уже отправлен,
+    поэтому ошибка одной записи не обрывает архив, а попадает в манифест.
+    """
+    try:
+        return await task
+    except Exception as e:
+        reason = e.detail if isinstance(e, HTTPException) else (str(e) or type(e).__name__)
+        logger.error(f"Отчёт {filename} не построен: {reason}")
+        failed.append(f"{filename}: {reason}")
+        return None
+
+
+async def stream_reports_zip(
+    reports: Iterable[Tuple[str, dict]],
+    renderer: ReportRenderer,
+) -> AsyncIterator[bytes]:
+    """
+    Отдаёт ZIP с отчётами частями. Одновременно рендерится не больше
+    `renderer.max_workers` отчётов, в архив они пишутся в исходном порядке;
+    в памяти держатся только отчёты из этого окна.
+
+    Отчёты, которые не удалось построить (таймаут, ошибка конвертера),
+    пропускаются и перечисляются в `errors.txt` в конце архива.
+
+    :param reports: Пары (имя файла в архиве, данные отчёта)
+    """
+    buffer = _ChunkBuffer()
+    window = max(renderer.max_workers, 1)
+    pending: Deque[Tuple[str, asyncio.Task]] = deque()
+    failed: List[str] = []
+
+    try:
+        # .docx уже сжат, повторное сжатие только тратит CPU
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_STORED) as archive:
+            for filename, data in reports:
+                pending.append((filename, asyncio.ensure_future(_render(renderer, data))))
+                if len(pending) < window:
+                    continue
+                filename, task = pending.popleft()
+                report = await _collect(filename, task, failed)
+                if report is not None:
+                    archive.writestr(filename, report)
+                    yield buffer.drain()
+
+            while pending:
+                filename, task = pending.popleft()
+                report = await _collect(filename, task, failed)
+                if report is not None:
+                    archive.writestr(filename, report)
+                    yield buffer.drain()
+
+            if failed:
+                archive.writestr(ERRORS_MANIFEST, "\n".join(failed) + "\n")
+
+        # Центральный каталог архива
+        yield buffer.drain()
+    finally:
+        # Клиент оборвал загрузку: остальное не нужно
+        for _, task in pending:
+            task.cancel()
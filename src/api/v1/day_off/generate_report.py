@@ -1,26 +1,210 @@
+import copy
+import re
+import zipfile
+from dataclasses import dataclass
 from io import BytesIO
+from threading import Lock
+from typing import Dict, FrozenSet, List, Optional, Tuple, Union
+
 from docx import Document
+from docx.document import Document as DocxDocument
 from docx.shared import Pt
+from lxml import etree
 from pathlib import Path
 
 TEMPLATE_PATH = Path("src/api/v1/day_off/reports/template/report_template.docx")
+DOCUMENT_PART = "word/document.xml"
+
+# Плейсхолдеры шаблона — ключи словаря из `build_report_data`
+REPORT_FIELDS = (
+    "date_report",
+    "date_day_off",
+    "info_overtimes",
+    "full_name_user",
+    "position_user",
+    "rank_user",
+    "name_organization",
+    "organization_name_boss",
+    "organization_position_boss",
+    "organization_rank_boss",
+    "department_user",
+)
+# Длинные имена раньше, чтобы совпадение не обрезалось по более короткому
+_FIELD_PATTERN = re.compile(
+    "|".join(re.escape(name) for name in sorted(REPORT_FIELDS, key=len, reverse=True))
+)
+
+
+@dataclass(frozen=True)
+class Field:
+    name: str
+
+
+Segment = Union[str, Field]
+
+
+@dataclass(frozen=True)
+class CompiledParagraph:
+    """Абзац шаблона, разбитый на текст и плейсхолдеры."""
+
+    index: int
+    segments: Tuple[Segment, ...]
+    fields: FrozenSet[str]
+    alignment: Optional[int]
+
+    def render(self, data: dict) -> str:
+        """Текст абзаца; плейсхолдеры без значения в `data` остаются как есть."""
+        parts = []
+        for segment in self.segments:
+            if isinstance(segment, Field) and segment.name in data:
+                parts.append(format_value(data[segment.name]))
+            elif isinstance(segment, Field):
+                parts.append(segment.name)
+            else:
+                parts.append(segment)
+        return "".join(parts)
+
+
+def format_overtimes(info_overtimes) -> str:
+    """Форматирование списка переработок в строку"""
+    return "; ".join([f"{item['description']} - {item['hours']} ч." for item in info_overtimes])
+
+
+def format_value(value) -> str:
+    if isinstance(value, list):
+        return format_overtimes(value)
+    return "" if value is None else str(value)
+
+
+def compile_paragraphs(document: DocxDocument) -> Tuple[CompiledParagraph, ...]:
+    """Индекс плейсхолдеров: считается один раз при загрузке шаблона."""
+    compiled = []
+    for index, paragraph in enumerate(document.paragraphs):
+        text = paragraph.text
+        segments: List[Segment] = []
+        position = 0
+        for match in _FIELD_PATTERN.finditer(text):
+            if match.start() > position:
+                segments.append(text[position:match.start()])
+            segments.append(Field(match.group()))
+            position = match.end()
+        if position < len(text):
+            segments.append(text[position:])
+        alignment = paragraph.alignment
+        compiled.append(
+            CompiledParagraph(
+                index=index,
+                segments=tuple(segments),
+                fields=frozenset(segment.name for segment in segments if isinstance(segment, Field)),
+                alignment=None if alignment is None else int(alignment),
+            )
+        )
+    return tuple(compiled)
+
+
+@dataclass(frozen=True)
+class TemplatePackage:
+    """
+    Разобранный шаблон .docx. Не изменяется после загрузки: каждый отчёт
+    работает с копией XML тела документа, остальные части пакета
+    переиспользуются как есть.
+    """
+
+    document: DocxDocument
+    entries: Tuple[Tuple[zipfile.ZipInfo, bytes], ...]
+    mtime_ns: int
+    paragraphs: Tuple[CompiledParagraph, ...]
+
+    @classmethod
+    def load(cls, path: Path) -> "TemplatePackage":
+        mtime_ns = path.stat().st_mtime_ns
+        raw = path.read_bytes()
+        with zipfile.ZipFile(BytesIO(raw)) as archive:
+            entries = tuple((info, archive.read(info)) for info in archive.infolist())
+        document = Document(BytesIO(raw))
+        return cls(
+            document=document,
+            entries=entries,
+            mtime_ns=mtime_ns,
+            paragraphs=compile_paragraphs(document),
+        )
+
+    def clone(self) -> DocxDocument:
+        """Документ с собственной копией XML тела."""
+        return DocxDocument(copy.deepcopy(self.document.element), self.document.part)
+
+    def save(self, document: DocxDocument) -> BytesIO:
+        """Собирает .docx: тело из `document`, остальные части из шаблона."""
+        file_stream = BytesIO()
+        with zipfile.ZipFile(file_stream, "w", zipfile.ZIP_DEFLATED) as archive:
+            for info, data in self.entries:
+                if info.filename == DOCUMENT_PART:
+                    data = etree.tostring(
+                        document.element, xml_declaration=True, encoding="UTF-8", standalone=True
+                    )
+                archive.writestr(info, data)
+        file_stream.seek(0)
+        return file_stream
+
+
+class ReportTemplate:
+    """Шаблон, загружаемый один раз и перечитываемый при изменении файла."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._package: Optional[TemplatePackage] = None
+        self._lock = Lock()
+
+    def get(self) -> TemplatePackage:
+        package = self._package
+        if package is not None and package.mtime_ns == self.path.stat().st_mtime_ns:
+            return package
+
+        with self._lock:
+            package = self._package
+            if package is None or package.mtime_ns != self.path.stat().st_mtime_ns:
+                package = self._package = TemplatePackage.load(self.path)
+            return package
+
+
+_templates: Dict[Path, ReportTemplate] = {}
+
+
+def get_template(path: Path = TEMPLATE_PATH) -> ReportTemplate:
+    template = _templates.get(path)
+    if template is None:
+        template = _templates.setdefault(path, ReportTemplate(path))
+    return template
+
+
+def template_version(path: Path = TEMPLATE_PATH) -> str:
+    """Версия шаблона для ключей кэша: меняется при изменении файла."""
+    return f"{path}:{path.stat().st_mtime_ns}"
+
 
 class ReportGenerator:
-    def __init__(self, data: dict, template_path: Path = TEMPLATE_PATH):
+    def __init__(
+        self,
+        data: dict,
+        template_path: Path = TEMPLATE_PATH,
+        package: Optional[TemplatePackage] = None,
+    ):
         """
         Инициализация генератора отчётов.
 
         :param template_path: Путь к шаблону .docx
         :param data: Данные для замены в шаблоне
+        :param package: Уже загруженный шаблон
         """
         self.template_path = template_path
         self.data = data
-        self.doc = Document(template_path)
+        self.package = package or get_template(template_path).get()
+        self.doc = self.package.clone()
 
 
     def format_overtimes(self, info_overtimes):
         """Форматирование списка переработок в строку"""
-        return "; ".join([f"{item['description']} - {item['hours']} ч." for item in info_overtimes])
+        return format_overtimes(info_overtimes)
 
 
     def set_font(self, run, font_name="Times New Roman", font_size=15):
@@ -31,23 +215,20 @@ class ReportGenerator:
 
     def replace_placeholders(self):
         """Заменяет шаблонные переменные в документе"""
-        for paragraph in self.doc.paragraphs:
-            for key, value in self.data.items():
-                if key in paragraph.text:
-                    if isinstance(value, list):
-                        value = self.format_overtimes(value)  # Преобразуем список в строку
-                    paragraph.text = paragraph.text.replace(key, value)
+        paragraphs = self.doc.paragraphs
+        for compiled in self.package.paragraphs:
+            if compiled.fields.isdisjoint(self.data):
+                continue
+
+            paragraph = paragraphs[compiled.index]
+            paragraph.text = compiled.render(self.data)
 
-                    # Применяем шрифт ко всем частям текста (runs)
-                    for run in paragraph.runs:
-                        self.set_font(run)
+            # Применяем шрифт ко всем частям текста (runs)
+            for run in paragraph.runs:
+                self.set_font(run)
 
 
     def get_report_bytes(self):
         """Создаёт документ и возвращает его как байтовый поток"""
         self.replace_placeholders()
-        file_stream = BytesIO()
-        self.doc.save(file_stream)
-        file_stream.seek(0)  # Перемещаем указатель в начало файла
-        return file_stream
-    
+        return self.package.save(self.doc)
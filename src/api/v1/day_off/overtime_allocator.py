@@ -1,43 +1,139 @@
-from typing import List
-from src.models import Overtime
+import uuid
+from bisect import bisect_left
+from datetime import date, timedelta
+from enum import Enum
+from typing import Callable, Dict, List, Optional, Protocol, Sequence
 
 from src.api.v1.day_off.errors import InsufficientOvertimeHours
 
+
+class AllocationStrategy(str, Enum):
+    FIFO = "fifo"                       # Сначала самые старые овертаймы
+    BEST_FIT = "best_fit"               # Минимум частично списанных овертаймов
+    EXPIRING_FIRST = "expiring_first"   # Сначала те, что скоро сгорят
+
+
+class OvertimeSlot(Protocol):
+    oid: uuid.UUID
+    o_date: date
+    remaining_hours: int
+
+
+StrategyFunc = Callable[[Sequence[OvertimeSlot], int, date, int], List[OvertimeSlot]]
+
+_STRATEGIES: Dict[AllocationStrategy, StrategyFunc] = {}
+
+
+def register_strategy(strategy: AllocationStrategy):
+    """
+    Регистрирует стратегию. Стратегия получает доступные овертаймы, нужное
+    число часов, дату отгула и срок жизни овертайма в днях (0 — бессрочно)
+    и возвращает овертаймы в порядке списания.
+    """
+    def decorator(func: StrategyFunc) -> StrategyFunc:
+        _STRATEGIES[strategy] = func
+        return func
+    return decorator
+
+
+@register_strategy(AllocationStrategy.FIFO)
+def _fifo(overtimes, required_hours, on_date, lifetime_days):
+    return sorted(overtimes, key=lambda overtime: overtime.o_date)
+
+
+@register_strategy(AllocationStrategy.EXPIRING_FIRST)
+def _expiring_first(overtimes, required_hours, on_date, lifetime_days):
+    ordered = sorted(overtimes, key=lambda overtime: overtime.o_date)
+    if not lifetime_days:
+        return ordered
+
+    # Сгоревшие к дате отгула часы не списываются
+    earliest = on_date - timedelta(days=lifetime_days)
+    return [overtime for overtime in ordered if overtime.o_date >= earliest]
+
+
+@register_strategy(AllocationStrategy.BEST_FIT)
+def _best_fit(overtimes, required_hours, on_date, lifetime_days):
+    pool = sorted(overtimes, key=lambda overtime: (overtime.remaining_hours, overtime.o_date))
+    hours = [overtime.remaining_hours for overtime in pool]
+    selected: List[OvertimeSlot] = []
+    needed = required_hours
+
+    while needed > 0 and pool:
+        # Наименьший овертайм, закрывающий остаток целиком
+        index = bisect_left(hours, needed)
+        if index < len(pool):
+            selected.append(pool[index])
+            break
+
+        # Иначе целиком берём самый большой
+        hours.pop()
+        overtime = pool.pop()
+        selected.append(overtime)
+        needed -= overtime.remaining_hours
+
+    return selected
+
+
+def split_allocations(allocations: List[dict], required_hours: int) -> List[List[dict]]:
+    """
+    Делит общее списание на отгулы по `required_hours` часов, сохраняя
+    порядок; овертайм на стыке двух отгулов даёт две связи.
+    """
+    day_offs: List[List[dict]] = []
+    current: List[dict] = []
+    needed = required_hours
+
+    for allocation in allocations:
+        hours = allocation["hours_used"]
+        while hours > 0:
+            taken = min(hours, needed)
+            current.append({"overtime_oid": allocation["overtime_oid"], "hours_used": taken})
+            hours -= taken
+            needed -= taken
+            if needed == 0:
+                day_offs.append(current)
+                current = []
+                needed = required_hours
+
+    return day_offs
+
+
 class OvertimeAllocator:
 
     @staticmethod
-    def allocate_hours(overtimes: List[Overtime], required_hours: int) -> List[dict]:
+    def allocate_hours(
+        overtimes: Sequence[OvertimeSlot],
+        required_hours: int,
+        strategy: AllocationStrategy = AllocationStrategy.FIFO,
+        on_date: Optional[date] = None,
+        lifetime_days: int = 0,
+    ) -> List[dict]:
         """
-        Распределяет часы из овертаймов на отгул и возвращает список словарей с овертаймами и использованными часами.
+        Распределяет часы из овертаймов на отгул по выбранной стратегии.
+        Возвращает строки связей `{"overtime_oid", "hours_used"}`; сами
+        овертаймы не изменяются.
         """
+        ordered = _STRATEGIES[strategy](
+            overtimes, required_hours, on_date or date.today(), lifetime_days
+        )
+
         total_hours = 0
-        selected_overtimes: List[dict] = []
-
-        for overtime in overtimes:
-            available_hours = overtime.remaining_hours
-
-            if total_hours + available_hours >= required_hours:
-                needed_hours = required_hours - total_hours
-                overtime.remaining_hours -= needed_hours 
-                total_hours += needed_hours
-                selected_overtimes.append({
-                    'overtime': overtime,
-                    'hours_used': needed_hours  
-                })
-                break  
-            else:
-                total_hours += available_hours
-                overtime.remaining_hours = 0  
-                selected_overtimes.append({
-                    'overtime': overtime,
-                    'hours_used': available_hours 
-                })
+        allocations: List[dict] = []
+        for overtime in ordered:
+            if total_hours >= required_hours:
+                break
+            if overtime.remaining_hours <= 0:
+                continue
+
+            hours_used = min(overtime.remaining_hours, required_hours - total_hours)
+            total_hours += hours_used
+            allocations.append({
+                'overtime_oid': overtime.oid,
+                'hours_used': hours_used,
+            })
 
         if total_hours < required_hours:
             raise InsufficientOvertimeHours()
 
-        return selected_overtimes
-
-
-
-
+        return allocations
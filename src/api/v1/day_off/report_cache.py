@@ -0,0 +1,118 @@
+import hashlib
+import json
+import os
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from threading import Lock
+from typing import Optional
+
+# Меняется вместе с кодом рендеринга, чтобы старые файлы не отдавались
+RENDER_VERSION = 1
+SUFFIX = ".report"
+
+
+def report_key(data: dict, template_version: str, report_format: str = "docx") -> str:
+    """
+    Ключ отчёта: sha256 от данных подстановки, версии шаблона и формата. Любое
+    изменение отгула, его овертаймов, пользователя или организации меняет
+    данные, а значит и ключ; инвалидировать ничего не нужно.
+    """
+    payload = json.dumps(
+        [RENDER_VERSION, template_version, report_format, data],
+        ensure_ascii=False,
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ReportCache:
+    """
+    Готовые отчёты на локальном диске с вытеснением давно не читанных
+    при превышении `max_bytes`.
+
+    Порядок использования хранится в памяти и восстанавливается по mtime
+    файлов при старте; при чтении mtime обновляется. Файлы пишутся через
+    временный файл и rename, поэтому читатель не увидит недописанный отчёт.
+    Если каталог делят несколько процессов, файл может исчезнуть между
+    проверкой и чтением — это обычный промах.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._size = 0
+        self._lock = Lock()
+        self._loaded = False
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{SUFFIX}"
+
+    def _load(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        files = []
+        for path in self.directory.glob(f"*{SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime_ns, path.stem, stat.st_size))
+
+        for _, key, size in sorted(files):
+            self._entries[key] = size
+            self._size += size
+        self._loaded = True
+        self._evict()
+
+    def _evict(self) -> None:
+        while self._size > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._size -= size
+            self._path(key).unlink(missing_ok=True)
+
+    def get(self, key: str) -> Optional[bytes]:
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            if key not in self._entries:
+                return None
+            path = self._path(key)
+            try:
+                data = path.read_bytes()
+                os.utime(path)
+            except FileNotFoundError:
+                self._size -= self._entries.pop(key)
+                return None
+            self._entries.move_to_end(key)
+            return data
+
+    def put(self, key: str, data: bytes) -> None:
+        if not self.enabled or len(data) > self.max_bytes:
+            return
+
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+            os.replace(tmp_path, self._path(key))
+
+            self._size -= self._entries.pop(key, 0)
+            self._entries[key] = len(data)
+            self._size += len(data)
+            self._evict()
+
+    @property
+    def size(self) -> int:
+        return self._size
@@ -0,0 +1,132 @@
+import html
+import shutil
+import subprocess
+import tempfile
+from enum import Enum
+from pathlib import Path
+from typing import Callable, Dict
+
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+
+from src.api.v1.day_off.generate_report import (
+    TEMPLATE_PATH,
+    ReportGenerator,
+    TemplatePackage,
+    get_template,
+)
+
+
+class ReportFormat(str, Enum):
+    DOCX = "docx"
+    HTML = "html"
+    PDF = "pdf"
+
+    @property
+    def media_type(self) -> str:
+        return _MEDIA_TYPES[self]
+
+
+_MEDIA_TYPES = {
+    ReportFormat.DOCX: "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    ReportFormat.HTML: "text/html; charset=utf-8",
+    ReportFormat.PDF: "application/pdf",
+}
+
+BackendFunc = Callable[..., bytes]
+
+_BACKENDS: Dict[ReportFormat, BackendFunc] = {}
+
+
+def register_backend(report_format: ReportFormat):
+    """
+    Регистрирует формат отчёта. Бэкенд получает данные отчёта, разобранный
+    шаблон и опции рендера и возвращает готовый файл.
+    """
+    def decorator(func: BackendFunc) -> BackendFunc:
+        _BACKENDS[report_format] = func
+        return func
+    return decorator
+
+
+@register_backend(ReportFormat.DOCX)
+def _docx(data: dict, package: TemplatePackage, **options) -> bytes:
+    return ReportGenerator(data=data, package=package).get_report_bytes().getvalue()
+
+
+_ALIGNMENTS = {
+    int(WD_ALIGN_PARAGRAPH.CENTER): "center",
+    int(WD_ALIGN_PARAGRAPH.RIGHT): "right",
+    int(WD_ALIGN_PARAGRAPH.JUSTIFY): "justify",
+}
+
+_HTML_PAGE = """<!DOCTYPE html>
+<html lang="ru">
+<head>
+<meta charset="utf-8">
+<title>Рапорт</title>
+<style>
+@page {{ size: A4; margin: 2cm 1.5cm 2cm 3cm; }}
+body {{ font-family: "Times New Roman", serif; font-size: 15pt; max-width: 17cm; margin: 2cm auto; }}
+p {{ margin: 0; min-height: 1.2em; white-space: pre-wrap; tab-size: 8; }}
+</style>
+</head>
+<body>
+{body}
+</body>
+</html>
+"""
+
+
+@register_backend(ReportFormat.HTML)
+def _html(data: dict, package: TemplatePackage, **options) -> bytes:
+    """Страница для просмотра и печати из браузера, без сборки .docx."""
+    paragraphs = []
+    for compiled in package.paragraphs:
+        align = _ALIGNMENTS.get(compiled.alignment)
+        style = f' style="text-align: {align}"' if align else ""
+        paragraphs.append(f"<p{style}>{html.escape(compiled.render(data))}</p>")
+    return _HTML_PAGE.format(body="\n".join(paragraphs)).encode()
+
+
+def pdf_converter_available(converter: str) -> bool:
+    return shutil.which(converter) is not None
+
+
+@register_backend(ReportFormat.PDF)
+def _pdf(data: dict, package: TemplatePackage, pdf_converter: str = "soffice", timeout: float = 30, **options) -> bytes:
+    """
+    .docx, сконвертированный локальным LibreOffice. У каждого вызова свой
+    профиль, иначе параллельные конвертации блокируют друг друга.
+    """
+    docx = _docx(data, package)
+    with tempfile.TemporaryDirectory() as workdir:
+        workdir = Path(workdir)
+        source = workdir / "report.docx"
+        source.write_bytes(docx)
+        subprocess.run(
+            [
+                pdf_converter,
+                f"-env:UserInstallation={(workdir / 'profile').as_uri()}",
+                "--headless",
+                "--convert-to",
+                "pdf",
+                "--outdir",
+                str(workdir),
+                str(source),
+            ],
+            check=True,
+            capture_output=True,
+            timeout=timeout,
+        )
+        return (workdir / "report.pdf").read_bytes()
+
+
+def render_report(
+    data: dict,
+    report_format: str = ReportFormat.DOCX.value,
+    template_path: str = str(TEMPLATE_PATH),
+    **options,
+) -> bytes:
+    """Рендер отчёта в байты. Вызывается в процессах пула рендеринга."""
+    package = get_template(Path(template_path)).get()
+    return _BACKENDS[ReportFormat(report_format)](data, package, **options)
@@ -0,0 +1,128 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from pathlib import Path
+from typing import Callable, Optional, TypeVar
+
+from src.core.config import settings
+from src.api.v1.day_off.errors import (
+    ReportFormatUnavailable,
+    ReportRendererBusy,
+    ReportRenderTimeout,
+)
+from src.api.v1.day_off.generate_report import template_version
+from src.api.v1.day_off.report_formats import (
+    ReportFormat,
+    pdf_converter_available,
+    render_report,
+)
+from src.api.v1.day_off.report_cache import ReportCache, report_key
+
+
+T = TypeVar("T")
+
+
+class ReportRenderer:
+    """
+    Рендерит отчёты в ограниченном пуле процессов, не блокируя event loop.
+
+    python-docx занимает CPU и держит GIL, поэтому нужны процессы, а не
+    потоки. Пул создаётся при первом отчёте. Если в работе и в очереди уже
+    `max_workers + max_queue` отчётов, новые отклоняются с 503. Отчёт,
+    не уложившийся в `timeout`, завершается 504; его место в очереди
+    освобождается, когда процесс действительно закончит работу.
+
+    С `cache` готовые отчёты берутся с диска, если данные и шаблон
+    не менялись. HTML собирается в потоке приложения: это склейка строк
+    по индексу шаблона, без сборки .docx, но первая загрузка шаблона и
+    проверка его mtime — файловый ввод-вывод вне event loop.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        max_queue: int,
+        timeout: float,
+        cache: Optional[ReportCache] = None,
+        pdf_converter: str = "soffice",
+    ):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.cache = cache
+        self.pdf_converter = pdf_converter
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def _release(self, _future: asyncio.Future) -> None:
+        self._pending -= 1
+
+    async def _run(self, func: Callable[..., T], *args) -> T:
+        if self._pending >= self.max_workers + self.max_queue:
+            raise ReportRendererBusy()
+
+        loop = asyncio.get_running_loop()
+        try:
+            future = loop.run_in_executor(self._get_executor(), func, *args)
+        except BrokenProcessPool:
+            # Процесс пула упал: следующий отчёт создаст пул заново
+            self._executor = None
+            future = loop.run_in_executor(self._get_executor(), func, *args)
+
+        self._pending += 1
+        future.add_done_callback(self._release)
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            raise ReportRenderTimeout()
+
+    async def render(self, data: dict, report_format: ReportFormat = ReportFormat.DOCX) -> bytes:
+        if report_format == ReportFormat.HTML:
+            return await asyncio.to_thread(render_report, data, report_format.value)
+        if report_format == ReportFormat.PDF and not pdf_converter_available(self.pdf_converter):
+            raise ReportFormatUnavailable(report_format.value)
+
+        render = partial(
+            render_report,
+            data,
+            report_format.value,
+            pdf_converter=self.pdf_converter,
+            timeout=self.timeout,
+        )
+        if self.cache is None:
+            return await self._run(render)
+
+        version = await asyncio.to_thread(template_version)
+        key = report_key(data, version, report_format.value)
+        report = await asyncio.to_thread(self.cache.get, key)
+        if report is None:
+            report = await self._run(render)
+            await asyncio.to_thread(self.cache.put, key, report)
+        return report
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+report_renderer = ReportRenderer(
+    max_workers=settings.report.render_workers,
+    max_queue=settings.report.render_queue,
+    timeout=settings.report.render_timeout_seconds,
+    cache=ReportCache(
+        directory=Path(settings.report.cache_dir),
+        max_bytes=settings.report.cache_max_mb * 1024 * 1024,
+    ),
+    pdf_converter=settings.report.pdf_converter,
+)
@@ -1,17 +1,29 @@
 import uuid
-import pymorphy3
 
-from typing import List, Tuple
+from collections import defaultdict
+from datetime import date
+from typing import Dict, List, Optional, Tuple
 from fastapi import HTTPException, status
-from sqlalchemy import Result, func, select, Select
+from sqlalchemy import Result, delete, func, insert, select, Select, update
 from sqlalchemy.orm import joinedload, selectinload
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
 from src.core.repo.base import BaseRepo
-from src.models import DayOff, Overtime, OvertimeDayOffLink, User, Role
-
-from src.api.v1.day_off.schemas import DayOffCreate, DayOffUpdatePartil, DayOffUpdate
-from src.api.v1.day_off.errors import DayOffNotFoundError, DepartmentPermissionError
+from src.models import (
+    DayOff,
+    Department,
+    Organization,
+    Overtime,
+    OvertimeBalance,
+    OvertimeDayOffLink,
+    Role,
+    User,
+)
+
+from src.api.v1.day_off.schemas import DayOffExportFilter, DayOffUpdatePartil, DayOffUpdate
+from src.api.v1.day_off.errors import DayOffExportTooLarge, DayOffNotFoundError, DepartmentPermissionError
+from src.api.v1.day_off.counters import unapproved_day_offs
+from src.api.v1.overtime.balance import OvertimeBalanceRepository
 
 
 class DayOffRepository(BaseRepo):
@@ -19,8 +31,14 @@ class DayOffRepository(BaseRepo):
     async def get_available_overtimes(
         self,
         user_oid: uuid.UUID,
+        for_update: bool = False,
     ) -> List[Overtime]:
-        """Получение доступных овертаймов."""
+        """
+        Получение доступных овертаймов.
+
+        С `for_update=True` строки блокируются до конца транзакции, чтобы
+        параллельный запрос не потратил те же часы.
+        """
         try:
             query = (
                 select(Overtime)
@@ -30,52 +48,173 @@ class DayOffRepository(BaseRepo):
                 )
                 .order_by(Overtime.o_date.asc())
             )
+            if for_update:
+                query = query.with_for_update().execution_options(populate_existing=True)
             result = await self.session.execute(query)
             return result.scalars().all()
         except SQLAlchemyError as e:
             raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
-    async def create_day_off(self, day_off_create: DayOffCreate, current_user: User) -> DayOff:
-        """Создание нового отгула."""
-        try:
-            new_day_off = DayOff(
-                user_oid=current_user.oid,
-                o_date=day_off_create.o_date,
-                reason=day_off_create.reason,
+    async def allocate_overtimes(
+        self,
+        user_oid: uuid.UUID,
+        required_hours: int,
+    ) -> List[dict]:
+        """
+        Списание часов со старейших овертаймов одним запросом.
+
+        Овертаймы блокируются, нарастающая сумма по `o_date` выбирает нужные
+        строки, и они уменьшаются в том же UPDATE. Возвращает строки для
+        `overtime_day_off_links` в порядке списания; пустой список, если
+        часов не хватает (в этом случае ничего не изменяется).
+        """
+        locked = (
+            select(Overtime.oid, Overtime.o_date, Overtime.remaining_hours)
+            .where(
+                Overtime.user_oid == user_oid,
+                Overtime.is_used == False,
+                Overtime.remaining_hours > 0,
             )
-            self.session.add(new_day_off)
-            await self.session.commit()
-            await self.session.refresh(new_day_off)
-            return new_day_off
-        except IntegrityError as e:
+            .with_for_update()
+            .cte("locked")
+        )
+        running = select(
+            locked.c.oid,
+            locked.c.remaining_hours,
+            (
+                func.sum(locked.c.remaining_hours).over(
+                    order_by=(locked.c.o_date, locked.c.oid),
+                )
+                - locked.c.remaining_hours
+            ).label("taken_before"),
+        ).cte("running")
+        picked = (
+            select(
+                running.c.oid,
+                running.c.taken_before,
+                func.least(
+                    running.c.remaining_hours,
+                    required_hours - running.c.taken_before,
+                ).label("hours_used"),
+            )
+            .where(running.c.taken_before < required_hours)
+            .cte("picked")
+        )
+        available_hours = select(func.coalesce(func.sum(locked.c.remaining_hours), 0)).scalar_subquery()
+
+        stmt = (
+            update(Overtime)
+            .where(
+                Overtime.oid == picked.c.oid,
+                available_hours >= required_hours,
+            )
+            .values(
+                remaining_hours=Overtime.remaining_hours - picked.c.hours_used,
+                is_used=Overtime.remaining_hours - picked.c.hours_used == 0,
+            )
+            .returning(Overtime.oid, picked.c.hours_used, picked.c.taken_before)
+            .execution_options(synchronize_session=False)
+        )
+        try:
+            result = await self.session.execute(stmt)
+            rows = sorted(result.all(), key=lambda row: row.taken_before)
+            return [
+                {"overtime_oid": row.oid, "hours_used": row.hours_used}
+                for row in rows
+            ]
+        except SQLAlchemyError as e:
+            await self.session.rollback()
             raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
-    async def create_overtime_day_off_links(
+    async def create_day_offs(
         self,
-        overtime_links: List[OvertimeDayOffLink],
-    ):
-        """Создание связи между овертаймами и отгулом."""
+        current_user: User,
+        reason: str,
+        dates: List[date],
+        allocations: List[List[dict]],
+    ) -> List[DayOff]:
+        """
+        Создание отгулов и их связей с овертаймами в одной транзакции
+        с уже выполненным списанием часов: `allocations[i]` — связи отгула
+        на `dates[i]`. Отгулы и связи вставляются пачками.
+        """
         try:
-            for link in overtime_links:
-                link.hours_used = link.hours_used
-            self.session.add_all(overtime_links)
+            result = await self.session.scalars(
+                insert(DayOff).returning(DayOff, sort_by_parameter_order=True),
+                [
+                    {"user_oid": current_user.oid, "o_date": o_date, "reason": reason}
+                    for o_date in dates
+                ],
+            )
+            day_offs = result.all()
+
+            await self.session.execute(
+                insert(OvertimeDayOffLink),
+                [
+                    {
+                        "overtime_oid": allocation["overtime_oid"],
+                        "day_off_oid": day_off.oid,
+                        "hours_used": allocation["hours_used"],
+                    }
+                    for day_off, day_off_allocations in zip(day_offs, allocations)
+                    for allocation in day_off_allocations
+                ],
+            )
+            hours_used = sum(
+                allocation["hours_used"]
+                for day_off_allocations in allocations
+                for allocation in day_off_allocations
+            )
+            await OvertimeBalanceRepository(self.session).apply(
+                user_oid=current_user.oid,
+                used=hours_used,
+                remaining=-hours_used,
+            )
+
             await self.session.commit()
-        except IntegrityError as e:
+            unapproved_day_offs.add(current_user.oid, current_user.department_oid, len(day_offs))
+            return day_offs
+        except SQLAlchemyError as e:
+            await self.session.rollback()
             raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
-    async def update_overtimes(
+    async def get_allocation_context(
         self,
-        overtimes: List[Overtime],
-    ) -> None:
-        """Обновить записи overtimes в базе данных."""
+        user_oid: uuid.UUID,
+    ) -> Tuple[Optional[str], Optional[int], Optional[int]]:
+        """
+        Стратегия списания организации, часы на отгул отдела и остаток часов
+        по балансу пользователя одним запросом.
+        """
         try:
-            for overtime in overtimes:
-                if overtime.remaining_hours == 0:
-                    overtime.is_used = True
-            await self.session.commit()
+            result = await self.session.execute(
+                select(
+                    Organization.allocation_strategy,
+                    Department.day_off_hours,
+                    OvertimeBalance.remaining_hours,
+                )
+                .select_from(User)
+                .outerjoin(Organization, Organization.oid == User.organization_oid)
+                .outerjoin(Department, Department.oid == User.department_oid)
+                .outerjoin(OvertimeBalance, OvertimeBalance.user_oid == User.oid)
+                .where(User.oid == user_oid)
+            )
+            return tuple(result.first() or (None, None, None))
         except SQLAlchemyError as e:
             raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
+    async def spend_overtimes(self, overtimes: List[Overtime], allocations: List[dict]) -> None:
+        """Списание часов по результату стратегии с уже заблокированных овертаймов."""
+        by_oid = {overtime.oid: overtime for overtime in overtimes}
+        for allocation in allocations:
+            overtime = by_oid[allocation["overtime_oid"]]
+            overtime.remaining_hours -= allocation["hours_used"]
+            overtime.is_used = overtime.remaining_hours == 0
+
+    async def rollback(self) -> None:
+        """Откат транзакции и снятие блокировок с овертаймов."""
+        await self.session.rollback()
+
     async def _build_stmt_for_role(
     self,
     current_user: User,
@@ -235,6 +374,7 @@ class DayOffRepository(BaseRepo):
         try:
             if current_user.role == Role.MODERATOR and current_user.department_oid != day_off.user_rel.department_oid:
                 raise DepartmentPermissionError()
+            was_approved = day_off.is_approved
             if partil:
                 for attr, value in day_off_update.model_dump(
                     exclude_unset=partil
@@ -243,6 +383,7 @@ class DayOffRepository(BaseRepo):
             else:
                 day_off = DayOff.model_validate(day_off_update)
             await self.session.commit()
+            self._track_approval_change(day_off, was_approved)
             return day_off
         except IntegrityError as e:
             raise HTTPException(
@@ -253,17 +394,93 @@ class DayOffRepository(BaseRepo):
 
     async def delete(self, current_user: User, day_off: DayOff):
         """Удалить отгул."""
+        if current_user.role == Role.MODERATOR and current_user.department_oid != day_off.user_rel.department_oid:
+            raise DepartmentPermissionError()
+
+        await self._delete_day_offs(
+            [(day_off.oid, day_off.user_oid, day_off.user_rel.department_oid, day_off.is_approved)]
+        )
+
+    async def delete_many(self, current_user: User, oids: List[uuid.UUID]) -> int:
+        """Удалить несколько отгулов. Возвращает число удалённых."""
         try:
+            stmt = (
+                select(DayOff.oid, DayOff.user_oid, User.department_oid, DayOff.is_approved)
+                .join(User, User.oid == DayOff.user_oid)
+                .where(DayOff.oid.in_(oids))
+            )
+            if current_user.role == Role.USER:
+                stmt = stmt.where(DayOff.user_oid == current_user.oid)
+            day_offs = (await self.session.execute(stmt)).all()
+        except SQLAlchemyError as e:
+            raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
-            if current_user.role == Role.MODERATOR and current_user.department_oid != day_off.user_rel.department_oid:
-                raise DepartmentPermissionError()
-            
-            await self.session.delete(day_off)
-            await self.session.commit()
+        if current_user.role == Role.MODERATOR and any(
+            department_oid != current_user.department_oid
+            for _, _, department_oid, _ in day_offs
+        ):
+            raise DepartmentPermissionError()
+
+        if not day_offs:
+            return 0
+        return await self._delete_day_offs(day_offs)
 
+    async def _delete_day_offs(
+        self,
+        day_offs: List[Tuple[uuid.UUID, uuid.UUID, uuid.UUID | None, bool]],
+    ) -> int:
+        """
+        Удаление отгулов `(oid, user_oid, department_oid, is_approved)` одной
+        транзакцией. Часы возвращаются только по связям, которые удалила эта
+        транзакция (`DELETE ... RETURNING`): повторное удаление того же отгула
+        ждёт блокировки связей, находит их удалёнными и ничего не возвращает.
+        Возвращает число удалённых отгулов.
+        """
+        oids = [oid for oid, _, _, _ in day_offs]
+        removed = (
+            delete(OvertimeDayOffLink)
+            .where(OvertimeDayOffLink.day_off_oid.in_(oids))
+            .returning(OvertimeDayOffLink.overtime_oid, OvertimeDayOffLink.hours_used)
+            .cte("removed")
+        )
+        restored = (
+            select(removed.c.overtime_oid, func.sum(removed.c.hours_used).label("hours"))
+            .group_by(removed.c.overtime_oid)
+            .subquery()
+        )
+        try:
+            released = await self.session.execute(
+                update(Overtime)
+                .where(Overtime.oid == restored.c.overtime_oid)
+                .values(
+                    remaining_hours=Overtime.remaining_hours + restored.c.hours,
+                    is_used=False,
+                )
+                .returning(Overtime.user_oid, restored.c.hours)
+                .execution_options(synchronize_session=False)
+            )
+            hours_by_user: Dict[uuid.UUID, int] = defaultdict(int)
+            for user_oid, hours in released.all():
+                hours_by_user[user_oid] += hours
+            await OvertimeBalanceRepository(self.session).release(hours_by_user)
+
+            deleted = await self.session.scalars(
+                delete(DayOff)
+                .where(DayOff.oid.in_(oids))
+                .returning(DayOff.oid)
+                .execution_options(synchronize_session=False)
+            )
+            deleted_oids = set(deleted.all())
+            await self.session.commit()
         except SQLAlchemyError as e:
+            await self.session.rollback()
             raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
-        
+
+        for oid, user_oid, department_oid, is_approved in day_offs:
+            if oid in deleted_oids and not is_approved:
+                unapproved_day_offs.add(user_oid, department_oid, -1)
+        return len(deleted_oids)
+
 
     async def approve(self, day_off: DayOff, is_approved: bool, current_user: User) -> DayOff:
         """Подтвердить отгул с проверкой отдела."""
@@ -271,62 +488,28 @@ class DayOffRepository(BaseRepo):
             if current_user.role == Role.MODERATOR and current_user.department_oid != day_off.user_rel.department_oid:
                 raise DepartmentPermissionError()
 
+            was_approved = day_off.is_approved
             day_off.is_approved = is_approved
             await self.session.commit()
+            self._track_approval_change(day_off, was_approved)
             return day_off
         except SQLAlchemyError as e:
             raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
         
 
+    @staticmethod
+    def _track_approval_change(day_off: DayOff, was_approved: bool) -> None:
+        """Обновляет счётчики навбара после смены статуса отгула."""
+        if bool(was_approved) != bool(day_off.is_approved):
+            unapproved_day_offs.add(
+                day_off.user_oid,
+                day_off.user_rel.department_oid,
+                -1 if day_off.is_approved else 1,
+            )
+
+
     async def get_overtimes_for_day_off(self, day_off: DayOff, current_user: User):
         """Получить переработки для отгула."""
-        def format_full_name(full_name: str) -> str:
-            name_parts = full_name.split()  
-            initials = '.'.join([part[0] for part in name_parts[1:]]) + '.'
-            return f"{initials} {name_parts[0]}"  
-        
-        def format_name_boss(full_name: str) -> str:
-            name_parts = full_name.split()  
-            initials = '.'.join([part[0] for part in name_parts[1:]]) + '.'
-            return f"{name_parts[0]} {initials}"
-
-        import pymorphy3
-
-        def to_genitive(name: str, case: str) -> str:
-            morph = pymorphy3.MorphAnalyzer()
-
-            # Словарь падежей с кодами для pymorphy3
-            cases = {
-                'nomn': 'именительный',
-                'gent': 'родительный',
-                'datv': 'дательный',
-                'accs': 'винительный',
-                'ablt': 'творительный',
-                'loct': 'предложный',
-            }
-
-            # Проверка валидности падежа
-            if case not in cases:
-                raise ValueError(f"Неизвестный падеж: {case}. Доступные падежи: {', '.join(cases.keys())}")
-
-            # Разделяем строку на слова
-            words = name.split()
-
-            # Если строка состоит из одного слова
-            if len(words) == 1:
-                parsed_word = morph.parse(words[0])[0]
-                inflected_word = parsed_word.inflect({case})
-                # Возвращаем слово в нужном падеже или исходное слово, если не склоняется
-                return inflected_word.word if inflected_word else words[0]
-
-            # Склоняем первое слово в нужный падеж
-            first_word_case = morph.parse(words[0])[0].inflect({case})
-            first_word_case = first_word_case.word.capitalize() if first_word_case else words[0]
-
-            # Остальные слова оставляем как есть
-            return ' '.join([first_word_case] + words[1:])
-        
-
         result = await self.session.execute(
             select(
                 Overtime.o_date,
@@ -346,21 +529,111 @@ class DayOffRepository(BaseRepo):
             for row in rows
         ]
 
-        # Формируем итоговый словарь
-        data = {
-            "date_report": day_off.create_at.strftime('%d.%m.%Y'), 
-            "date_day_off": day_off.o_date.strftime('%d.%m.%Y'),
-            "info_overtimes": info_overtimes,
-            "full_name_user": format_full_name(current_user.full_name), 
-            "position_user": current_user.position.capitalize(),
-            "rank_user": current_user.rank.lower(),
-            "name_organization": to_genitive(name=current_user.organization_rel.name, case='gent'),
-            "organization_name_boss": to_genitive(name=format_name_boss(current_user.organization_rel.name_boss), case='datv'),
-            "organization_position_boss": to_genitive(name=current_user.organization_rel.position, case='datv').capitalize(),
-            "organization_rank_boss": to_genitive(name=current_user.organization_rel.rank, case='datv'),
-            "department_user": current_user.department_rel.name
-        }
+        return build_report_data(
+            day_off=day_off,
+            user=current_user,
+            organization=current_user.organization_rel,
+            department=current_user.department_rel,
+            info_overtimes=info_overtimes,
+        )
 
-        return data
+    async def get_report_data_many(
+        self,
+        current_user: User,
+        export_filter: DayOffExportFilter,
+        limit: int,
+    ) -> List[Tuple[DayOff, User, dict]]:
+        """
+        Данные отчётов для всех отгулов под фильтр одним запросом: отгул,
+        его владелец, отдел, организация и списанные овертаймы.
+        """
+        stmt = (
+            select(DayOff, User, Department, Organization, Overtime.description, OvertimeDayOffLink.hours_used)
+            .join(User, User.oid == DayOff.user_oid)
+            .outerjoin(Department, Department.oid == User.department_oid)
+            .outerjoin(Organization, Organization.oid == User.organization_oid)
+            .outerjoin(OvertimeDayOffLink, OvertimeDayOffLink.day_off_oid == DayOff.oid)
+            .outerjoin(Overtime, Overtime.oid == OvertimeDayOffLink.overtime_oid)
+            .order_by(DayOff.o_date, DayOff.oid, Overtime.o_date)
+        )
+
+        # Модератор выгружает только свой отдел
+        if current_user.role == Role.MODERATOR:
+            stmt = stmt.where(User.department_oid == current_user.department_oid)
+        elif export_filter.department_oid is not None:
+            stmt = stmt.where(User.department_oid == export_filter.department_oid)
+        if export_filter.date_from is not None:
+            stmt = stmt.where(DayOff.o_date >= export_filter.date_from)
+        if export_filter.date_to is not None:
+            stmt = stmt.where(DayOff.o_date <= export_filter.date_to)
+        if export_filter.is_approved is not None:
+            stmt = stmt.where(DayOff.is_approved == export_filter.is_approved)
+
+        try:
+            result = await self.session.execute(stmt)
+        except SQLAlchemyError as e:
+            raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+        reports: dict = {}
+        for day_off, user, department, organization, description, hours_used in result:
+            if day_off.oid not in reports:
+                if len(reports) == limit:
+                    raise DayOffExportTooLarge(limit)
+                reports[day_off.oid] = (day_off, user, department, organization, [])
+            if description is not None:
+                reports[day_off.oid][4].append({"hours": hours_used, "description": description})
+
+        return [
+            (
+                day_off,
+                user,
+                build_report_data(
+                    day_off=day_off,
+                    user=user,
+                    organization=organization,
+                    department=department,
+                    info_overtimes=info_overtimes,
+                ),
+            )
+            for day_off, user, department, organization, info_overtimes in reports.values()
+        ]
 
 
+def format_full_name(full_name: str) -> str:
+    name_parts = full_name.split()  
+    initials = '.'.join([part[0] for part in name_parts[1:]]) + '.'
+    return f"{initials} {name_parts[0]}"  
+
+
+def _declined(organization: Optional[Organization], field: str, fallback: str) -> str:
+    """Просклонённое поле организации или, пока его нет, именительный падеж."""
+    if organization is None:
+        return ""
+    return getattr(organization, field) or getattr(organization, fallback)
+
+
+def build_report_data(
+    day_off: DayOff,
+    user: User,
+    organization: Optional[Organization],
+    department: Optional[Department],
+    info_overtimes: List[dict],
+) -> dict:
+    """
+    Словарь подстановок шаблона отчёта. Склонения считаются при сохранении
+    организации (старые записи — `scripts/backfill_organization_declensions.py`),
+    здесь морфология не вызывается. Без организации или отдела поля пустые.
+    """
+    return {
+        "date_report": day_off.create_at.strftime('%d.%m.%Y'), 
+        "date_day_off": day_off.o_date.strftime('%d.%m.%Y'),
+        "info_overtimes": info_overtimes,
+        "full_name_user": format_full_name(user.full_name), 
+        "position_user": user.position.capitalize(),
+        "rank_user": user.rank.lower(),
+        "name_organization": _declined(organization, "name_gent", "name"),
+        "organization_name_boss": _declined(organization, "name_boss_datv", "name_boss"),
+        "organization_position_boss": _declined(organization, "position_datv", "position").capitalize(),
+        "organization_rank_boss": _declined(organization, "rank_datv", "rank"),
+        "department_user": department.name if department is not None else "",
+    }
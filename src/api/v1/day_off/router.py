@@ -1,3 +1,4 @@
+from io import BytesIO
 from typing import Annotated
 from urllib.parse import quote, unquote
 import uuid
@@ -21,17 +22,29 @@ from src.api.v1.day_off.schemas import (
     PaginatedResponse,
     DayOffUpdate,
     DayOffUpdatePartil,
+    DayOffBulkDelete,
+    DayOffBulkDeleteOut,
+    DayOffRangeCreate,
+    DayOffExportFilter,
 )
 from src.api.v1.day_off.service import DayOffService
-from src.api.v1.auth.dependencies import get_current_user
-from src.api.v1.auth.permissions import RoleRequired
+from src.api.v1.auth.dependencies import (
+    RequestIdentity,
+    get_current_claims,
+    get_current_user,
+    get_request_identity,
+)
+from src.api.v1.auth.schemas import UserClaims
+from src.api.v1.auth.permissions import RoleEnforced, RoleRequired
 from src.api.v1.day_off.dependencies import day_off_by_oid
-from src.api.v1.day_off.errors import InsufficientOvertimeHours
+from src.api.v1.day_off.errors import DepartmentPermissionError, InsufficientOvertimeHours, InvalidDayOffRange
 from src.api.v1.day_off.dependencies import count_notifications_day_offs
 from src.middlewares.notification.dependencies import (
     get_unread_notifications_count_user,
 )
-from src.api.v1.day_off.generate_report import ReportGenerator
+from src.api.v1.day_off.report_renderer import report_renderer
+from src.api.v1.day_off.report_formats import ReportFormat
+from src.api.v1.day_off.export import stream_reports_zip
 
 
 router = APIRouter(
@@ -112,6 +125,44 @@ async def create_day_off(
         )
 
 
+@router.post(
+    "/create-range",
+    response_class=RedirectResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(RoleRequired([Role.SUPERUSER, Role.MODERATOR, Role.USER]))],
+    name="day_off:create_range",
+    description="Create day offs for every date in a range",
+)
+async def create_day_off_range(
+    request: Request,
+    session: Annotated[
+        AsyncSession,
+        Depends(db_helper.get_session),
+    ],
+    day_off_range: DayOffRangeCreate = Depends(DayOffRangeCreate.as_form),
+    current_user: User = Depends(get_current_user),
+):
+    try:
+        day_offs = await DayOffService(session).create_range(
+            current_user=current_user,
+            day_off_range=day_off_range,
+        )
+        response = RedirectResponse(
+            url="/day_off/create",
+            status_code=status.HTTP_303_SEE_OTHER,
+        )
+        success_message = quote(f"✔️ Создано отгулов: {len(day_offs)}")
+        response.set_cookie(key="success_message", value=success_message)
+        return response
+
+    except (InsufficientOvertimeHours, InvalidDayOffRange) as e:
+        return templates.TemplateResponse(
+            request=request,
+            name="day_offs/create.html",
+            context={"error": e.detail, "current_user": current_user},
+        )
+
+
 @router.get(
     "/",
     response_class=HTMLResponse,
@@ -122,11 +173,7 @@ async def create_day_off(
 )
 async def get_all_day_offs(
     request: Request,
-    session: Annotated[
-        AsyncSession,
-        Depends(db_helper.get_session),
-    ],
-    current_user: User = Depends(get_current_user),
+    identity: Annotated[RequestIdentity, Depends(get_request_identity)],
     limit: int = Query(10, ge=1, le=100),
     offset: int = Query(0, ge=0),
     filter: str = Query(None),
@@ -134,8 +181,9 @@ async def get_all_day_offs(
     notifications_count_user: int = Depends(get_unread_notifications_count_user),
 ):
     filter = True if filter == "true" else False
+    current_user = identity.user
 
-    data = await DayOffService(session).get_all(
+    data = await DayOffService(identity.session).get_all(
         current_user=current_user,
         limit=limit,
         offset=offset,
@@ -175,17 +223,15 @@ async def get_all_day_offs(
 )
 async def notifications_page(
     request: Request,
-    session: Annotated[
-        AsyncSession,
-        Depends(db_helper.get_session),
-    ],
-    current_user: User = Depends(get_current_user),
+    identity: Annotated[RequestIdentity, Depends(get_request_identity)],
     limit: int = Query(10, ge=1, le=100),
     offset: int = Query(0, ge=0),
     count_day_offs: int = Depends(count_notifications_day_offs),
     notifications_count_user: int = Depends(get_unread_notifications_count_user),
 ):
-    day_offs = await DayOffService(session).get_all(
+    current_user = identity.user
+
+    day_offs = await DayOffService(identity.session).get_all(
         current_user=current_user,
         limit=limit,
         offset=offset,
@@ -236,6 +282,31 @@ async def approve_day_off(
     )
 
 
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(RoleEnforced([Role.SUPERUSER, Role.MODERATOR]))],
+    name="day_off:export_reports",
+    description="Download reports for all matching day offs as one ZIP archive",
+)
+async def export_reports(
+    session: Annotated[AsyncSession, Depends(db_helper.get_session)],
+    export_filter: Annotated[DayOffExportFilter, Query()],
+    current_user: User = Depends(get_current_user),
+):
+    reports = await DayOffService(session).export_reports_data(
+        current_user=current_user,
+        export_filter=export_filter,
+    )
+
+    return StreamingResponse(
+        stream_reports_zip(reports, report_renderer),
+        media_type="application/zip",
+        headers={"Content-Disposition": "attachment; filename=raports.zip"},
+    )
+
+
 @router.get(
     "/{oid}",
     response_model=DayOffOut | DayOffExtendedOut,
@@ -247,7 +318,7 @@ async def approve_day_off(
 async def get_one_day_off(
     oid: Annotated[uuid.UUID, Path],
     session: Annotated[AsyncSession, Depends(db_helper.get_session)],
-    current_user: User = Depends(get_current_user),
+    current_user: UserClaims = Depends(get_current_claims),
 ):
     return await DayOffService(session).get_one(current_user=current_user, oid=oid)
 
@@ -314,6 +385,25 @@ async def delete_day_off(
     return RedirectResponse("/day_off/notifications", status_code=status.HTTP_303_SEE_OTHER)
 
 
+@router.post(
+    "/delete",
+    response_model=DayOffBulkDeleteOut,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(RoleRequired([Role.SUPERUSER, Role.MODERATOR]))],
+    name="day_off:delete_many",
+    description="Delete several day offs and give their hours back",
+)
+async def delete_day_offs(
+    session: Annotated[AsyncSession, Depends(db_helper.get_session)],
+    day_offs_delete: DayOffBulkDelete,
+    current_user: User = Depends(get_current_user),
+):
+    return await DayOffService(session).delete_many(
+        current_user=current_user,
+        day_offs_delete=day_offs_delete,
+    )
+
+
 @router.get(
     "/download_report/{oid}",
     response_class=FileResponse,
@@ -328,14 +418,43 @@ async def download_report(
     ],
     day_off: DayOff = Depends(day_off_by_oid),
     current_user: User = Depends(get_current_user),
+    report_format: ReportFormat = Query(ReportFormat.DOCX, alias="format"),
 ):
     data = await DayOffService(session).generate_report_data(day_off=day_off, current_user=current_user)
 
-    generator = ReportGenerator(data=data)
-    file_stream = generator.get_report_bytes()
+    report = await report_renderer.render(data, report_format)
 
     return StreamingResponse(
-        file_stream,
-        media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-        headers={"Content-Disposition": f"attachment; filename=raport-{day_off.o_date.strftime('%d.%m.%Y')}.docx"},
+        BytesIO(report),
+        media_type=report_format.media_type,
+        headers={"Content-Disposition": f"attachment; filename=raport-{day_off.o_date.strftime('%d.%m.%Y')}.{report_format.value}"},
     )
+
+
+@router.get(
+    "/preview_report/{oid}",
+    response_class=HTMLResponse,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(RoleEnforced([Role.SUPERUSER, Role.MODERATOR, Role.USER]))],
+    name="day_off:preview_report",
+    description="Report as a printable HTML page",
+)
+async def preview_report(
+    session: Annotated[
+        AsyncSession,
+        Depends(db_helper.get_session),
+    ],
+    day_off: DayOff = Depends(day_off_by_oid),
+    current_user: User = Depends(get_current_user),
+):
+    # Пользователь видит свои отгулы, модератор — отгулы своего отдела
+    if current_user.role == Role.USER and day_off.user_oid != current_user.oid:
+        raise DepartmentPermissionError("You can only preview reports for your own day offs.")
+    if current_user.role == Role.MODERATOR and day_off.user_rel.department_oid != current_user.department_oid:
+        raise DepartmentPermissionError()
+
+    data = await DayOffService(session).generate_report_data(day_off=day_off, current_user=current_user)
+
+    report = await report_renderer.render(data, ReportFormat.HTML)
+
+    return HTMLResponse(content=report)
@@ -2,7 +2,7 @@ from typing import List, TypeVar, Generic, Optional
 import uuid
 from fastapi import Form
 from pydantic import BaseModel, ConfigDict, Field
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 
 from src.api.v1.user.schemas import UserOut
 
@@ -38,6 +38,32 @@ class DayOffCreate(DayOffBase):
         )
 
 
+class DayOffRangeCreate(BaseModel):
+    date_from: date
+    date_to: date
+    reason: str
+
+    @classmethod
+    def as_form(
+        cls,
+        date_from: date = Form(...),
+        date_to: date = Form(...),
+        reason: str = Form(..., max_length=500),
+    ):
+        return cls(
+            date_from=date_from,
+            date_to=date_to,
+            reason=reason,
+        )
+
+    def days(self) -> int:
+        """Число дней периода, без построения списка дат."""
+        return (self.date_to - self.date_from).days + 1
+
+    def dates(self) -> List[date]:
+        return [self.date_from + timedelta(days=day) for day in range(self.days())]
+
+
 class DayOffUpdate(DayOffCreate):
     o_date: date | None = None
     reason: str | None = None
@@ -63,4 +89,19 @@ class DayOffExtendedOut(DayOffOut):
 
 class DayOffUpdateStatus(BaseModel):
     oid: uuid.UUID
-    is_approved: bool
\ No newline at end of file
+    is_approved: bool
+
+
+class DayOffBulkDelete(BaseModel):
+    oids: List[uuid.UUID] = Field(min_length=1, max_length=1000)
+
+
+class DayOffBulkDeleteOut(BaseModel):
+    deleted: int = Field(description='Number of deleted day offs')
+
+
+class DayOffExportFilter(BaseModel):
+    department_oid: Optional[uuid.UUID] = None
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+    is_approved: Optional[bool] = None
@@ -1,9 +1,12 @@
-from typing import List
+from datetime import date
+from typing import List, Tuple
 import uuid
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.models import Overtime, User, OvertimeDayOffLink, Role
+from src.core.config import settings
+from src.models import User, Role
 from src.api.v1.day_off.repository import DayOffRepository
+from src.api.v1.day_off.counters import unapproved_day_offs
 from src.api.v1.day_off.schemas import (
     DayOffCreate,
     DayOffOut,
@@ -11,13 +14,25 @@ from src.api.v1.day_off.schemas import (
     PaginatedResponse,
     DayOffUpdatePartil,
     DayOffUpdate,
+    DayOffBulkDelete,
+    DayOffBulkDeleteOut,
+    DayOffRangeCreate,
+    DayOffExportFilter,
+)
+from src.api.v1.day_off.errors import InsufficientOvertimeHours, InvalidDayOffRange
+from src.api.v1.day_off.overtime_allocator import (
+    AllocationStrategy,
+    OvertimeAllocator,
+    split_allocations,
 )
-from src.api.v1.day_off.overtime_allocator import OvertimeAllocator
 from src.api.v1.day_off.work_schedule_calculator import WorkScheduleCalculator
 from src.api.v1.user.schemas import UserOut
 from src.models import DayOff
 
 
+MAX_RANGE_DAYS = 31
+
+
 class DayOffService:
     def __init__(self, session: AsyncSession):
         self.repository = DayOffRepository(session=session)
@@ -28,43 +43,102 @@ class DayOffService:
         day_off_create: DayOffCreate,
     ) -> DayOffOut:
         """Логика создания отгула."""
-        required_hours = WorkScheduleCalculator.get_required_hours(user=current_user)
-        overtimes = await self.repository.get_available_overtimes(
-            user_oid=current_user.oid
+        [day_off] = await self._book(
+            current_user=current_user,
+            dates=[day_off_create.o_date],
+            reason=day_off_create.reason,
+        )
+        return day_off
+
+    async def create_range(
+        self,
+        current_user: User,
+        day_off_range: DayOffRangeCreate,
+    ) -> List[DayOffOut]:
+        """Отгулы на каждый день периода: все или ни одного."""
+        if not 0 < day_off_range.days() <= MAX_RANGE_DAYS:
+            raise InvalidDayOffRange(MAX_RANGE_DAYS)
+
+        return await self._book(
+            current_user=current_user,
+            dates=day_off_range.dates(),
+            reason=day_off_range.reason,
+        )
+
+    async def _book(
+        self,
+        current_user: User,
+        dates: List[date],
+        reason: str,
+    ) -> List[DayOffOut]:
+        """Одно списание часов на все даты и пакетная вставка отгулов."""
+        strategy, department_hours, remaining_hours = await self.repository.get_allocation_context(
+            user_oid=current_user.oid,
+        )
+        required_hours = WorkScheduleCalculator.get_required_hours(
+            user=current_user,
+            department_hours=department_hours,
         )
+        total_hours = required_hours * len(dates)
 
-        # Выделяем овертаймы для отгула
-        selected_overtimes_info = OvertimeAllocator.allocate_hours(
-            overtimes=overtimes, required_hours=required_hours
+        # Быстрый отказ по балансу, не блокируя овертаймы
+        if remaining_hours is not None and remaining_hours < total_hours:
+            raise InsufficientOvertimeHours()
+
+        allocations = await self._allocate(
+            user_oid=current_user.oid,
+            required_hours=total_hours,
+            strategy=AllocationStrategy(strategy) if strategy else settings.allocation.default_strategy,
+            on_date=dates[0],
         )
 
-        # Создаем новый отгул
-        new_day_off = await self.repository.create_day_off(
-            day_off_create=day_off_create,
+        # Создаем отгулы и связи в той же транзакции
+        day_offs = await self.repository.create_day_offs(
             current_user=current_user,
+            reason=reason,
+            dates=dates,
+            allocations=split_allocations(allocations, required_hours),
         )
 
-        # Создаем связи между отгулом и овертаймами
-        overtime_links = []
-        for selected_overtime_info in selected_overtimes_info:
-            overtime: Overtime = selected_overtime_info["overtime"]
-            hours_used = selected_overtime_info["hours_used"]
-            overtime_link = OvertimeDayOffLink(
-                overtime_oid=overtime.oid,
-                day_off_oid=new_day_off.oid,
-                hours_used=hours_used,
-            )
-            overtime_links.append(overtime_link)
+        return [DayOffOut.model_validate(day_off) for day_off in day_offs]
 
-        # Сохраняем связи в базе данных
-        await self.repository.create_overtime_day_off_links(overtime_links)
+    async def _allocate(
+        self,
+        user_oid: uuid.UUID,
+        required_hours: int,
+        strategy: AllocationStrategy,
+        on_date: date,
+    ) -> List[dict]:
+        """Списание часов по стратегии организации без коммита."""
+        if strategy == AllocationStrategy.FIFO:
+            # Старейшие овертаймы списываются одним запросом
+            allocations = await self.repository.allocate_overtimes(
+                user_oid=user_oid,
+                required_hours=required_hours,
+            )
+            if not allocations:
+                await self.repository.rollback()
+                raise InsufficientOvertimeHours()
+            return allocations
 
-        # Обновляем овертаймы в базе данных
-        await self.repository.update_overtimes(
-            overtimes=[overtime["overtime"] for overtime in selected_overtimes_info]
+        overtimes = await self.repository.get_available_overtimes(
+            user_oid=user_oid,
+            for_update=True,
         )
+        try:
+            allocations = OvertimeAllocator.allocate_hours(
+                overtimes=overtimes,
+                required_hours=required_hours,
+                strategy=strategy,
+                on_date=on_date,
+                lifetime_days=settings.allocation.overtime_lifetime_days,
+            )
+        except InsufficientOvertimeHours:
+            await self.repository.rollback()
+            raise
 
-        return DayOffOut.model_validate(new_day_off)
+        await self.repository.spend_overtimes(overtimes=overtimes, allocations=allocations)
+        return allocations
 
     async def get_all(
         self,
@@ -148,6 +222,17 @@ class DayOffService:
     async def delete(self, current_user: User, day_off: DayOff):
         await self.repository.delete(current_user=current_user, day_off=day_off)
 
+    async def delete_many(
+        self,
+        current_user: User,
+        day_offs_delete: DayOffBulkDelete,
+    ) -> DayOffBulkDeleteOut:
+        deleted = await self.repository.delete_many(
+            current_user=current_user,
+            oids=day_offs_delete.oids,
+        )
+        return DayOffBulkDeleteOut(deleted=deleted)
+
 
     async def approve(self, current_user: User, day_off: DayOff, is_approved: bool):
         day_off = await self.repository.approve(
@@ -159,8 +244,32 @@ class DayOffService:
 
 
     async def count_notifications(self, current_user: User) -> int:
-        return await self.repository.count_notifications_stmt_is_unapproved(current_user=current_user)
+        count = unapproved_day_offs.get(current_user)
+        if count is None:
+            count = await self.repository.count_notifications_stmt_is_unapproved(current_user=current_user)
+            unapproved_day_offs.set(current_user, count)
+        return count
     
 
     async def generate_report_data(self, day_off: DayOff, current_user: User):
-        return await self.repository.get_overtimes_for_day_off(day_off=day_off, current_user=current_user)
\ No newline at end of file
+        return await self.repository.get_overtimes_for_day_off(day_off=day_off, current_user=current_user)
+
+    async def export_reports_data(
+        self,
+        current_user: User,
+        export_filter: DayOffExportFilter,
+    ) -> List[Tuple[str, dict]]:
+        """Имена файлов в архиве и данные отчётов по фильтру."""
+        reports = await self.repository.get_report_data_many(
+            current_user=current_user,
+            export_filter=export_filter,
+            limit=settings.report.export_max_day_offs,
+        )
+        return [
+            (
+                f"{day_off.o_date.strftime('%Y-%m-%d')}_"
+                f"{'_'.join(user.full_name.split())}_{day_off.oid.hex[:8]}.docx",
+                data,
+            )
+            for day_off, user, data in reports
+        ]
@@ -1,16 +1,22 @@
+from typing import Optional
 from fastapi import HTTPException
 
+from src.core.config import settings
 from src.models import User, WorkSchedule
 
 
 class WorkScheduleCalculator:
-    
+
     @staticmethod
-    def get_required_hours(user: User) -> int:
+    def get_required_hours(user: User, department_hours: Optional[int] = None) -> int:
+        """Часы на отгул: переопределение отдела или значение для графика работы."""
+        if department_hours:
+            return department_hours
+
         if user.work_schedule == WorkSchedule.SHIFT:
-            return 24
+            return settings.allocation.shift_required_hours
         elif user.work_schedule == WorkSchedule.DAILY:
-            return 8
+            return settings.allocation.daily_required_hours
         else:
             raise HTTPException(
                 status_code=400,
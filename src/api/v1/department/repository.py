@@ -6,6 +6,7 @@ from sqlalchemy import select, Result
 from sqlalchemy.exc import SQLAlchemyError
 
 from src.core.repo.base import BaseRepo
+from src.api.v1.auth.cache import invalidate_all_users
 from src.models import Department
 from src.api.v1.department.schemas import (
     DepartmentCreate,
@@ -72,6 +73,7 @@ class DepartmentRepository(BaseRepo):
                 setattr(department, key, value)
 
             await self.session.commit()
+            invalidate_all_users()
             await self.session.refresh(department)
             return department
         except SQLAlchemyError as e:
@@ -82,6 +84,7 @@ class DepartmentRepository(BaseRepo):
         try:
             await self.session.delete(department)
             await self.session.commit()
+            invalidate_all_users()
         except SQLAlchemyError as e:
             await self.session.rollback()
             raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Optional
 import uuid
 from fastapi import Form
 from pydantic import BaseModel, ConfigDict
@@ -8,6 +9,7 @@ class DepartmentBase(BaseModel):
     name: str
     description: str
     organization_oid: uuid.UUID = None
+    day_off_hours: Optional[int] = None
 
 
 class DepartmentCreate(DepartmentBase):
@@ -17,12 +19,13 @@ class DepartmentCreate(DepartmentBase):
         name: str = Form(...),
         description: str = Form(...),
         organization_oid: uuid.UUID = Form(...),
-
+        day_off_hours: Optional[int] = Form(None, ge=1, le=24),
     ):
         return cls(
             name=name,
             description=description,
             organization_oid=organization_oid,
+            day_off_hours=day_off_hours,
         )
 
 
@@ -39,10 +42,12 @@ class DepartmentUpdatePartil(DepartmentCreate):
         cls,
         name: str = Form(None),
         description: str = Form(None),
+        day_off_hours: Optional[int] = Form(None, ge=1, le=24),
     ):
         return cls(
             name=name,
             description=description,
+            day_off_hours=day_off_hours,
         )
 
 
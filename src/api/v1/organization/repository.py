@@ -2,16 +2,26 @@ import uuid
 
 from typing import List, Optional, Tuple
 from fastapi import HTTPException
-from sqlalchemy import and_, func, select, Result
+from sqlalchemy import and_, func, or_, select, Result
 from sqlalchemy.orm import selectinload
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
+from src.core.morphology import format_name_boss, inflect
 from src.core.repo.base import BaseRepo
+from src.api.v1.auth.cache import invalidate_all_users
 from src.models import Organization, User
 from src.api.v1.organization.schemas import OrganizationCreate, OrganizationOut, OrganizationUpdate, OrganizationUpdatePartil
 
 
 
+def decline_organization(organization: Organization) -> None:
+    """Заполняет просклонённые формы полей организации для отчётов."""
+    organization.name_gent = inflect(organization.name, case='gent')
+    organization.name_boss_datv = inflect(format_name_boss(organization.name_boss), case='datv')
+    organization.position_datv = inflect(organization.position, case='datv')
+    organization.rank_datv = inflect(organization.rank, case='datv')
+
+
 class OrganizationRepository(BaseRepo):
 
     async def create(
@@ -24,7 +34,9 @@ class OrganizationRepository(BaseRepo):
                 name_boss=organization_create.name_boss,
                 position=organization_create.position,
                 rank=organization_create.rank,
+                allocation_strategy=organization_create.allocation_strategy,
             )
+            decline_organization(organization)
             self.session.add(organization)
             await self.session.commit()
             await self.session.refresh(organization)
@@ -88,10 +100,36 @@ class OrganizationRepository(BaseRepo):
         try:
             for key, value in organization_update.model_dump(exclude_unset=partial).items():
                 setattr(organization, key, value)
+            decline_organization(organization)
 
             await self.session.commit()
+            invalidate_all_users()
             await self.session.refresh(organization)
             return organization
         except SQLAlchemyError as e:
             raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
-        
\ No newline at end of file
+        
+
+    async def backfill_declensions(self, only_missing: bool = True) -> int:
+        """Пересчитывает просклонённые поля. Возвращает число организаций."""
+        try:
+            stmt = select(Organization)
+            if only_missing:
+                stmt = stmt.where(
+                    or_(
+                        Organization.name_gent.is_(None),
+                        Organization.name_boss_datv.is_(None),
+                        Organization.position_datv.is_(None),
+                        Organization.rank_datv.is_(None),
+                    )
+                )
+            organizations = (await self.session.scalars(stmt)).all()
+            for organization in organizations:
+                decline_organization(organization)
+
+            await self.session.commit()
+            invalidate_all_users()
+            return len(organizations)
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
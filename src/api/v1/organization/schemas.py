@@ -1,10 +1,11 @@
 from datetime import datetime
-from typing import Generic, List, TypeVar
+from typing import Generic, List, Optional, TypeVar
 import uuid
 from fastapi import Form
 from pydantic import BaseModel, ConfigDict, Field
 
 from src.api.v1.department.schemas import DepartmentOut
+from src.api.v1.day_off.overtime_allocator import AllocationStrategy
 
 
 M = TypeVar("M")
@@ -22,6 +23,9 @@ class OrganizationBase(BaseModel):
     name_boss: str
     position: str
     rank: str
+    allocation_strategy: Optional[AllocationStrategy] = None
+
+    model_config = ConfigDict(use_enum_values=True)
 
 
 class OrganizationCreate(OrganizationBase):
@@ -33,12 +37,14 @@ class OrganizationCreate(OrganizationBase):
         name_boss: str = Form(...),
         position: str = Form(...),
         rank: str = Form(...),
+        allocation_strategy: Optional[AllocationStrategy] = Form(None),
     ):
         return cls(
             name=name,
             name_boss=name_boss,
             position=position,
             rank=rank,
+            allocation_strategy=allocation_strategy,
         )
 
 
@@ -59,12 +65,14 @@ class OrganizationUpdatePartil(OrganizationCreate):
         name_boss: str = Form(None),
         position: str = Form(None),
         rank: str = Form(None),
+        allocation_strategy: Optional[AllocationStrategy] = Form(None),
     ):
         return cls(
             name=name,
             name_boss=name_boss,
             position=position,
             rank=rank,
+            allocation_strategy=allocation_strategy,
         )
 
 
@@ -0,0 +1,112 @@
+import uuid
+
+from typing import Dict, Optional
+from fastapi import HTTPException
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.core.repo.base import BaseRepo
+from src.models import Overtime, OvertimeBalance, OvertimeDayOffLink
+
+
+class OvertimeBalanceRepository(BaseRepo):
+    """
+    Баланс часов пользователя в `overtime_balances`.
+
+    Методы изменения не коммитят: баланс меняется в транзакции той записи,
+    которая его затрагивает (овертайм, списание часов, удаление отгула).
+    """
+
+    async def get(self, user_oid: uuid.UUID) -> Optional[OvertimeBalance]:
+        try:
+            return await self.session.get(OvertimeBalance, user_oid)
+        except SQLAlchemyError as e:
+            raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+    async def add_overtime(self, user_oid: uuid.UUID, hours: int) -> None:
+        """Новый овертайм: создаёт строку баланса, если её не было."""
+        stmt = pg_insert(OvertimeBalance).values(
+            user_oid=user_oid,
+            total_hours=hours,
+            used_hours=0,
+            remaining_hours=hours,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[OvertimeBalance.user_oid],
+            set_={
+                "total_hours": OvertimeBalance.total_hours + stmt.excluded.total_hours,
+                "remaining_hours": OvertimeBalance.remaining_hours + stmt.excluded.remaining_hours,
+                "update_at": func.now(),
+            },
+        )
+        await self.session.execute(stmt)
+
+    async def apply(
+        self,
+        user_oid: uuid.UUID,
+        total: int = 0,
+        used: int = 0,
+        remaining: int = 0,
+    ) -> None:
+        """Атомарно сдвигает счётчики баланса на переданные значения."""
+        if not (total or used or remaining):
+            return
+
+        await self.session.execute(
+            update(OvertimeBalance)
+            .where(OvertimeBalance.user_oid == user_oid)
+            .values(
+                total_hours=OvertimeBalance.total_hours + total,
+                used_hours=OvertimeBalance.used_hours + used,
+                remaining_hours=OvertimeBalance.remaining_hours + remaining,
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    async def release(self, hours_by_user: Dict[uuid.UUID, int]) -> None:
+        """Возвращает в баланс часы удалённых отгулов: `{user_oid: часы}`."""
+        for user_oid, hours in hours_by_user.items():
+            await self.apply(user_oid, used=-hours, remaining=hours)
+
+    async def rebuild(self, user_oid: Optional[uuid.UUID] = None) -> int:
+        """
+        Пересчитывает баланс из `overtimes` и `overtime_day_off_links`.
+        Без `user_oid` пересчитываются все пользователи. Возвращает число строк.
+        """
+        used_per_overtime = (
+            select(
+                OvertimeDayOffLink.overtime_oid,
+                func.sum(OvertimeDayOffLink.hours_used).label("hours_used"),
+            )
+            .group_by(OvertimeDayOffLink.overtime_oid)
+            .subquery()
+        )
+        totals = (
+            select(
+                Overtime.user_oid,
+                func.sum(Overtime.hours),
+                func.coalesce(func.sum(used_per_overtime.c.hours_used), 0),
+                func.sum(Overtime.remaining_hours),
+            )
+            .outerjoin(used_per_overtime, used_per_overtime.c.overtime_oid == Overtime.oid)
+            .group_by(Overtime.user_oid)
+        )
+        stmt_delete = delete(OvertimeBalance)
+        if user_oid is not None:
+            totals = totals.where(Overtime.user_oid == user_oid)
+            stmt_delete = stmt_delete.where(OvertimeBalance.user_oid == user_oid)
+
+        try:
+            await self.session.execute(stmt_delete.execution_options(synchronize_session=False))
+            result = await self.session.execute(
+                insert(OvertimeBalance).from_select(
+                    ["user_oid", "total_hours", "used_hours", "remaining_hours"],
+                    totals,
+                )
+            )
+            await self.session.commit()
+            return result.rowcount
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
@@ -9,8 +9,10 @@ from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
 from src.models.user import User
 from src.core.repo.base import BaseRepo
-from src.models import Overtime, Role
+from src.models import Overtime, OvertimeDayOffLink, Role
 
+from src.api.v1.overtime.balance import OvertimeBalanceRepository
+from src.api.v1.overtime.rollup import OvertimeRollupRepository
 from src.api.v1.overtime.schemas import OvertimeCreate, OvertimeUpdate, OvertimeUpdatePartial
 
 
@@ -29,6 +31,15 @@ class OvertimeRepository(BaseRepo):
                 description=overtime_create.description,
             )
             self.session.add(overtime)
+            await OvertimeBalanceRepository(self.session).add_overtime(
+                user_oid=current_user.oid,
+                hours=overtime.hours,
+            )
+            await OvertimeRollupRepository(self.session).add(
+                user_oid=current_user.oid,
+                o_date=overtime.o_date,
+                hours=overtime.hours,
+            )
             await self.session.commit()
             await self.session.refresh(overtime)
             return overtime
@@ -127,9 +138,22 @@ class OvertimeRepository(BaseRepo):
         partial: bool = False,
     ) -> Optional[Overtime]:
         try:
+            old_date, old_hours, old_remaining_hours = overtime.o_date, overtime.hours, overtime.remaining_hours
             for key, value in overtime_update.model_dump(exclude_unset=partial).items():
                 setattr(overtime, key, value)
 
+            await OvertimeBalanceRepository(self.session).apply(
+                user_oid=overtime.user_oid,
+                total=overtime.hours - old_hours,
+                remaining=overtime.remaining_hours - old_remaining_hours,
+            )
+            await OvertimeRollupRepository(self.session).move(
+                user_oid=overtime.user_oid,
+                old_date=old_date,
+                old_hours=old_hours,
+                new_date=overtime.o_date,
+                new_hours=overtime.hours,
+            )
             await self.session.commit()
             await self.session.refresh(overtime)
             return overtime
@@ -138,6 +162,22 @@ class OvertimeRepository(BaseRepo):
 
     async def delete(self, overtime: Overtime):
         try:
+            used_hours = await self.session.scalar(
+                select(func.coalesce(func.sum(OvertimeDayOffLink.hours_used), 0))
+                .where(OvertimeDayOffLink.overtime_oid == overtime.oid)
+            )
+            await OvertimeBalanceRepository(self.session).apply(
+                user_oid=overtime.user_oid,
+                total=-overtime.hours,
+                used=-used_hours,
+                remaining=-overtime.remaining_hours,
+            )
+            await OvertimeRollupRepository(self.session).add(
+                user_oid=overtime.user_oid,
+                o_date=overtime.o_date,
+                hours=-overtime.hours,
+                count=-1,
+            )
             await self.session.delete(overtime)
             await self.session.commit()
         except SQLAlchemyError as e:
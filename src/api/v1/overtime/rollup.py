@@ -0,0 +1,105 @@
+import uuid
+
+from datetime import date
+from typing import Optional
+from fastapi import HTTPException
+from sqlalchemy import Integer, cast, delete, func, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.core.repo.base import BaseRepo
+from src.models import Overtime, OvertimeMonthlyRollup
+
+
+class OvertimeRollupRepository(BaseRepo):
+    """
+    Помесячные итоги овертаймов в `overtime_monthly_rollups`.
+
+    Как и баланс, методы изменения не коммитят: итоги меняются в транзакции
+    самого овертайма.
+    """
+
+    async def add(self, user_oid: uuid.UUID, o_date: date, hours: int, count: int = 1) -> None:
+        """
+        Сдвигает итоги месяца `o_date` на `hours` часов и `count` овертаймов.
+        Отрицательные значения снимают овертайм; опустевший месяц удаляется.
+        """
+        stmt = pg_insert(OvertimeMonthlyRollup).values(
+            user_oid=user_oid,
+            year=o_date.year,
+            month=o_date.month,
+            hours=hours,
+            overtimes_count=count,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                OvertimeMonthlyRollup.user_oid,
+                OvertimeMonthlyRollup.year,
+                OvertimeMonthlyRollup.month,
+            ],
+            set_={
+                "hours": OvertimeMonthlyRollup.hours + stmt.excluded.hours,
+                "overtimes_count": OvertimeMonthlyRollup.overtimes_count + stmt.excluded.overtimes_count,
+                "update_at": func.now(),
+            },
+        )
+        await self.session.execute(stmt)
+
+        if count < 0:
+            await self.session.execute(
+                delete(OvertimeMonthlyRollup)
+                .where(
+                    OvertimeMonthlyRollup.user_oid == user_oid,
+                    OvertimeMonthlyRollup.year == o_date.year,
+                    OvertimeMonthlyRollup.month == o_date.month,
+                    OvertimeMonthlyRollup.overtimes_count <= 0,
+                )
+                .execution_options(synchronize_session=False)
+            )
+
+    async def move(
+        self,
+        user_oid: uuid.UUID,
+        old_date: date,
+        old_hours: int,
+        new_date: date,
+        new_hours: int,
+    ) -> None:
+        """Переносит овертайм между месяцами или меняет его часы."""
+        if (old_date.year, old_date.month) == (new_date.year, new_date.month):
+            if new_hours != old_hours:
+                await self.add(user_oid, new_date, new_hours - old_hours, count=0)
+            return
+
+        await self.add(user_oid, old_date, -old_hours, count=-1)
+        await self.add(user_oid, new_date, new_hours)
+
+    async def rebuild(self, user_oid: Optional[uuid.UUID] = None) -> int:
+        """
+        Пересчитывает итоги из `overtimes`. Без `user_oid` пересчитываются
+        все пользователи. Возвращает число строк.
+        """
+        year = cast(func.extract("year", Overtime.o_date), Integer)
+        month = cast(func.extract("month", Overtime.o_date), Integer)
+        totals = (
+            select(Overtime.user_oid, year, month, func.sum(Overtime.hours), func.count())
+            .group_by(Overtime.user_oid, year, month)
+        )
+        stmt_delete = delete(OvertimeMonthlyRollup)
+        if user_oid is not None:
+            totals = totals.where(Overtime.user_oid == user_oid)
+            stmt_delete = stmt_delete.where(OvertimeMonthlyRollup.user_oid == user_oid)
+
+        try:
+            await self.session.execute(stmt_delete.execution_options(synchronize_session=False))
+            result = await self.session.execute(
+                insert(OvertimeMonthlyRollup).from_select(
+                    ["user_oid", "year", "month", "hours", "overtimes_count"],
+                    totals,
+                )
+            )
+            await self.session.commit()
+            return result.rowcount
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
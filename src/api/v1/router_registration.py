@@ -7,6 +7,7 @@ from src.api.v1.department.router import router as department_router
 from src.api.v1.overtime.router import router as overtime_router
 from src.api.v1.day_off.router import router as day_off_router
 from src.api.v1.organization.router import router as organization_router
+from src.api.v1.analytics.router import router as analytics_router
 
 
 def register_routers(app: FastAPI) -> None:
@@ -24,3 +25,4 @@ def register_routers(app: FastAPI) -> None:
     app.include_router(overtime_router)
     app.include_router(day_off_router)
     app.include_router(organization_router)
+    app.include_router(analytics_router)
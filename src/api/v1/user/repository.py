@@ -3,18 +3,31 @@ import uuid
 
 from typing import List, Optional, Tuple
 from fastapi import HTTPException
-from sqlalchemy import and_, func, select, Result
+from sqlalchemy import Integer, Select, and_, func, literal, select, true, Result
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.orm import selectinload
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
 from src.core.repo.base import BaseRepo
-from src.models import User, Role, Overtime, DayOff
+from src.models import User, Role, Overtime, DayOff, OvertimeBalance, OvertimeMonthlyRollup
 from src.api.v1.user.schemas import UserCreate, UserUpdatePartial, UserUpdate, SuperUserCreate
-from src.api.v1.auth.security import get_password_hash
+from src.api.v1.auth.security import password_hasher
+from src.api.v1.auth.cache import invalidate_user
+from src.middlewares.notification.counter import pending_registrations
+from src.api.v1.day_off.counters import unapproved_day_offs
+
+
+# Поля пользователя, которые попадают в токен с утверждениями
+TOKEN_CLAIM_FIELDS = ("role", "department_oid", "organization_oid", "work_schedule")
 
 
 class UserRepository(BaseRepo):
 
+    @staticmethod
+    def _revoke_tokens(user: User) -> None:
+        """Делает недействительными ранее выданные токены пользователя."""
+        user.token_version = (user.token_version or 0) + 1
+
     async def get_user_by_username(self, username: str) -> Optional[User]:
         stmt = select(User).where(User.username == username)
         result: Result = await self.session.scalar(stmt)
@@ -27,7 +40,7 @@ class UserRepository(BaseRepo):
 
     async def create(self, data: UserCreate) -> User:
         try:
-            hashed_password = get_password_hash(data.password)
+            hashed_password = await password_hasher.hash(data.password)
 
             user_data = data.model_dump(exclude={"password"})
             user_data["hashed_password"] = hashed_password
@@ -36,6 +49,8 @@ class UserRepository(BaseRepo):
             self.session.add(user)
             await self.session.commit()
             await self.session.refresh(user)
+            if not user.is_active:
+                pending_registrations.add(1)
             return user
         except IntegrityError as e:
             raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
@@ -43,7 +58,7 @@ class UserRepository(BaseRepo):
     
     async def create_superuser(self, data: SuperUserCreate) -> User:
         try:
-            hashed_password = get_password_hash(data.password)
+            hashed_password = await password_hasher.hash(data.password)
 
             user_data = data.model_dump(exclude={"password"})
             user_data["hashed_password"] = hashed_password
@@ -93,8 +108,14 @@ class UserRepository(BaseRepo):
         is_active: bool,
     ) -> User:
         try:
+            was_active = user.is_active
             user.is_active = is_active
+            if was_active and not is_active:
+                self._revoke_tokens(user)
             await self.session.commit()
+            invalidate_user(user.oid)
+            if was_active != is_active:
+                pending_registrations.add(-1 if is_active else 1)
             await self.session.refresh(user)
             return user
         
@@ -124,8 +145,13 @@ class UserRepository(BaseRepo):
     ) -> User:
         # try:
             for key, value in user_update.model_dump(exclude_unset=partil).items():
+                if key in TOKEN_CLAIM_FIELDS and getattr(user, key) != value:
+                    self._revoke_tokens(user)
                 setattr(user, key, value)
             await self.session.commit()
+            invalidate_user(user.oid)
+            # Пользователь мог перейти в другой отдел
+            unapproved_day_offs.clear()
             await self.session.refresh(user)
             return user
         # except SQLAlchemyError as e:
@@ -136,6 +162,10 @@ class UserRepository(BaseRepo):
         try:
             await self.session.delete(user)
             await self.session.commit()
+            invalidate_user(user.oid)
+            unapproved_day_offs.clear()
+            if not user.is_active:
+                pending_registrations.add(-1)
         except SQLAlchemyError as e:
             await self.session.rollback()
             raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
@@ -148,7 +178,9 @@ class UserRepository(BaseRepo):
                     status_code=400, detail="User already has this role"
                 )
             user.role = role
+            self._revoke_tokens(user)
             await self.session.commit()
+            invalidate_user(user.oid)
             await self.session.refresh(user)
             return user
         except SQLAlchemyError as e:
@@ -156,63 +188,125 @@ class UserRepository(BaseRepo):
             raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
 
-    async def get_statistics_current_user(self, current_user: User, selected_year: int = None):
+    @staticmethod
+    def _statistics_stmt(user_oid: uuid.UUID, selected_year: Optional[int], today: date) -> Select:
+        """
+        Годы и часы по месяцам читаются из помесячных итогов (не больше 12
+        строк на год), остаток часов — из баланса; сырые овертаймы читаются
+        только по частичному индексу неиспользованных.
+        """
+        user_rollups = (
+            select(OvertimeMonthlyRollup.year, OvertimeMonthlyRollup.month, OvertimeMonthlyRollup.hours)
+            .where(OvertimeMonthlyRollup.user_oid == user_oid)
+        )
+
         # Получаем список всех доступных лет с переработками
-        result = await self.session.execute(
-            select(func.extract("year", Overtime.o_date).distinct())
-            .where(Overtime.user_oid == current_user.oid)
+        years = (
+            select(OvertimeMonthlyRollup.year)
+            .where(OvertimeMonthlyRollup.user_oid == user_oid)
+            .distinct()
+            .cte("years")
         )
-        available_years = [int(row[0]) for row in result.fetchall() if row[0] is not None]
 
         # Если год не выбран, берем последний доступный
-        selected_year = selected_year or (max(available_years) if available_years else date.today().year)
+        if selected_year:
+            chosen_year = literal(selected_year, Integer)
+        else:
+            chosen_year = func.coalesce(
+                select(func.max(years.c.year)).scalar_subquery(),
+                today.year,
+            )
+        chosen = select(chosen_year.label("year")).cte("chosen")
+
+        # Часы переработок по месяцам для выбранного года
+        monthly = (
+            user_rollups
+            .join(chosen, OvertimeMonthlyRollup.year == chosen.c.year)
+            .cte("monthly")
+        )
 
-        # Получаем часы переработок по месяцам для выбранного года
-        result = await self.session.execute(
+        total_overtimes = (
+            select(func.coalesce(func.sum(OvertimeMonthlyRollup.overtimes_count), 0))
+            .where(OvertimeMonthlyRollup.user_oid == user_oid)
+            .scalar_subquery()
+        )
+        unused_overtimes = (
+            select(func.count())
+            .select_from(Overtime)
+            .where(Overtime.user_oid == user_oid, Overtime.is_used == False)
+            .scalar_subquery()
+        )
+        overtime_counts = (
             select(
-                func.extract("month", Overtime.o_date),
-                func.sum(Overtime.hours)
+                total_overtimes.label("total"),
+                unused_overtimes.label("remaining"),
+                select(OvertimeBalance.remaining_hours)
+                .where(OvertimeBalance.user_oid == user_oid)
+                .scalar_subquery()
+                .label("total_remaining_hours"),
             )
-            .where(
-                Overtime.user_oid == current_user.oid,
-                func.extract("year", Overtime.o_date) == selected_year
+            .cte("overtime_counts")
+        )
+        overtime_totals = (
+            select(
+                overtime_counts.c.total,
+                (overtime_counts.c.total - overtime_counts.c.remaining).label("used"),
+                overtime_counts.c.remaining,
+                overtime_counts.c.total_remaining_hours,
             )
-            .group_by(func.extract("month", Overtime.o_date))
+            .cte("overtime_totals")
         )
 
-        monthly_overtime = {int(month): hours for month, hours in result.fetchall()}
-
-        # Получаем общую статистику (оставляем как было)
-        result = await self.session.execute(
+        day_off_totals = (
             select(
-                func.count(Overtime.oid),
-                func.count().filter(Overtime.is_used == True),
-                func.count().filter(Overtime.is_used == False),
-                func.sum(Overtime.remaining_hours),
-            ).where(Overtime.user_oid == current_user.oid)
+                func.count(DayOff.oid).label("total"),
+                func.count().filter(DayOff.o_date < today).label("used"),
+                func.count().filter(DayOff.o_date >= today).label("remaining"),
+            )
+            .where(DayOff.user_oid == user_oid)
+            .cte("day_off_totals")
         )
-        total_overtimes, used_overtimes, remaining_overtimes, total_remaining_hours = result.first()
 
-        # Получаем данные об отгулах
-        today = date.today()
-        result = await self.session.execute(
+        return (
             select(
-                func.count(DayOff.oid),
-                func.count().filter(DayOff.o_date < today),
-                func.count().filter(DayOff.o_date >= today),
-            ).where(DayOff.user_oid == current_user.oid)
+                chosen.c.year,
+                select(func.array_agg(aggregate_order_by(years.c.year, years.c.year))).scalar_subquery().label("years"),
+                select(func.array_agg(aggregate_order_by(monthly.c.month, monthly.c.month))).scalar_subquery().label("months"),
+                select(func.array_agg(aggregate_order_by(monthly.c.hours, monthly.c.month))).scalar_subquery().label("month_hours"),
+                overtime_totals,
+                day_off_totals,
+            )
+            .select_from(chosen)
+            .join(overtime_totals, true())
+            .join(day_off_totals, true())
         )
-        total_day_offs, used_day_offs, remaining_day_offs = result.first()
+
+    async def get_statistics_current_user(self, current_user: User, selected_year: int = None):
+        """
+        Статистика профиля одним запросом: доступные годы, часы по месяцам
+        выбранного года, итоги по переработкам и по отгулам.
+        """
+        stmt = self._statistics_stmt(current_user.oid, selected_year, date.today())
+        try:
+            row = (await self.session.execute(stmt)).one()
+        except SQLAlchemyError as e:
+            raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+        (
+            selected_year, available_years, months, month_hours,
+            total_overtimes, used_overtimes, remaining_overtimes, total_remaining_hours,
+            total_day_offs, used_day_offs, remaining_day_offs,
+        ) = row
 
         return {
-            "years": available_years,
+            "years": available_years or [],
             "selected_year": selected_year,
             "overtime": {
                 "total": total_overtimes,
                 "used": used_overtimes,
                 "remaining": remaining_overtimes,
                 "total_remaining_hours": total_remaining_hours,
-                "monthly": monthly_overtime,
+                "monthly": dict(zip(months or [], month_hours or [])),
             },
             "day_off": {
                 "total": total_day_offs,
@@ -8,7 +8,8 @@ from src.models.user import Role, User
 from src.core.database.infrastructure import db_helper
 from src.api.conf_static import templates
 from src.api.v1.auth.permissions import RoleRequired
-from src.api.v1.auth.dependencies import get_current_user
+from src.api.v1.auth.dependencies import get_current_claims, get_current_user
+from src.api.v1.auth.schemas import UserClaims
 from src.api.v1.department.service import DepartmentService
 from src.api.v1.organization.service import OrganizationService
 from src.api.v1.user.service import UserService
@@ -217,7 +218,7 @@ async def get_me(
 )
 async def get_statistics_current_year(
     session: Annotated[AsyncSession, Depends(db_helper.get_session)],
-    current_user: User = Depends(get_current_user),
+    current_user: UserClaims = Depends(get_current_claims),
     year: int = None,
 ):
     statistics = await UserService(session).get_statistics_current_user(current_user, selected_year=year)  # Получаем статистику с указанным годом
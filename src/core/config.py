@@ -1,7 +1,10 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional
 
 from environs import Env
+from marshmallow.validate import OneOf
+
+from src.api.v1.day_off.overtime_allocator import AllocationStrategy
 
 
 @dataclass
@@ -75,6 +78,11 @@ class ApiConfig:
     access_token_expire_minutes: int
     host: str = "127.0.0.1"
     port: int = 8000
+    password_hash_workers: int = 4
+    password_hash_queue: int = 64
+    token_claims: bool = False
+    token_refresh_threshold_minutes: int = 10
+    session_max_age_minutes: int = 720
 
     @staticmethod
     def from_env(env: Env):
@@ -85,11 +93,130 @@ class ApiConfig:
         access_token_expire_minutes = env.int("ACCESS_TOKEN_EXPIRE_MINUTES")
         host = env.str("API_HOST")
         port = env.int("API_PORT")
+        password_hash_workers = env.int("PASSWORD_HASH_WORKERS", 4)
+        password_hash_queue = env.int("PASSWORD_HASH_QUEUE", 64)
+        token_claims = env.bool("TOKEN_CLAIMS", False)
+        token_refresh_threshold_minutes = env.int("TOKEN_REFRESH_THRESHOLD_MINUTES", 10)
+        session_max_age_minutes = env.int("SESSION_MAX_AGE_MINUTES", 720)
         return ApiConfig(
             secret_key=secret_key,
             access_token_expire_minutes=access_token_expire_minutes,
             host=host,
             port=port,
+            password_hash_workers=password_hash_workers,
+            password_hash_queue=password_hash_queue,
+            token_claims=token_claims,
+            token_refresh_threshold_minutes=token_refresh_threshold_minutes,
+            session_max_age_minutes=session_max_age_minutes,
+        )
+
+
+@dataclass
+class CacheConfig:
+    """
+    Creates the CacheConfig object from environment variables.
+    """
+
+    user_ttl_seconds: int = 60
+    user_maxsize: int = 1024
+    pending_users_reconcile_seconds: int = 300
+    day_off_counters_ttl_seconds: int = 300
+    token_version_ttl_seconds: int = 30
+    analytics_ttl_seconds: int = 60
+    analytics_maxsize: int = 256
+
+    @staticmethod
+    def from_env(env: Env):
+        """
+        Creates the CacheConfig object from environment variables.
+        """
+        user_ttl_seconds = env.int("USER_CACHE_TTL_SECONDS", 60)
+        user_maxsize = env.int("USER_CACHE_MAXSIZE", 1024)
+        pending_users_reconcile_seconds = env.int("PENDING_USERS_RECONCILE_SECONDS", 300)
+        day_off_counters_ttl_seconds = env.int("DAY_OFF_COUNTERS_TTL_SECONDS", 300)
+        token_version_ttl_seconds = env.int("TOKEN_VERSION_TTL_SECONDS", 30)
+        analytics_ttl_seconds = env.int("ANALYTICS_CACHE_TTL_SECONDS", 60)
+        analytics_maxsize = env.int("ANALYTICS_CACHE_MAXSIZE", 256)
+        return CacheConfig(
+            user_ttl_seconds=user_ttl_seconds,
+            user_maxsize=user_maxsize,
+            pending_users_reconcile_seconds=pending_users_reconcile_seconds,
+            day_off_counters_ttl_seconds=day_off_counters_ttl_seconds,
+            token_version_ttl_seconds=token_version_ttl_seconds,
+            analytics_ttl_seconds=analytics_ttl_seconds,
+            analytics_maxsize=analytics_maxsize,
+        )
+
+
+@dataclass
+class AllocationConfig:
+    """
+    Creates the AllocationConfig object from environment variables.
+    """
+
+    daily_required_hours: int = 8
+    shift_required_hours: int = 24
+    default_strategy: AllocationStrategy = AllocationStrategy.FIFO
+    overtime_lifetime_days: int = 365
+
+    @staticmethod
+    def from_env(env: Env):
+        """
+        Creates the AllocationConfig object from environment variables.
+        """
+        daily_required_hours = env.int("DAILY_REQUIRED_HOURS", 8)
+        shift_required_hours = env.int("SHIFT_REQUIRED_HOURS", 24)
+        # Неизвестная стратегия должна останавливать запуск, а не каждый отгул
+        default_strategy = AllocationStrategy(
+            env.str(
+                "ALLOCATION_STRATEGY",
+                AllocationStrategy.FIFO.value,
+                validate=OneOf([strategy.value for strategy in AllocationStrategy]),
+            )
+        )
+        overtime_lifetime_days = env.int("OVERTIME_LIFETIME_DAYS", 365)
+        return AllocationConfig(
+            daily_required_hours=daily_required_hours,
+            shift_required_hours=shift_required_hours,
+            default_strategy=default_strategy,
+            overtime_lifetime_days=overtime_lifetime_days,
+        )
+
+
+@dataclass
+class ReportConfig:
+    """
+    Creates the ReportConfig object from environment variables.
+    """
+
+    render_workers: int = 2
+    render_queue: int = 16
+    render_timeout_seconds: float = 30.0
+    export_max_day_offs: int = 2000
+    cache_dir: str = ".cache/reports"
+    cache_max_mb: int = 256
+    pdf_converter: str = "soffice"
+
+    @staticmethod
+    def from_env(env: Env):
+        """
+        Creates the ReportConfig object from environment variables.
+        """
+        render_workers = env.int("REPORT_RENDER_WORKERS", 2)
+        render_queue = env.int("REPORT_RENDER_QUEUE", 16)
+        render_timeout_seconds = env.float("REPORT_RENDER_TIMEOUT_SECONDS", 30.0)
+        export_max_day_offs = env.int("REPORT_EXPORT_MAX_DAY_OFFS", 2000)
+        cache_dir = env.str("REPORT_CACHE_DIR", ".cache/reports")
+        cache_max_mb = env.int("REPORT_CACHE_MAX_MB", 256)
+        pdf_converter = env.str("REPORT_PDF_CONVERTER", "soffice")
+        return ReportConfig(
+            render_workers=render_workers,
+            render_queue=render_queue,
+            render_timeout_seconds=render_timeout_seconds,
+            export_max_day_offs=export_max_day_offs,
+            cache_dir=cache_dir,
+            cache_max_mb=cache_max_mb,
+            pdf_converter=pdf_converter,
         )
 
 
@@ -108,10 +235,19 @@ class Settings:
         Holds the settings specific to the database (default is None).
     redis : Optional[RedisConfig]
         Holds the settings specific to Redis (default is None).
+    cache : CacheConfig
+        Holds the settings of the in-process caches.
+    allocation : AllocationConfig
+        Holds the settings of overtime allocation for day offs.
+    report : ReportConfig
+        Holds the settings of day-off report rendering.
     """
 
     db: Optional[DbConfig] = None
     api: Optional[ApiConfig] = None
+    cache: CacheConfig = field(default_factory=CacheConfig)
+    allocation: AllocationConfig = field(default_factory=AllocationConfig)
+    report: ReportConfig = field(default_factory=ReportConfig)
 
 
 def load_settings(path: str) -> Settings:
@@ -128,6 +264,9 @@ def load_settings(path: str) -> Settings:
     return Settings(
         db=DbConfig.from_env(env),
         api=ApiConfig.from_env(env),
+        cache=CacheConfig.from_env(env),
+        allocation=AllocationConfig.from_env(env),
+        report=ReportConfig.from_env(env),
     )
 
 
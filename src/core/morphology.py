@@ -0,0 +1,66 @@
+from functools import lru_cache
+from threading import Lock
+from typing import Optional
+
+import pymorphy3
+
+
+# Падежи pymorphy3, в которые склоняются строки отчётов
+CASES = {
+    'nomn': 'именительный',
+    'gent': 'родительный',
+    'datv': 'дательный',
+    'accs': 'винительный',
+    'ablt': 'творительный',
+    'loct': 'предложный',
+}
+
+_morph: Optional[pymorphy3.MorphAnalyzer] = None
+_morph_lock = Lock()
+
+
+def get_morph() -> pymorphy3.MorphAnalyzer:
+    """
+    Общий на процесс MorphAnalyzer. Словари загружаются при первом вызове:
+    это десятки МБ и сотни миллисекунд, поэтому анализатор не создаётся
+    на каждый запрос.
+    """
+    global _morph
+    if _morph is None:
+        with _morph_lock:
+            if _morph is None:
+                _morph = pymorphy3.MorphAnalyzer()
+    return _morph
+
+
+def format_name_boss(full_name: str) -> str:
+    """«Иванов Иван Иванович» -> «Иванов И.И.»"""
+    name_parts = full_name.split()
+    initials = '.'.join([part[0] for part in name_parts[1:]]) + '.'
+    return f"{name_parts[0]} {initials}"
+
+
+@lru_cache(maxsize=4096)
+def inflect(text: str, case: str) -> str:
+    """
+    Склоняет строку в падеж `case`. У многословной строки склоняется только
+    первое слово, остальные остаются как есть. Несклоняемые слова
+    возвращаются без изменений.
+    """
+    if case not in CASES:
+        raise ValueError(f"Неизвестный падеж: {case}. Доступные падежи: {', '.join(CASES.keys())}")
+
+    words = text.split()
+    if not words:
+        return text
+
+    morph = get_morph()
+
+    if len(words) == 1:
+        inflected_word = morph.parse(words[0])[0].inflect({case})
+        return inflected_word.word if inflected_word else words[0]
+
+    first_word_case = morph.parse(words[0])[0].inflect({case})
+    first_word_case = first_word_case.word.capitalize() if first_word_case else words[0]
+
+    return ' '.join([first_word_case] + words[1:])
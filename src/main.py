@@ -16,7 +16,9 @@ from src.api.v1.router_registration import register_routers
 from src.api.error_handlers import register_error_handlers
 from src.core.config import settings
 from src.core.logging import setup_logging
+from src.api.v1.day_off.report_renderer import report_renderer
 from src.middlewares.notification.middleware import NotificationMiddleware
+from src.middlewares.token_refresh.middleware import TokenRefreshMiddleware
 
 
 def create_app():
@@ -32,6 +34,9 @@ def create_app():
     register_error_handlers(app)
 
     app.add_middleware(NotificationMiddleware)
+    app.add_middleware(TokenRefreshMiddleware)
+
+    app.add_event_handler("shutdown", report_renderer.shutdown)
 
 
     @app.get("/")
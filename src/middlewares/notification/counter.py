@@ -0,0 +1,62 @@
+import asyncio
+import time
+from typing import Callable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import settings
+from src.middlewares.notification.service import NotificationService
+
+
+class PendingRegistrationCounter:
+    """
+    Количество неподтверждённых регистраций, хранящееся в памяти процесса.
+
+    Значение меняется путями создания, подтверждения и удаления пользователей
+    и периодически сверяется с БД, чтобы исправить расхождения между воркерами.
+    """
+
+    def __init__(
+        self,
+        reconcile_interval: float,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        self.reconcile_interval = reconcile_interval
+        self._timer = timer
+        self._value: Optional[int] = None
+        self._reconciled_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def value(self) -> int:
+        return self._value or 0
+
+    @property
+    def needs_reconcile(self) -> bool:
+        if self._reconciled_at is None:
+            return True
+        return self._timer() - self._reconciled_at >= self.reconcile_interval
+
+    def set(self, value: int) -> None:
+        self._value = value
+        self._reconciled_at = self._timer()
+
+    def add(self, delta: int) -> None:
+        # Пока значение не загружено из БД, изменения учтёт первая сверка
+        if self._value is not None:
+            self._value = max(self._value + delta, 0)
+
+    def reset(self) -> None:
+        self._value = None
+        self._reconciled_at = None
+
+    async def reconcile(self, session: AsyncSession) -> int:
+        async with self._lock:
+            if self.needs_reconcile:
+                self.set(await NotificationService(session).get_inactive_users_count())
+        return self.value
+
+
+pending_registrations = PendingRegistrationCounter(
+    reconcile_interval=settings.cache.pending_users_reconcile_seconds,
+)
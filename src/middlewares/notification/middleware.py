@@ -1,23 +1,43 @@
 # middlewares/notification_middleware.py
-from typing import Annotated
-from starlette.middleware.base import BaseHTTPMiddleware
-from fastapi import Request, Depends
-from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import Request
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from src.core.database.infrastructure import db_helper
-from src.middlewares.notification.service import NotificationService
+from src.middlewares.notification.counter import pending_registrations
 
 
-class NotificationMiddleware(BaseHTTPMiddleware):
-    async def dispatch(
-        self, 
-        request: Request,
-        call_next,
-    ):
-        async with db_helper.sessionmaker() as session:
-            notifications_count_user = await NotificationService(session).get_inactive_users_count()
+SKIP_PATH_PREFIXES = ("/static", "/auth")
 
-            request.state.notifications_count_user = notifications_count_user
-            response = await call_next(request)
 
-            return response
+def renders_navbar(request: Request) -> bool:
+    """Счётчик нужен только HTML-страницам авторизованных пользователей."""
+    if request.method != "GET" or "access_token" not in request.cookies:
+        return False
+    if request.url.path.startswith(SKIP_PATH_PREFIXES):
+        return False
+    return "text/html" in request.headers.get("accept", "")
+
+
+class NotificationMiddleware:
+    """
+    ASGI-middleware, записывающее в `request.state.notifications_count_user`
+    количество неподтверждённых регистраций.
+
+    В отличие от BaseHTTPMiddleware не оборачивает ответ в отдельную задачу
+    и поток, поэтому StreamingResponse отдаётся напрямую.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            request = Request(scope)
+            if renders_navbar(request):
+                if pending_registrations.needs_reconcile:
+                    async with db_helper.sessionmaker() as session:
+                        await pending_registrations.reconcile(session)
+
+                request.state.notifications_count_user = pending_registrations.value
+
+        await self.app(scope, receive, send)
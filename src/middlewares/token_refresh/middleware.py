@@ -0,0 +1,86 @@
+import uuid
+from typing import Optional
+
+from jose import jwt, JWTError
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.config import settings
+from src.core.database.infrastructure import db_helper
+from src.api.v1.auth.jwt import ALGORITHM, needs_refresh, refresh_access_token
+from src.api.v1.auth.service import AuthService
+
+
+COOKIE_NAME = "access_token"
+
+
+async def get_token_version(user_oid: uuid.UUID) -> Optional[int]:
+    # Сессия не берёт соединение из пула, если версия есть в кэше
+    async with db_helper.sessionmaker() as session:
+        return await AuthService(session).get_token_version(user_oid=user_oid)
+
+
+def build_cookie_header(token: str) -> str:
+    response = Response()
+    response.set_cookie(
+        key=COOKIE_NAME,
+        value=token,
+        max_age=settings.api.access_token_expire_minutes * 60,
+        httponly=True,
+    )
+    return response.headers["set-cookie"]
+
+
+class TokenRefreshMiddleware:
+    """
+    Скользящее продление сессии: если токен из cookie скоро истечёт,
+    к ответу добавляется cookie с новым токеном, без повторного ввода пароля.
+
+    Истёкшие, отозванные (сменилась версия) и слишком старые сессии
+    не продлеваются.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = Request(scope).cookies.get(COOKIE_NAME)
+        new_token = await self.refresh(token) if token else None
+        if new_token is None:
+            await self.app(scope, receive, send)
+            return
+
+        cookie_header = build_cookie_header(new_token)
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                # Ответ сам управляет cookie (вход, выход)
+                already_set = any(
+                    value.startswith(f"{COOKIE_NAME}=")
+                    for value in headers.getlist("set-cookie")
+                )
+                if not already_set:
+                    headers.append("set-cookie", cookie_header)
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
+
+    async def refresh(self, token: str) -> Optional[str]:
+        try:
+            payload = jwt.decode(token, settings.api.secret_key, algorithms=[ALGORITHM])
+            user_oid = uuid.UUID(payload["user_oid"])
+        except (JWTError, KeyError, ValueError):
+            return None
+
+        # Версию проверяем только когда продление действительно нужно
+        if not needs_refresh(payload):
+            return None
+
+        return refresh_access_token(payload, current_version=await get_token_version(user_oid))
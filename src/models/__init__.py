@@ -7,7 +7,9 @@ all = (
     "Overtime",
     "OvertimeDayOffLink"
     "DayOff",
-    "Organization"
+    "Organization",
+    "OvertimeBalance",
+    "OvertimeMonthlyRollup",
 )
 
 from src.models.base import Base
@@ -16,4 +18,6 @@ from src.models.overtime import Overtime
 from src.models.overtime_dayoff_link import OvertimeDayOffLink
 from src.models.user import User, Role, WorkSchedule
 from src.models.department import Department
-from src.models.organization import Organization
\ No newline at end of file
+from src.models.organization import Organization
+from src.models.overtime_balance import OvertimeBalance
+from src.models.overtime_rollup import OvertimeMonthlyRollup
\ No newline at end of file
@@ -1,6 +1,6 @@
 from uuid import uuid4
 from typing import TYPE_CHECKING, List
-from sqlalchemy import DateTime, Date, ForeignKey, String, Boolean, func
+from sqlalchemy import DateTime, Date, ForeignKey, Index, String, Boolean, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import date, datetime
@@ -14,6 +14,11 @@ if TYPE_CHECKING:
 
 class DayOff(Base):
     __tablename__ = "day_offs"
+    __table_args__ = (
+        Index("ix_day_offs_user_oid_o_date", "user_oid", "o_date"),
+        # Отгулы, ожидающие подтверждения
+        Index("ix_day_offs_user_oid_unapproved", "user_oid", postgresql_where=text("is_approved = false")),
+    )
 
     oid: Mapped[UUID] = mapped_column(UUID, primary_key=True, default=uuid4)
     user_oid: Mapped[UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.oid", ondelete="CASCADE"), nullable=False)
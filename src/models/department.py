@@ -1,6 +1,6 @@
 from uuid import uuid4
 from typing import List, TYPE_CHECKING
-from sqlalchemy import DateTime, ForeignKey, String, func
+from sqlalchemy import DateTime, ForeignKey, Integer, String, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime
@@ -18,6 +18,7 @@ class Department(Base):
     organization_oid: Mapped[UUID] = mapped_column(UUID, ForeignKey("organizations.oid", ondelete="SET NULL"), nullable=True)
     name: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
     description: Mapped[str] = mapped_column(String(255), nullable=False)
+    day_off_hours: Mapped[int] = mapped_column(Integer, nullable=True)
     create_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
     update_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
 
@@ -23,6 +23,12 @@ class Organization(Base):
     name_boss: Mapped[str] = mapped_column(String(255), nullable=False)
     position: Mapped[str] = mapped_column(String(255), nullable=False)
     rank: Mapped[str] = mapped_column(String(255), nullable=False)
+    allocation_strategy: Mapped[str] = mapped_column(String(32), nullable=True)
+    # Просклонённые формы для отчётов, считаются при сохранении
+    name_gent: Mapped[str] = mapped_column(String(255), nullable=True)
+    name_boss_datv: Mapped[str] = mapped_column(String(255), nullable=True)
+    position_datv: Mapped[str] = mapped_column(String(255), nullable=True)
+    rank_datv: Mapped[str] = mapped_column(String(255), nullable=True)
     create_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
     update_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
 
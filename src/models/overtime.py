@@ -1,6 +1,6 @@
 from uuid import uuid4
 from typing import TYPE_CHECKING, List
-from sqlalchemy import Boolean, Date, DateTime, ForeignKey, String, Integer, func
+from sqlalchemy import Boolean, Date, DateTime, ForeignKey, Index, String, Integer, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime, date
@@ -13,6 +13,11 @@ if TYPE_CHECKING:
 
 class Overtime(Base):
     __tablename__ = "overtimes"
+    __table_args__ = (
+        Index("ix_overtimes_user_oid_o_date", "user_oid", "o_date"),
+        # Доступные для списания овертаймы пользователя
+        Index("ix_overtimes_user_oid_o_date_unused", "user_oid", "o_date", postgresql_where=text("is_used = false")),
+    )
 
     oid: Mapped[UUID] = mapped_column(UUID, primary_key=True, default=uuid4)
     user_oid: Mapped[UUID] = mapped_column(UUID, ForeignKey("users.oid", ondelete="CASCADE"), nullable=False)
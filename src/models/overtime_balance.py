@@ -0,0 +1,22 @@
+from datetime import datetime
+from sqlalchemy import DateTime, ForeignKey, Integer, func
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import UUID
+
+from src.models.base import Base
+
+
+class OvertimeBalance(Base):
+    """Баланс часов переработок пользователя, поддерживаемый при каждой записи."""
+
+    __tablename__ = "overtime_balances"
+
+    user_oid: Mapped[UUID] = mapped_column(UUID, ForeignKey("users.oid", ondelete="CASCADE"), primary_key=True)
+    total_hours: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    used_hours: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    remaining_hours: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    update_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
+
+
+    def __repr__(self):
+        return f"OvertimeBalance(user_oid={self.user_oid}, total_hours={self.total_hours}, used_hours={self.used_hours}, remaining_hours={self.remaining_hours})"
@@ -0,0 +1,23 @@
+from datetime import datetime
+from sqlalchemy import DateTime, ForeignKey, Integer, SmallInteger, func
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import UUID
+
+from src.models.base import Base
+
+
+class OvertimeMonthlyRollup(Base):
+    """Часы и число овертаймов пользователя за месяц, поддерживаемые при каждой записи."""
+
+    __tablename__ = "overtime_monthly_rollups"
+
+    user_oid: Mapped[UUID] = mapped_column(UUID, ForeignKey("users.oid", ondelete="CASCADE"), primary_key=True)
+    year: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    month: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    hours: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    overtimes_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    update_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
+
+
+    def __repr__(self):
+        return f"OvertimeMonthlyRollup(user_oid={self.user_oid}, year={self.year}, month={self.month}, hours={self.hours}, overtimes_count={self.overtimes_count})"
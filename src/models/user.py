@@ -2,7 +2,7 @@ from uuid import uuid4
 from typing import List, TYPE_CHECKING
 from enum import Enum
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, String, func
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, String, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy import Enum as SQLAlchemyEnum
@@ -29,6 +29,12 @@ class WorkSchedule(Enum):
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_department_oid", "department_oid"),
+        Index("ix_users_organization_oid", "organization_oid"),
+        # Заявки на регистрацию, ожидающие активации
+        Index("ix_users_department_oid_inactive", "department_oid", postgresql_where=text("is_active = false")),
+    )
     
     oid: Mapped[UUID] = mapped_column(UUID, primary_key=True, default=uuid4)
     organization_oid: Mapped[UUID] = mapped_column(UUID, ForeignKey("organizations.oid", ondelete="SET NULL"), nullable=True)
@@ -41,6 +47,7 @@ class User(Base):
     position: Mapped[str] = mapped_column(String(255), nullable=False)
     rank: Mapped[str] = mapped_column(String(255), nullable=False)
     is_active: Mapped[bool] = mapped_column(Boolean, default=False)
+    token_version: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
     create_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
     update_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
 
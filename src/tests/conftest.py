@@ -1,8 +1,13 @@
 import asyncio
-from typing import AsyncGenerator, Iterator
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+import uuid
+from contextlib import contextmanager
+from datetime import date
+from typing import AsyncGenerator, Awaitable, Callable, ContextManager, Dict, Iterator, List, Optional
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import NullPool
+import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
 from asgi_lifespan import LifespanManager
@@ -10,10 +15,12 @@ from asgi_lifespan import LifespanManager
 from main import create_app
 from src.core.database.infrastructure import db_helper
 from src.core.config import settings
-from src.models import Base, Role, WorkSchedule, Department
+from src.models import Base, Role, WorkSchedule, Department, Overtime, User
 from src.api.v1.user.service import UserService
 from src.api.v1.user.schemas import UserCreate
 from src.api.v1.auth.jwt import create_access_token
+from src.api.v1.auth.dependencies import get_current_claims
+from src.api.v1.auth.schemas import UserClaims
 
 
 @pytest_asyncio.fixture(scope="function")
@@ -80,6 +87,102 @@ async def async_client(async_db_session) -> AsyncGenerator[AsyncClient, None]:
             yield client
 
 
+@pytest.fixture(scope="function")
+def count_statements() -> Callable[[AsyncEngine], ContextManager[List[str]]]:
+    """
+    SQL, отправленный движком внутри блока `with`. Слушатель снимается
+    на выходе из блока.
+    """
+    @contextmanager
+    def count(engine: AsyncEngine) -> Iterator[List[str]]:
+        statements: List[str] = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+    return count
+
+
+@pytest.fixture(scope="function")
+def user_factory() -> Callable[..., Awaitable[User]]:
+    """
+    Активный пользователь, записанный напрямую моделью, без хеширования
+    пароля. Сессия передаётся явно: тесты конкурентности открывают свои.
+    """
+    async def create(
+        session: AsyncSession,
+        username: str = "user",
+        role: Role = Role.USER,
+        **fields,
+    ) -> User:
+        user = User(
+            username=username,
+            full_name=username.replace("_", " ").title(),
+            position="user",
+            rank="user",
+            role=role,
+            work_schedule=WorkSchedule.DAILY,
+            hashed_password="-",
+            is_active=True,
+            **fields,
+        )
+        session.add(user)
+        await session.commit()
+        await session.refresh(user)
+        return user
+
+    return create
+
+
+@pytest.fixture(scope="function")
+def overtime_factory() -> Callable[..., Overtime]:
+    """
+    Овертайм без записи в сессию. `remaining_hours` задаётся после
+    конструктора, который выставляет остаток равным часам.
+    """
+    def make(
+        user: User,
+        o_date: date,
+        hours: int,
+        remaining_hours: Optional[int] = None,
+        description: str = "overtime",
+    ) -> Overtime:
+        overtime = Overtime(user_oid=user.oid, o_date=o_date, hours=hours, description=description)
+        if remaining_hours is not None:
+            overtime.remaining_hours = remaining_hours
+            overtime.is_used = remaining_hours == 0
+        return overtime
+
+    return make
+
+
+@pytest.fixture(scope="function")
+def client_as() -> Callable[..., AsyncClient]:
+    """
+    Клиент без базы, в котором текущий пользователь подменён утверждениями
+    с заданной ролью. Годится для проверок доступа, отказывающих до запросов.
+    `overrides` подменяет остальные зависимости маршрута.
+    """
+    def make(
+        role: Role,
+        department_oid: Optional[uuid.UUID] = None,
+        overrides: Optional[Dict[Callable, Callable]] = None,
+    ) -> AsyncClient:
+        claims = UserClaims(oid=uuid.uuid4(), role=role, department_oid=department_oid)
+        app = create_app()
+        app.dependency_overrides[get_current_claims] = lambda: claims
+        app.dependency_overrides.update(overrides or {})
+        return AsyncClient(transport=ASGITransport(app=app), base_url="http://localhost")
+
+    return make
+
+
 @pytest_asyncio.fixture(scope="function")
 async def test_superuser(async_client: AsyncClient, async_db_session: AsyncSession):
     superuser = await UserService(async_db_session).create_superuser(
@@ -0,0 +1,60 @@
+from src.core.cache import TTLCache
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_cache_expires_entries():
+    timer = FakeTimer()
+    cache = TTLCache(maxsize=10, ttl=5, timer=timer)
+
+    cache.set("key", "value")
+    assert cache.get("key") == "value"
+
+    timer.now = 5
+    assert cache.get("key") is None
+    assert len(cache) == 0
+
+
+def test_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+
+
+def test_cache_invalidate():
+    cache = TTLCache(maxsize=10, ttl=60)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.invalidate("a")
+    assert cache.get("a") is None
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_cache_update_keeps_expiration():
+    timer = FakeTimer()
+    cache = TTLCache(maxsize=10, ttl=5, timer=timer)
+
+    cache.set("counter", 1)
+    timer.now = 3
+    assert cache.update("counter", lambda value: value + 1)
+    assert cache.get("counter") == 2
+
+    timer.now = 5
+    assert not cache.update("counter", lambda value: value + 1)
+    assert not cache.update("missing", lambda value: value + 1)
@@ -0,0 +1,60 @@
+from typing import List
+
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from src.models import User
+from src.api.v1.auth.cache import user_cache
+from src.api.v1.auth.jwt import create_access_token
+
+
+@pytest_asyncio.fixture(scope="function")
+async def logged_in_user(
+    async_client: AsyncClient,
+    async_db_session: AsyncSession,
+    user_factory,
+) -> User:
+    user = await user_factory(async_db_session, username="identity_user")
+    async_client.cookies.set("access_token", create_access_token(data={"user_oid": str(user.oid)}))
+    return user
+
+
+def user_loads(statements: List[str]) -> List[str]:
+    return [statement for statement in statements if statement.lstrip().startswith("SELECT users.")]
+
+
+async def test_get_all_day_offs_resolves_user_once(
+    async_client: AsyncClient,
+    async_db_engine: AsyncEngine,
+    logged_in_user: User,
+    count_statements,
+):
+    user_cache.clear()
+
+    with count_statements(async_db_engine) as statements:
+        response = await async_client.get("/day_off/")
+
+    assert response.status_code == 200
+    # RoleRequired, get_current_user и count_notifications_day_offs делят одну загрузку
+    assert len(user_loads(statements)) == 1
+
+
+async def test_get_all_day_offs_uses_cached_user(
+    async_client: AsyncClient,
+    async_db_engine: AsyncEngine,
+    logged_in_user: User,
+    count_statements,
+):
+    user_cache.clear()
+
+    with count_statements(async_db_engine) as cold_statements:
+        response = await async_client.get("/day_off/")
+    assert response.status_code == 200
+
+    with count_statements(async_db_engine) as warm_statements:
+        response = await async_client.get("/day_off/")
+    assert response.status_code == 200
+
+    assert user_loads(warm_statements) == []
+    assert len(warm_statements) < len(cold_statements)
@@ -0,0 +1,134 @@
+from contextlib import asynccontextmanager
+
+import pytest
+from fastapi import FastAPI, Request
+from httpx import ASGITransport, AsyncClient
+
+from src.middlewares.notification import middleware as notification_middleware
+from src.middlewares.notification.counter import (
+    PendingRegistrationCounter,
+    pending_registrations,
+)
+from src.middlewares.notification.middleware import NotificationMiddleware
+
+
+class FakeNotificationService:
+    count = 0
+
+    def __init__(self, session):
+        pass
+
+    async def get_inactive_users_count(self) -> int:
+        return self.count
+
+
+class FakeDbHelper:
+    def __init__(self):
+        self.sessions_opened = 0
+
+    @asynccontextmanager
+    async def sessionmaker(self):
+        self.sessions_opened += 1
+        yield None
+
+
+@pytest.fixture
+def db_helper(monkeypatch):
+    helper = FakeDbHelper()
+    monkeypatch.setattr(notification_middleware, "db_helper", helper)
+    monkeypatch.setattr(
+        "src.middlewares.notification.counter.NotificationService",
+        FakeNotificationService,
+    )
+    FakeNotificationService.count = 3
+    pending_registrations.reset()
+    yield helper
+    pending_registrations.reset()
+
+
+@pytest.fixture
+async def client():
+    app = FastAPI()
+    app.add_middleware(NotificationMiddleware)
+
+    @app.get("/{path:path}")
+    async def page(request: Request):
+        return {"count": getattr(request.state, "notifications_count_user", None)}
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://localhost"
+    ) as client:
+        yield client
+
+
+HTML = {"Accept": "text/html"}
+
+
+async def test_static_and_anonymous_requests_skip_database(client: AsyncClient, db_helper: FakeDbHelper):
+    await client.get("/home/", headers=HTML)
+    client.cookies.set("access_token", "token")
+    await client.get("/static/css/base.css", headers=HTML)
+    await client.get("/auth/", headers=HTML)
+    await client.get("/user/statistics/2025")
+
+    assert db_helper.sessions_opened == 0
+
+
+async def test_count_is_reconciled_once_and_kept_in_memory(client: AsyncClient, db_helper: FakeDbHelper):
+    client.cookies.set("access_token", "token")
+
+    response = await client.get("/home/", headers=HTML)
+    assert response.json() == {"count": 3}
+
+    pending_registrations.add(1)
+    response = await client.get("/user/me", headers=HTML)
+    assert response.json() == {"count": 4}
+
+    assert db_helper.sessions_opened == 1
+
+
+async def test_counter_reconciles_after_interval(monkeypatch):
+    monkeypatch.setattr(
+        "src.middlewares.notification.counter.NotificationService",
+        FakeNotificationService,
+    )
+    FakeNotificationService.count = 2
+    now = [0.0]
+    counter = PendingRegistrationCounter(reconcile_interval=10, timer=lambda: now[0])
+
+    counter.add(1)
+    assert counter.needs_reconcile
+
+    assert await counter.reconcile(session=None) == 2
+    counter.add(-5)
+    assert counter.value == 0
+    assert not counter.needs_reconcile
+
+    now[0] = 10
+    assert counter.needs_reconcile
+
+
+def test_unapproved_day_off_counters_follow_scopes():
+    from types import SimpleNamespace
+    from uuid import uuid4
+
+    from src.models import Role
+    from src.api.v1.day_off.counters import UnapprovedDayOffCounters
+
+    department_oid = uuid4()
+    user = SimpleNamespace(oid=uuid4(), role=Role.USER, department_oid=department_oid)
+    moderator = SimpleNamespace(oid=uuid4(), role=Role.MODERATOR, department_oid=department_oid)
+    superuser = SimpleNamespace(oid=uuid4(), role=Role.SUPERUSER, department_oid=None)
+
+    counters = UnapprovedDayOffCounters(ttl=60)
+    counters.set(moderator, 2)
+    counters.set(superuser, 5)
+
+    counters.add(user.oid, department_oid, 1)
+    assert counters.get(user) is None
+    assert counters.get(moderator) == 3
+    assert counters.get(superuser) == 6
+
+    counters.add(uuid4(), uuid4(), -1)
+    assert counters.get(moderator) == 3
+    assert counters.get(superuser) == 5
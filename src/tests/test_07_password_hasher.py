@@ -0,0 +1,65 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.api.v1.auth import security
+from src.api.v1.auth.errors import PasswordHasherBusy
+from src.api.v1.auth.security import PasswordHasher
+from src.models import Role
+
+
+async def test_hash_and_verify_run_in_pool():
+    hasher = PasswordHasher(max_workers=2, max_queue=2)
+
+    hashed_password = await hasher.hash("password123")
+
+    assert await hasher.verify("password123", hashed_password)
+    assert not await hasher.verify("wrong-password", hashed_password)
+
+    metrics = hasher.metrics()
+    assert metrics.completed == 3
+    assert metrics.queue_depth == 0
+    assert metrics.avg_latency_ms > 0
+
+
+async def test_rejects_when_queue_is_full(monkeypatch):
+    release = threading.Event()
+
+    def slow_verify(plain_password: str, hashed_password: str) -> bool:
+        release.wait(timeout=5)
+        return True
+
+    monkeypatch.setattr(security, "verify_password", slow_verify)
+    hasher = PasswordHasher(max_workers=1, max_queue=1)
+
+    running = asyncio.ensure_future(hasher.verify("a", "b"))
+    queued = asyncio.ensure_future(hasher.verify("a", "b"))
+    await asyncio.sleep(0.05)
+
+    metrics = hasher.metrics()
+    assert metrics.in_flight == 1
+    assert metrics.queue_depth == 1
+
+    with pytest.raises(PasswordHasherBusy):
+        await hasher.verify("a", "b")
+
+    release.set()
+    assert await running and await queued
+    assert hasher.metrics().rejected == 1
+
+
+@pytest.mark.parametrize("role", [Role.USER, Role.MODERATOR])
+async def test_metrics_are_superuser_only(client_as, role: Role):
+    async with client_as(role) as client:
+        response = await client.get("/auth/metrics/password-hashing")
+
+    assert response.status_code == 403
+
+
+async def test_metrics_for_superuser(client_as):
+    async with client_as(Role.SUPERUSER) as client:
+        response = await client.get("/auth/metrics/password-hashing")
+
+    assert response.status_code == 200
+    assert "queue_depth" in response.json()
@@ -0,0 +1,52 @@
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from src.core.config import settings
+from src.models import Role, WorkSchedule
+from src.api.v1.auth.dependencies import decode_token
+from src.api.v1.auth.jwt import create_token
+from src.api.v1.auth.schemas import UserClaims
+
+
+def make_user(**kwargs):
+    data = dict(
+        oid=uuid.uuid4(),
+        role=Role.MODERATOR,
+        department_oid=uuid.uuid4(),
+        organization_oid=None,
+        work_schedule=WorkSchedule.SHIFT,
+        token_version=3,
+    )
+    data.update(kwargs)
+    return SimpleNamespace(**data)
+
+
+def test_token_without_claims_carries_version(monkeypatch):
+    monkeypatch.setattr(settings.api, "token_claims", False)
+    user = make_user()
+
+    token_data = decode_token(create_token(user=user).access_token)
+
+    assert token_data.user_oid == user.oid
+    assert token_data.ver == 3
+    assert not token_data.has_claims
+
+
+def test_token_with_claims(monkeypatch):
+    monkeypatch.setattr(settings.api, "token_claims", True)
+    user = make_user()
+
+    token_data = decode_token(create_token(user=user).access_token)
+    claims = UserClaims.from_token(token_data)
+
+    assert token_data.has_claims
+    assert claims == UserClaims.from_user(user)
+
+
+def test_invalid_token_is_rejected():
+    with pytest.raises(HTTPException) as exc_info:
+        decode_token("not-a-token")
+    assert exc_info.value.status_code == 401
@@ -0,0 +1,138 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import RedirectResponse
+from httpx import ASGITransport, AsyncClient
+from jose import jwt
+
+from src.core.config import settings
+from src.api.v1.auth.jwt import ALGORITHM, create_access_token, refresh_access_token
+from src.middlewares.token_refresh import middleware as token_refresh_middleware
+from src.middlewares.token_refresh.middleware import TokenRefreshMiddleware
+
+
+USER_OID = str(uuid.uuid4())
+
+
+@pytest.fixture(autouse=True)
+def token_settings(monkeypatch):
+    monkeypatch.setattr(settings.api, "access_token_expire_minutes", 30)
+    monkeypatch.setattr(settings.api, "token_refresh_threshold_minutes", 10)
+    monkeypatch.setattr(settings.api, "session_max_age_minutes", 120)
+
+
+def issue_token(issued_minutes_ago: int, auth_minutes_ago: int = None, ver: int = 0) -> str:
+    now = datetime.now(tz=timezone.utc)
+    data = {"user_oid": USER_OID, "ver": ver}
+    if auth_minutes_ago is not None:
+        data["auth_time"] = int((now - timedelta(minutes=auth_minutes_ago)).timestamp())
+    return create_access_token(
+        data=data,
+        expires_delta=timedelta(minutes=30),
+        now=now - timedelta(minutes=issued_minutes_ago),
+    )
+
+
+def decode(token: str) -> dict:
+    return jwt.decode(token, settings.api.secret_key, algorithms=[ALGORITHM])
+
+
+def test_fresh_token_is_not_refreshed():
+    assert refresh_access_token(decode(issue_token(issued_minutes_ago=5)), current_version=0) is None
+
+
+def test_refresh_rotates_token():
+    old_token = issue_token(issued_minutes_ago=25)
+    old_payload = decode(old_token)
+
+    new_token = refresh_access_token(old_payload, current_version=0)
+    new_payload = decode(new_token)
+
+    assert new_token != old_token
+    assert new_payload["exp"] > old_payload["exp"]
+    assert new_payload["user_oid"] == USER_OID
+    assert new_payload["auth_time"] == old_payload["auth_time"]
+
+
+def test_refresh_stops_at_session_max_age():
+    token = issue_token(issued_minutes_ago=25, auth_minutes_ago=125)
+    assert refresh_access_token(decode(token), current_version=0) is None
+
+
+def test_revoked_token_is_not_refreshed():
+    payload = decode(issue_token(issued_minutes_ago=25, ver=1))
+
+    assert refresh_access_token(payload, current_version=2) is None
+    assert refresh_access_token(payload, current_version=None) is None
+
+
+@pytest.fixture
+def token_version(monkeypatch):
+    version = {"value": 0}
+
+    async def get_token_version(user_oid):
+        return version["value"]
+
+    monkeypatch.setattr(token_refresh_middleware, "get_token_version", get_token_version)
+    return version
+
+
+@pytest.fixture
+async def client():
+    app = FastAPI()
+    app.add_middleware(TokenRefreshMiddleware)
+
+    @app.get("/page")
+    async def page():
+        return {}
+
+    @app.get("/logout")
+    async def logout():
+        response = RedirectResponse(url="/auth/")
+        response.delete_cookie(key="access_token", httponly=True)
+        return response
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://localhost"
+    ) as client:
+        yield client
+
+
+def refreshed_cookie(response) -> str | None:
+    for value in response.headers.get_list("set-cookie"):
+        if value.startswith("access_token="):
+            return value
+    return None
+
+
+async def test_middleware_sets_cookie_near_expiry(client: AsyncClient, token_version):
+    client.cookies.set("access_token", issue_token(issued_minutes_ago=25))
+    response = await client.get("/page")
+
+    cookie = refreshed_cookie(response)
+    assert cookie is not None
+    assert "HttpOnly" in cookie
+    assert "Max-Age=1800" in cookie
+
+
+async def test_middleware_skips_fresh_expired_and_revoked(client: AsyncClient, token_version):
+    client.cookies.set("access_token", issue_token(issued_minutes_ago=5))
+    assert refreshed_cookie(await client.get("/page")) is None
+
+    client.cookies.set("access_token", issue_token(issued_minutes_ago=40))
+    assert refreshed_cookie(await client.get("/page")) is None
+
+    token_version["value"] = 1
+    client.cookies.set("access_token", issue_token(issued_minutes_ago=25))
+    assert refreshed_cookie(await client.get("/page")) is None
+
+
+async def test_middleware_keeps_cookie_set_by_response(client: AsyncClient, token_version):
+    client.cookies.set("access_token", issue_token(issued_minutes_ago=25))
+    response = await client.get("/logout")
+
+    cookies = [value for value in response.headers.get_list("set-cookie") if value.startswith("access_token=")]
+    assert len(cookies) == 1
+    assert 'access_token=""' in cookies[0]
@@ -0,0 +1,213 @@
+import asyncio
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from src.models import DayOff, Overtime, OvertimeBalance, OvertimeDayOffLink, User
+from src.api.v1.day_off.errors import InsufficientOvertimeHours, InvalidDayOffRange
+from src.api.v1.day_off.schemas import DayOffBulkDelete, DayOffCreate, DayOffRangeCreate
+from src.api.v1.day_off.service import DayOffService
+from src.api.v1.overtime.balance import OvertimeBalanceRepository
+
+
+CONCURRENT_REQUESTS = 6
+
+
+@pytest.fixture
+def create_user_with_overtimes(user_factory, overtime_factory):
+    async def create(session: AsyncSession, hours: list[int]) -> User:
+        user = await user_factory(session, username="allocation_user")
+        session.add_all(
+            overtime_factory(user, date(2024, 1, 1) + timedelta(days=index), overtime_hours)
+            for index, overtime_hours in enumerate(hours)
+        )
+        await session.commit()
+        return user
+
+    return create
+
+
+async def test_concurrent_day_offs_do_not_double_spend_hours(async_db_engine: AsyncEngine, create_user_with_overtimes):
+    sessionmaker = async_sessionmaker(async_db_engine, expire_on_commit=False)
+
+    async with sessionmaker() as session:
+        # Часов хватает ровно на два отгула по 8 часов
+        user = await create_user_with_overtimes(session, hours=[5, 5, 6])
+
+    async def book(index: int) -> bool:
+        async with sessionmaker() as session:
+            try:
+                await DayOffService(session).create(
+                    current_user=user,
+                    day_off_create=DayOffCreate(
+                        o_date=date(2024, 2, 1) + timedelta(days=index),
+                        reason="concurrent",
+                    ),
+                )
+                return True
+            except InsufficientOvertimeHours:
+                return False
+
+    results = await asyncio.gather(*(book(index) for index in range(CONCURRENT_REQUESTS)))
+
+    assert results.count(True) == 2
+
+    async with sessionmaker() as session:
+        remaining_hours = await session.scalar(
+            select(func.sum(Overtime.remaining_hours)).where(Overtime.user_oid == user.oid)
+        )
+        used_hours = await session.scalar(select(func.sum(OvertimeDayOffLink.hours_used)))
+        day_offs = await session.scalar(select(func.count(DayOff.oid)))
+        negative = await session.scalar(
+            select(func.count(Overtime.oid)).where(Overtime.remaining_hours < 0)
+        )
+
+    assert day_offs == 2
+    assert used_hours == 16
+    assert remaining_hours == 0
+    assert negative == 0
+
+
+async def test_concurrent_deletes_give_hours_back_once(async_db_engine: AsyncEngine, create_user_with_overtimes):
+    sessionmaker = async_sessionmaker(async_db_engine, expire_on_commit=False)
+
+    async with sessionmaker() as session:
+        user = await create_user_with_overtimes(session, hours=[5, 5, 6])
+        await OvertimeBalanceRepository(session).rebuild(user_oid=user.oid)
+        day_off = await DayOffService(session).create(
+            current_user=user,
+            day_off_create=DayOffCreate(o_date=date(2024, 2, 1), reason="double submit"),
+        )
+
+    async def remove() -> int:
+        async with sessionmaker() as session:
+            result = await DayOffService(session).delete_many(
+                current_user=user,
+                day_offs_delete=DayOffBulkDelete(oids=[day_off.oid]),
+            )
+            return result.deleted
+
+    results = await asyncio.gather(*(remove() for _ in range(CONCURRENT_REQUESTS)))
+
+    # Удаляет одна транзакция, остальные не находят связей и отгула
+    assert sorted(results) == [0] * (CONCURRENT_REQUESTS - 1) + [1]
+
+    async with sessionmaker() as session:
+        remaining_hours = await session.scalar(
+            select(func.sum(Overtime.remaining_hours)).where(Overtime.user_oid == user.oid)
+        )
+        balance = await session.get(OvertimeBalance, user.oid)
+        links = await session.scalar(select(func.count(OvertimeDayOffLink.oid)))
+
+    assert remaining_hours == 16
+    assert (balance.total_hours, balance.used_hours, balance.remaining_hours) == (16, 0, 16)
+    assert links == 0
+
+
+async def test_allocation_takes_oldest_overtimes_first(async_db_engine: AsyncEngine, create_user_with_overtimes):
+    sessionmaker = async_sessionmaker(async_db_engine, expire_on_commit=False)
+
+    async with sessionmaker() as session:
+        user = await create_user_with_overtimes(session, hours=[3, 4, 6])
+
+    async with sessionmaker() as session:
+        await DayOffService(session).create(
+            current_user=user,
+            day_off_create=DayOffCreate(o_date=date(2024, 2, 1), reason="fifo"),
+        )
+
+    async with sessionmaker() as session:
+        overtimes = (
+            await session.scalars(
+                select(Overtime).where(Overtime.user_oid == user.oid).order_by(Overtime.o_date)
+            )
+        ).all()
+        links = (
+            await session.execute(
+                select(Overtime.o_date, OvertimeDayOffLink.hours_used)
+                .join(Overtime, Overtime.oid == OvertimeDayOffLink.overtime_oid)
+                .order_by(Overtime.o_date)
+            )
+        ).all()
+
+    assert [overtime.remaining_hours for overtime in overtimes] == [0, 0, 5]
+    assert [overtime.is_used for overtime in overtimes] == [True, True, False]
+    assert [hours_used for _, hours_used in links] == [3, 4, 1]
+
+
+async def test_insufficient_hours_leave_overtimes_untouched(async_db_engine: AsyncEngine, create_user_with_overtimes):
+    sessionmaker = async_sessionmaker(async_db_engine, expire_on_commit=False)
+
+    async with sessionmaker() as session:
+        user = await create_user_with_overtimes(session, hours=[3, 4])
+
+    async with sessionmaker() as session:
+        with pytest.raises(InsufficientOvertimeHours):
+            await DayOffService(session).create(
+                current_user=user,
+                day_off_create=DayOffCreate(o_date=date(2024, 2, 1), reason="short"),
+            )
+
+    async with sessionmaker() as session:
+        remaining_hours = await session.scalar(
+            select(func.sum(Overtime.remaining_hours)).where(Overtime.user_oid == user.oid)
+        )
+        links = await session.scalar(select(func.count(OvertimeDayOffLink.oid)))
+
+    assert remaining_hours == 7
+    assert links == 0
+
+
+async def test_range_booking_is_all_or_nothing(async_db_engine: AsyncEngine, create_user_with_overtimes):
+    sessionmaker = async_sessionmaker(async_db_engine, expire_on_commit=False)
+
+    async with sessionmaker() as session:
+        user = await create_user_with_overtimes(session, hours=[5, 5, 6, 4])
+
+    async with sessionmaker() as session:
+        with pytest.raises(InsufficientOvertimeHours):
+            await DayOffService(session).create_range(
+                current_user=user,
+                day_off_range=DayOffRangeCreate(
+                    date_from=date(2024, 3, 4), date_to=date(2024, 3, 6), reason="week",
+                ),
+            )
+
+    async with sessionmaker() as session:
+        assert await session.scalar(select(func.count(DayOff.oid))) == 0
+
+        day_offs = await DayOffService(session).create_range(
+            current_user=user,
+            day_off_range=DayOffRangeCreate(
+                date_from=date(2024, 3, 4), date_to=date(2024, 3, 5), reason="two days",
+            ),
+        )
+
+    async with sessionmaker() as session:
+        hours_per_day_off = (
+            await session.execute(
+                select(OvertimeDayOffLink.day_off_oid, func.sum(OvertimeDayOffLink.hours_used))
+                .group_by(OvertimeDayOffLink.day_off_oid)
+            )
+        ).all()
+        remaining_hours = await session.scalar(
+            select(func.sum(Overtime.remaining_hours)).where(Overtime.user_oid == user.oid)
+        )
+
+    assert [day_off.o_date for day_off in day_offs] == [date(2024, 3, 4), date(2024, 3, 5)]
+    assert sorted(hours for _, hours in hours_per_day_off) == [8, 8]
+    assert remaining_hours == 4
+
+
+@pytest.mark.parametrize("date_to", [date(2024, 2, 29), date(9999, 12, 31)])
+async def test_invalid_range_is_rejected_before_building_dates(monkeypatch, date_to: date):
+    def dates(self):
+        raise AssertionError("dates() built for a rejected range")
+
+    monkeypatch.setattr(DayOffRangeCreate, "dates", dates)
+    day_off_range = DayOffRangeCreate(date_from=date(2024, 3, 1), date_to=date_to, reason="range")
+
+    with pytest.raises(InvalidDayOffRange):
+        await DayOffService(session=None).create_range(current_user=None, day_off_range=day_off_range)
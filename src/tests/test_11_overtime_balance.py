@@ -0,0 +1,108 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models import Overtime, OvertimeDayOffLink, Role, User
+from src.api.v1.day_off.errors import InsufficientOvertimeHours
+from src.api.v1.day_off.schemas import DayOffBulkDelete, DayOffCreate
+from src.api.v1.day_off.service import DayOffService
+from src.api.v1.overtime.balance import OvertimeBalanceRepository
+from src.api.v1.overtime.schemas import OvertimeCreate, OvertimeUpdatePartial
+from src.api.v1.overtime.service import OvertimeService
+
+
+async def balance_of(session: AsyncSession, user: User) -> tuple[int, int, int]:
+    balance = await OvertimeBalanceRepository(session).get(user.oid)
+    await session.refresh(balance)
+    return balance.total_hours, balance.used_hours, balance.remaining_hours
+
+
+async def test_balance_follows_overtime_and_day_off_writes(async_db_session: AsyncSession, user_factory):
+    user = await user_factory(async_db_session, username="balance_user")
+    overtimes = OvertimeService(async_db_session)
+
+    first = await overtimes.create(
+        current_user=user,
+        overtime_create=OvertimeCreate(o_date=date(2024, 1, 1), hours=6, description="first"),
+    )
+    await overtimes.create(
+        current_user=user,
+        overtime_create=OvertimeCreate(o_date=date(2024, 1, 2), hours=5, description="second"),
+    )
+    assert await balance_of(async_db_session, user) == (11, 0, 11)
+
+    await DayOffService(async_db_session).create(
+        current_user=user,
+        day_off_create=DayOffCreate(o_date=date(2024, 2, 1), reason="balance"),
+    )
+    assert await balance_of(async_db_session, user) == (11, 8, 3)
+
+    overtime = await overtimes.get_one(oid=first.oid)
+    await overtimes.modify(
+        overtime=overtime,
+        overtime_update=OvertimeUpdatePartial(description="renamed"),
+        partial=True,
+    )
+    assert await balance_of(async_db_session, user) == (11, 8, 3)
+
+    rebuilt = await OvertimeBalanceRepository(async_db_session).rebuild(user_oid=user.oid)
+    assert rebuilt == 1
+    assert await balance_of(async_db_session, user) == (11, 8, 3)
+
+
+async def test_balance_rejects_day_off_without_locking_overtimes(async_db_session: AsyncSession, user_factory):
+    user = await user_factory(async_db_session, username="balance_user")
+    await OvertimeService(async_db_session).create(
+        current_user=user,
+        overtime_create=OvertimeCreate(o_date=date(2024, 1, 1), hours=4, description="short"),
+    )
+
+    with pytest.raises(InsufficientOvertimeHours):
+        await DayOffService(async_db_session).create(
+            current_user=user,
+            day_off_create=DayOffCreate(o_date=date(2024, 2, 1), reason="short"),
+        )
+
+    assert await balance_of(async_db_session, user) == (4, 0, 4)
+
+
+async def test_deleting_day_offs_gives_hours_back(async_db_session: AsyncSession, user_factory):
+    user = await user_factory(async_db_session, username="balance_user", role=Role.SUPERUSER)
+    user_oid = user.oid
+    overtimes = OvertimeService(async_db_session)
+    for day, hours in enumerate([6, 6, 4], start=1):
+        await overtimes.create(
+            current_user=user,
+            overtime_create=OvertimeCreate(o_date=date(2024, 1, day), hours=hours, description="hours"),
+        )
+
+    day_offs = DayOffService(async_db_session)
+    first = await day_offs.create(
+        current_user=user,
+        day_off_create=DayOffCreate(o_date=date(2024, 2, 1), reason="first"),
+    )
+    second = await day_offs.create(
+        current_user=user,
+        day_off_create=DayOffCreate(o_date=date(2024, 2, 2), reason="second"),
+    )
+    assert await balance_of(async_db_session, user) == (16, 16, 0)
+
+    result = await day_offs.delete_many(
+        current_user=user,
+        day_offs_delete=DayOffBulkDelete(oids=[first.oid, second.oid]),
+    )
+    assert result.deleted == 2
+    assert await balance_of(async_db_session, user) == (16, 0, 16)
+
+    # После expire_all атрибуты user грузились бы лениво, вне greenlet
+    async_db_session.expire_all()
+    restored = (
+        await async_db_session.scalars(
+            select(Overtime).where(Overtime.user_oid == user_oid).order_by(Overtime.o_date)
+        )
+    ).all()
+    assert [overtime.remaining_hours for overtime in restored] == [6, 6, 4]
+    assert not any(overtime.is_used for overtime in restored)
+    assert await async_db_session.scalar(select(func.count(OvertimeDayOffLink.oid))) == 0
@@ -0,0 +1,127 @@
+import uuid
+from dataclasses import dataclass
+from datetime import date
+
+import pytest
+from environs import Env, EnvValidationError
+
+from src.core.config import AllocationConfig
+from src.models import WorkSchedule
+from src.api.v1.day_off.errors import InsufficientOvertimeHours
+from src.api.v1.day_off.overtime_allocator import (
+    AllocationStrategy,
+    OvertimeAllocator,
+    split_allocations,
+)
+from src.api.v1.day_off.work_schedule_calculator import WorkScheduleCalculator
+
+
+@dataclass
+class Slot:
+    o_date: date
+    remaining_hours: int
+    oid: uuid.UUID = None
+
+    def __post_init__(self):
+        self.oid = self.oid or uuid.uuid4()
+
+
+@dataclass
+class FakeUser:
+    work_schedule: WorkSchedule
+
+
+def hours_by_date(overtimes, allocations):
+    dates = {overtime.oid: overtime.o_date for overtime in overtimes}
+    return [(dates[a["overtime_oid"]], a["hours_used"]) for a in allocations]
+
+
+OVERTIMES = [
+    Slot(date(2024, 3, 1), 8),
+    Slot(date(2024, 1, 1), 5),
+    Slot(date(2024, 2, 1), 9),
+]
+
+
+def test_fifo_takes_oldest_first():
+    allocations = OvertimeAllocator.allocate_hours(OVERTIMES, 8, AllocationStrategy.FIFO)
+
+    assert hours_by_date(OVERTIMES, allocations) == [
+        (date(2024, 1, 1), 5),
+        (date(2024, 2, 1), 3),
+    ]
+
+
+def test_best_fit_prefers_exact_match():
+    allocations = OvertimeAllocator.allocate_hours(OVERTIMES, 8, AllocationStrategy.BEST_FIT)
+
+    assert hours_by_date(OVERTIMES, allocations) == [(date(2024, 3, 1), 8)]
+
+
+def test_best_fit_combines_largest_when_nothing_covers():
+    allocations = OvertimeAllocator.allocate_hours(OVERTIMES, 20, AllocationStrategy.BEST_FIT)
+
+    assert hours_by_date(OVERTIMES, allocations) == [
+        (date(2024, 2, 1), 9),
+        (date(2024, 3, 1), 8),
+        (date(2024, 1, 1), 3),
+    ]
+
+
+def test_expiring_first_skips_expired_hours():
+    allocations = OvertimeAllocator.allocate_hours(
+        OVERTIMES,
+        8,
+        AllocationStrategy.EXPIRING_FIRST,
+        on_date=date(2025, 1, 15),
+        lifetime_days=365,
+    )
+
+    assert hours_by_date(OVERTIMES, allocations) == [
+        (date(2024, 2, 1), 8),
+    ]
+
+    with pytest.raises(InsufficientOvertimeHours):
+        OvertimeAllocator.allocate_hours(
+            OVERTIMES,
+            20,
+            AllocationStrategy.EXPIRING_FIRST,
+            on_date=date(2025, 1, 15),
+            lifetime_days=365,
+        )
+
+
+def test_allocation_does_not_modify_overtimes():
+    OvertimeAllocator.allocate_hours(OVERTIMES, 22, AllocationStrategy.FIFO)
+
+    assert [overtime.remaining_hours for overtime in OVERTIMES] == [8, 5, 9]
+
+
+def test_required_hours_use_department_override():
+    assert WorkScheduleCalculator.get_required_hours(FakeUser(WorkSchedule.DAILY)) == 8
+    assert WorkScheduleCalculator.get_required_hours(FakeUser(WorkSchedule.SHIFT)) == 24
+    assert WorkScheduleCalculator.get_required_hours(
+        FakeUser(WorkSchedule.SHIFT), department_hours=12
+    ) == 12
+
+
+def test_split_allocations_per_day_off():
+    first, second = uuid.uuid4(), uuid.uuid4()
+    allocations = [
+        {"overtime_oid": first, "hours_used": 5},
+        {"overtime_oid": second, "hours_used": 11},
+    ]
+
+    assert split_allocations(allocations, 8) == [
+        [{"overtime_oid": first, "hours_used": 5}, {"overtime_oid": second, "hours_used": 3}],
+        [{"overtime_oid": second, "hours_used": 8}],
+    ]
+
+
+def test_default_strategy_is_parsed_at_startup(monkeypatch):
+    monkeypatch.setenv("ALLOCATION_STRATEGY", "best_fit")
+    assert AllocationConfig.from_env(Env()).default_strategy is AllocationStrategy.BEST_FIT
+
+    monkeypatch.setenv("ALLOCATION_STRATEGY", "newest_first")
+    with pytest.raises(EnvValidationError):
+        AllocationConfig.from_env(Env())
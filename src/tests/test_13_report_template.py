@@ -0,0 +1,39 @@
+import os
+import shutil
+from io import BytesIO
+
+from docx import Document
+
+from src.api.v1.day_off.generate_report import TEMPLATE_PATH, ReportGenerator, ReportTemplate
+
+
+def text_of(file_stream: BytesIO) -> str:
+    return "\n".join(paragraph.text for paragraph in Document(file_stream).paragraphs)
+
+
+def test_reports_do_not_leak_into_template():
+    first = ReportGenerator(data={"department_user": "Первый отдел"}).get_report_bytes()
+    second = ReportGenerator(data={"department_user": "Второй отдел"}).get_report_bytes()
+
+    assert "Первый отдел" in text_of(first)
+    assert "Первый отдел" not in text_of(second)
+    assert "Второй отдел" in text_of(second)
+
+
+def test_template_is_reloaded_when_file_changes(tmp_path):
+    path = tmp_path / "template.docx"
+    shutil.copy(TEMPLATE_PATH, path)
+    template = ReportTemplate(path)
+
+    package = template.get()
+    assert template.get() is package
+
+    document = Document(path)
+    document.add_paragraph("new_placeholder")
+    document.save(path)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    reloaded = template.get()
+    assert reloaded is not package
+    assert "new_placeholder" in text_of(reloaded.save(reloaded.clone()))
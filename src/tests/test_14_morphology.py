@@ -0,0 +1,43 @@
+import pytest
+
+from src.models import Organization
+from src.core.morphology import get_morph, inflect
+from src.api.v1.organization.repository import decline_organization
+
+
+def test_inflect_first_word_only():
+    assert inflect("управление связи", case="gent") == "Управления связи"
+    assert inflect("начальник", case="datv") == "начальнику"
+
+
+def test_unknown_case_is_rejected():
+    with pytest.raises(ValueError):
+        inflect("начальник", case="voct2")
+
+
+def test_analyzer_and_inflections_are_reused():
+    assert get_morph() is get_morph()
+
+    inflect.cache_clear()
+    inflect("полковник", case="datv")
+    inflect("полковник", case="datv")
+
+    info = inflect.cache_info()
+    assert info.hits == 1
+    assert info.misses == 1
+
+
+def test_organization_declensions_are_precomputed():
+    organization = Organization(
+        name="управление связи",
+        name_boss="Петров Пётр Петрович",
+        position="начальник",
+        rank="полковник",
+    )
+
+    decline_organization(organization)
+
+    assert organization.name_gent == "Управления связи"
+    assert organization.name_boss_datv == "Петрову П.П."
+    assert organization.position_datv == "начальнику"
+    assert organization.rank_datv == "полковнику"
@@ -0,0 +1,44 @@
+import asyncio
+import time
+from io import BytesIO
+
+import pytest
+from docx import Document
+
+from src.api.v1.day_off.errors import ReportRendererBusy, ReportRenderTimeout
+from src.api.v1.day_off.report_renderer import ReportRenderer
+
+
+@pytest.fixture
+def renderer():
+    renderer = ReportRenderer(max_workers=1, max_queue=0, timeout=5)
+    yield renderer
+    renderer.shutdown()
+
+
+async def test_report_is_rendered_in_worker_process(renderer):
+    report = await renderer.render({"department_user": "Отдел связи"})
+
+    text = "\n".join(paragraph.text for paragraph in Document(BytesIO(report)).paragraphs)
+    assert "Отдел связи" in text
+
+
+async def test_full_queue_rejects_new_reports(renderer):
+    slow = asyncio.ensure_future(renderer._run(time.sleep, 0.5))
+    await asyncio.sleep(0)
+
+    with pytest.raises(ReportRendererBusy):
+        await renderer._run(time.sleep, 0)
+
+    await slow
+
+
+async def test_slow_report_times_out_and_frees_its_slot(renderer):
+    renderer.timeout = 0.1
+
+    with pytest.raises(ReportRenderTimeout):
+        await renderer._run(time.sleep, 0.5)
+
+    await asyncio.sleep(0.8)
+    renderer.timeout = 5
+    assert await renderer._run(time.sleep, 0) is None
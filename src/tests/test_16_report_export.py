@@ -0,0 +1,108 @@
+import asyncio
+import zipfile
+from io import BytesIO
+
+import pytest
+from docx import Document
+
+from src.api.v1.day_off.errors import ReportRenderTimeout
+from src.api.v1.day_off.export import ERRORS_MANIFEST, stream_reports_zip
+from src.api.v1.day_off.report_renderer import ReportRenderer
+from src.models import Role
+
+
+class SlowFirstRenderer:
+    """Первый отчёт рендерится дольше остальных."""
+
+    max_workers = 3
+
+    def __init__(self):
+        self.calls = 0
+
+    async def render(self, data: dict) -> bytes:
+        self.calls += 1
+        await asyncio.sleep(0.2 if data["index"] == 0 else 0)
+        return f"report {data['index']}".encode()
+
+
+class FailingRenderer(SlowFirstRenderer):
+    """Один отчёт падает, как при таймауте рендера."""
+
+    async def render(self, data: dict) -> bytes:
+        if data["index"] == 2:
+            raise ReportRenderTimeout()
+        return await super().render(data)
+
+
+async def collect(stream) -> bytes:
+    return b"".join([chunk async for chunk in stream])
+
+
+async def test_archive_is_streamed_in_order():
+    reports = [(f"{index}.docx", {"index": index}) for index in range(5)]
+    renderer = SlowFirstRenderer()
+
+    chunks = [chunk async for chunk in stream_reports_zip(reports, renderer)]
+
+    assert len(chunks) == len(reports) + 1
+    with zipfile.ZipFile(BytesIO(b"".join(chunks))) as archive:
+        assert archive.namelist() == [name for name, _ in reports]
+        assert archive.read("0.docx") == b"report 0"
+        assert archive.read("4.docx") == b"report 4"
+
+
+async def test_reports_render_within_window():
+    reports = [(f"{index}.docx", {"index": index}) for index in range(5)]
+    renderer = SlowFirstRenderer()
+
+    stream = stream_reports_zip(reports, renderer)
+    await stream.__anext__()
+
+    # Пока ждём первый отчёт, остальные из окна уже рендерятся
+    assert renderer.calls == renderer.max_workers
+    await stream.aclose()
+
+
+async def test_archive_contains_rendered_documents():
+    renderer = ReportRenderer(max_workers=1, max_queue=0, timeout=10)
+    reports = [
+        ("first.docx", {"department_user": "Отдел связи"}),
+        ("second.docx", {"department_user": "Отдел кадров"}),
+    ]
+    try:
+        archive_bytes = await collect(stream_reports_zip(reports, renderer))
+    finally:
+        renderer.shutdown()
+
+    with zipfile.ZipFile(BytesIO(archive_bytes)) as archive:
+        document = Document(BytesIO(archive.read("second.docx")))
+    text = "\n".join(paragraph.text for paragraph in document.paragraphs)
+    assert "Отдел кадров" in text
+
+
+@pytest.mark.parametrize("count", [0, 1])
+async def test_small_archives_are_valid(count):
+    reports = [(f"{index}.docx", {"index": index}) for index in range(count)]
+
+    archive_bytes = await collect(stream_reports_zip(reports, SlowFirstRenderer()))
+
+    with zipfile.ZipFile(BytesIO(archive_bytes)) as archive:
+        assert len(archive.namelist()) == count
+
+
+async def test_failed_report_is_listed_instead_of_breaking_archive():
+    reports = [(f"{index}.docx", {"index": index}) for index in range(5)]
+
+    archive_bytes = await collect(stream_reports_zip(reports, FailingRenderer()))
+
+    with zipfile.ZipFile(BytesIO(archive_bytes)) as archive:
+        assert archive.testzip() is None
+        assert archive.namelist() == ["0.docx", "1.docx", "3.docx", "4.docx", ERRORS_MANIFEST]
+        assert archive.read(ERRORS_MANIFEST).decode().startswith("2.docx: ")
+
+
+async def test_export_is_rejected_for_users(client_as):
+    async with client_as(Role.USER) as client:
+        response = await client.get("/day_off/export")
+
+    assert response.status_code == 403
@@ -0,0 +1,98 @@
+import os
+
+import pytest
+
+from src.api.v1.day_off.report_cache import ReportCache, report_key
+from src.api.v1.day_off.report_renderer import ReportRenderer
+
+
+DATA = {
+    "date_day_off": "01.03.2025",
+    "info_overtimes": [{"hours": 8, "description": "Дежурство"}],
+    "department_user": "Отдел связи",
+}
+
+
+def test_key_depends_on_data_and_template():
+    key = report_key(DATA, "template:1")
+
+    assert key == report_key(dict(reversed(DATA.items())), "template:1")
+    assert key != report_key({**DATA, "department_user": "Отдел кадров"}, "template:1")
+    assert key != report_key(
+        {**DATA, "info_overtimes": [{"hours": 4, "description": "Дежурство"}]}, "template:1"
+    )
+    assert key != report_key(DATA, "template:2")
+
+
+def test_least_recently_used_report_is_evicted(tmp_path):
+    cache = ReportCache(tmp_path, max_bytes=25)
+    cache.put("a", b"x" * 10)
+    cache.put("b", b"x" * 10)
+    assert cache.get("a") == b"x" * 10
+
+    cache.put("c", b"x" * 10)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert not (tmp_path / "b.report").exists()
+    assert cache.size == 20
+
+
+def test_usage_order_survives_restart(tmp_path):
+    cache = ReportCache(tmp_path, max_bytes=100)
+    cache.put("old", b"x" * 10)
+    cache.put("new", b"x" * 10)
+    os.utime(tmp_path / "old.report", ns=(1, 1))
+
+    restarted = ReportCache(tmp_path, max_bytes=15)
+
+    assert restarted.get("old") is None
+    assert restarted.get("new") == b"x" * 10
+
+
+def test_file_removed_by_other_process_is_a_miss(tmp_path):
+    cache = ReportCache(tmp_path, max_bytes=100)
+    cache.put("a", b"report")
+    (tmp_path / "a.report").unlink()
+
+    assert cache.get("a") is None
+    assert cache.size == 0
+
+
+def test_disabled_cache_stores_nothing(tmp_path):
+    cache = ReportCache(tmp_path / "reports", max_bytes=0)
+    cache.put("a", b"report")
+
+    assert cache.get("a") is None
+    assert not (tmp_path / "reports").exists()
+
+
+@pytest.fixture
+def renderer(tmp_path):
+    renderer = ReportRenderer(
+        max_workers=1,
+        max_queue=0,
+        timeout=10,
+        cache=ReportCache(tmp_path, max_bytes=10 * 1024 * 1024),
+    )
+    yield renderer
+    renderer.shutdown()
+
+
+async def test_repeated_report_is_not_rendered_again(renderer):
+    first = await renderer.render(DATA)
+    calls = []
+    original_run = renderer._run
+
+    async def counting_run(func, *args):
+        calls.append(func)
+        return await original_run(func, *args)
+
+    renderer._run = counting_run
+
+    assert await renderer.render(DATA) == first
+    assert calls == []
+
+    await renderer.render({**DATA, "department_user": "Отдел кадров"})
+    assert len(calls) == 1
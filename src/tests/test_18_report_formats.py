@@ -0,0 +1,150 @@
+import threading
+import uuid
+from datetime import date, datetime
+from io import BytesIO
+from types import SimpleNamespace
+
+import pytest
+from docx import Document
+
+from src.api.v1.auth.dependencies import get_current_user
+from src.api.v1.day_off import report_renderer as report_renderer_module
+from src.api.v1.day_off.dependencies import day_off_by_oid
+from src.api.v1.day_off.errors import ReportFormatUnavailable
+from src.api.v1.day_off.generate_report import REPORT_FIELDS, Field, get_template
+from src.api.v1.day_off.report_formats import ReportFormat, render_report
+from src.api.v1.day_off.report_renderer import ReportRenderer
+from src.api.v1.day_off.repository import build_report_data
+from src.models import Role
+
+
+DATA = {
+    "date_report": "01.03.2024",
+    "date_day_off": "04.03.2024",
+    "info_overtimes": [
+        {"description": "Дежурство", "hours": 5},
+        {"description": "Выезд <на объект>", "hours": 3},
+    ],
+    "full_name_user": "И.И. Иванов",
+    "position_user": "Инженер",
+    "rank_user": "лейтенант",
+    "name_organization": "Управления",
+    "organization_name_boss": "Петрову П.П.",
+    "organization_position_boss": "Начальнику",
+    "organization_rank_boss": "полковнику",
+    "department_user": "Отдел связи",
+}
+
+
+def test_placeholders_are_indexed_once_per_template():
+    package = get_template().get()
+    fields = set().union(*(paragraph.fields for paragraph in package.paragraphs))
+
+    assert fields == set(REPORT_FIELDS)
+    # Плейсхолдер, разбитый Word на несколько runs, всё равно найден
+    rank = next(p for p in package.paragraphs if "organization_rank_boss" in p.fields)
+    assert rank.segments[0] == Field("organization_rank_boss")
+
+
+def test_report_fields_match_report_data():
+    organization = SimpleNamespace(
+        name_gent="Управления",
+        name_boss_datv="Петрову П.П.",
+        position_datv="начальнику",
+        rank_datv="полковнику",
+    )
+    data = build_report_data(
+        day_off=SimpleNamespace(create_at=datetime(2024, 3, 1), o_date=date(2024, 3, 4)),
+        user=SimpleNamespace(full_name="Иванов Иван Иванович", position="инженер", rank="Лейтенант"),
+        organization=organization,
+        department=SimpleNamespace(name="Отдел связи"),
+        info_overtimes=[],
+    )
+
+    assert tuple(data) == REPORT_FIELDS
+
+
+def test_report_data_needs_no_morphology_or_organization():
+    day_off = SimpleNamespace(create_at=datetime(2024, 3, 1), o_date=date(2024, 3, 4))
+    user = SimpleNamespace(full_name="Иванов Иван Иванович", position="инженер", rank="Лейтенант")
+    # Склонения ещё не посчитаны: подставляется именительный падеж
+    organization = SimpleNamespace(
+        name="Управление",
+        name_boss="Петров П.П.",
+        position="начальник",
+        rank="полковник",
+        name_gent=None,
+        name_boss_datv=None,
+        position_datv=None,
+        rank_datv=None,
+    )
+
+    data = build_report_data(
+        day_off=day_off, user=user, organization=organization, department=None, info_overtimes=[],
+    )
+    assert data["name_organization"] == "Управление"
+    assert data["organization_position_boss"] == "Начальник"
+    assert data["department_user"] == ""
+    assert organization.name_gent is None
+
+    orphan = build_report_data(
+        day_off=day_off, user=user, organization=None, department=None, info_overtimes=[],
+    )
+    assert orphan["name_organization"] == orphan["organization_rank_boss"] == ""
+
+
+def test_docx_report_has_every_placeholder_replaced():
+    report = render_report(DATA, ReportFormat.DOCX.value)
+
+    text = "\n".join(p.text for p in Document(BytesIO(report)).paragraphs)
+    assert "Прошу предоставить мне выходной день 04.03.2024" in text
+    assert "Дежурство - 5 ч.; Выезд <на объект> - 3 ч." in text
+    assert not any(field in text for field in REPORT_FIELDS)
+
+
+def test_html_report_is_built_without_docx():
+    report = render_report(DATA, ReportFormat.HTML.value).decode()
+
+    assert report.startswith("<!DOCTYPE html>")
+    assert "Выезд &lt;на объект&gt; - 3 ч." in report
+    assert "Начальнику Управления" in report
+    assert not any(field in report for field in REPORT_FIELDS)
+
+
+async def test_pdf_without_converter_is_rejected():
+    renderer = ReportRenderer(max_workers=1, max_queue=0, timeout=5, pdf_converter="no-such-converter")
+
+    with pytest.raises(ReportFormatUnavailable):
+        await renderer.render(DATA, ReportFormat.PDF)
+
+    assert renderer._executor is None
+
+
+async def test_html_report_is_rendered_off_the_event_loop(monkeypatch):
+    threads = []
+
+    def recording_render(data: dict, report_format: str, **options) -> bytes:
+        threads.append(threading.get_ident())
+        return b"<!DOCTYPE html>"
+
+    monkeypatch.setattr(report_renderer_module, "render_report", recording_render)
+    renderer = ReportRenderer(max_workers=1, max_queue=0, timeout=5)
+
+    assert await renderer.render(DATA, ReportFormat.HTML) == b"<!DOCTYPE html>"
+    assert threads and threads[0] != threading.get_ident()
+
+
+@pytest.mark.parametrize("role", [Role.USER, Role.MODERATOR])
+async def test_preview_of_someone_elses_day_off_is_rejected(client_as, role: Role):
+    day_off = SimpleNamespace(
+        oid=uuid.uuid4(),
+        user_oid=uuid.uuid4(),
+        user_rel=SimpleNamespace(department_oid=uuid.uuid4()),
+    )
+    current_user = SimpleNamespace(oid=uuid.uuid4(), role=role, department_oid=uuid.uuid4())
+    overrides = {day_off_by_oid: lambda: day_off, get_current_user: lambda: current_user}
+
+    async with client_as(role, department_oid=current_user.department_oid, overrides=overrides) as client:
+        response = await client.get(f"/day_off/preview_report/{day_off.oid}")
+
+    assert response.status_code == 403
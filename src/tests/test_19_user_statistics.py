@@ -0,0 +1,69 @@
+from datetime import date, timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models import DayOff, User
+from src.api.v1.overtime.balance import OvertimeBalanceRepository
+from src.api.v1.overtime.rollup import OvertimeRollupRepository
+from src.api.v1.user.repository import UserRepository
+
+
+async def seed(session: AsyncSession, user: User, overtime_factory) -> None:
+    session.add_all([
+        overtime_factory(user, date(2023, 12, 30), hours=4, remaining_hours=0),
+        overtime_factory(user, date(2024, 1, 10), hours=3, remaining_hours=3),
+        overtime_factory(user, date(2024, 1, 20), hours=5, remaining_hours=2),
+        overtime_factory(user, date(2024, 3, 1), hours=6, remaining_hours=6),
+        DayOff(user_oid=user.oid, o_date=date.today() - timedelta(days=1), reason="past"),
+        DayOff(user_oid=user.oid, o_date=date.today() + timedelta(days=1), reason="future"),
+    ])
+    await session.commit()
+    await OvertimeBalanceRepository(session).rebuild(user_oid=user.oid)
+    await OvertimeRollupRepository(session).rebuild(user_oid=user.oid)
+
+
+async def test_statistics_are_read_in_one_statement(
+    async_db_session: AsyncSession,
+    user_factory,
+    overtime_factory,
+    count_statements,
+):
+    user = await user_factory(async_db_session, username="statistics_user")
+    await seed(async_db_session, user, overtime_factory)
+
+    with count_statements(async_db_session.bind) as statements:
+        statistics = await UserRepository(async_db_session).get_statistics_current_user(user)
+
+    assert len(statements) == 1
+    assert statistics == {
+        "years": [2023, 2024],
+        "selected_year": 2024,
+        "overtime": {
+            "total": 4,
+            "used": 1,
+            "remaining": 3,
+            "total_remaining_hours": 11,
+            "monthly": {1: 8, 3: 6},
+        },
+        "day_off": {"total": 2, "used": 1, "remaining": 1},
+    }
+
+
+async def test_statistics_for_selected_and_empty_years(
+    async_db_session: AsyncSession,
+    user_factory,
+    overtime_factory,
+):
+    user = await user_factory(async_db_session, username="statistics_user")
+    repository = UserRepository(async_db_session)
+
+    empty = await repository.get_statistics_current_user(user)
+    assert empty["years"] == []
+    assert empty["selected_year"] == date.today().year
+    assert empty["overtime"]["monthly"] == {}
+    assert empty["overtime"]["total"] == 0
+
+    await seed(async_db_session, user, overtime_factory)
+    statistics = await repository.get_statistics_current_user(user, selected_year=2023)
+    assert statistics["selected_year"] == 2023
+    assert statistics["overtime"]["monthly"] == {12: 4}
@@ -0,0 +1,159 @@
+import json
+import random
+import uuid
+from datetime import date, timedelta
+
+from sqlalchemy import event, insert, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models import DayOff, Overtime, Role, User, WorkSchedule
+from src.api.v1.day_off.repository import DayOffRepository
+from src.api.v1.overtime.balance import OvertimeBalanceRepository
+from src.api.v1.overtime.rollup import OvertimeRollupRepository
+from src.api.v1.user.repository import UserRepository
+from src.middlewares.notification.repository import NotificationRepository
+
+
+USERS = 30
+OVERTIMES_PER_USER = 300
+DAY_OFFS_PER_USER = 40
+
+
+async def seed(session: AsyncSession) -> list[User]:
+    rnd = random.Random(7)
+    users = [
+        {
+            "oid": uuid.uuid4(),
+            "username": f"plan_user_{index}",
+            "full_name": "Plan User",
+            "position": "user",
+            "rank": "user",
+            "role": Role.USER,
+            "work_schedule": WorkSchedule.DAILY,
+            "hashed_password": "-",
+            "is_active": index % 3 != 0,
+        }
+        for index in range(USERS)
+    ]
+    await session.execute(insert(User), users)
+
+    overtimes, day_offs = [], []
+    for user in users:
+        for _ in range(OVERTIMES_PER_USER):
+            hours = rnd.choice((2, 4, 8))
+            is_used = rnd.random() < 0.8
+            overtimes.append({
+                "oid": uuid.uuid4(),
+                "user_oid": user["oid"],
+                "o_date": date(2022, 1, 1) + timedelta(days=rnd.randrange(3 * 365)),
+                "hours": hours,
+                "remaining_hours": 0 if is_used else hours,
+                "description": "plan",
+                "is_used": is_used,
+            })
+        for _ in range(DAY_OFFS_PER_USER):
+            day_offs.append({
+                "oid": uuid.uuid4(),
+                "user_oid": user["oid"],
+                "o_date": date(2022, 1, 1) + timedelta(days=rnd.randrange(3 * 365)),
+                "reason": "plan",
+                "is_approved": rnd.random() < 0.9,
+            })
+    await session.execute(insert(Overtime), overtimes)
+    await session.execute(insert(DayOff), day_offs)
+    await session.commit()
+    await OvertimeBalanceRepository(session).rebuild()
+    await OvertimeRollupRepository(session).rebuild()
+
+    for table in ("users", "overtimes", "day_offs", "overtime_balances", "overtime_monthly_rollups"):
+        await session.execute(text(f"ANALYZE {table}"))
+    return [await session.get(User, users[1]["oid"])]
+
+
+async def plan_of(session: AsyncSession, call) -> list[dict]:
+    """
+    План последнего запроса, который отправил `call`. Последовательное
+    чтение запрещено, чтобы на маленьких таблицах было видно, может ли
+    запрос вообще использовать индекс.
+    """
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    await session.execute(text("SET enable_seqscan = off"))
+    engine = session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        await call()
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    statement, parameters = statements[-1]
+    connection = await session.connection()
+    result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    nodes, stack = [], [plan[0]["Plan"]]
+    while stack:
+        node = stack.pop()
+        nodes.append(node)
+        stack.extend(node.get("Plans", []))
+    return nodes
+
+
+def used_indexes(nodes: list[dict]) -> set[str]:
+    return {node["Index Name"] for node in nodes if "Index Name" in node}
+
+
+async def test_statistics_do_not_scan_raw_overtimes(async_db_session: AsyncSession):
+    [user] = await seed(async_db_session)
+
+    nodes = await plan_of(
+        async_db_session,
+        lambda: UserRepository(async_db_session).get_statistics_current_user(user, selected_year=2023),
+    )
+
+    assert "pk__overtime_monthly_rollups" in used_indexes(nodes)
+    assert "ix_day_offs_user_oid_o_date" in used_indexes(nodes)
+    # Из сырых овертаймов читаются только неиспользованные, по частичному индексу
+    assert "ix_overtimes_user_oid_o_date_unused" in used_indexes(nodes)
+    assert "ix_overtimes_user_oid_o_date" not in used_indexes(nodes)
+    assert not any(node["Node Type"] == "Seq Scan" for node in nodes)
+
+
+async def test_available_overtimes_use_partial_index(async_db_session: AsyncSession):
+    [user] = await seed(async_db_session)
+
+    nodes = await plan_of(
+        async_db_session,
+        lambda: DayOffRepository(async_db_session).get_available_overtimes(user.oid),
+    )
+
+    # Форма плана (bitmap scan и Sort или index scan по порядку o_date)
+    # зависит от объёма данных, поэтому проверяется только индекс
+    assert "ix_overtimes_user_oid_o_date_unused" in used_indexes(nodes)
+
+
+async def test_unapproved_day_offs_use_partial_index(async_db_session: AsyncSession):
+    [user] = await seed(async_db_session)
+
+    nodes = await plan_of(
+        async_db_session,
+        lambda: DayOffRepository(async_db_session).count_notifications_stmt_is_unapproved(user),
+    )
+
+    assert "ix_day_offs_user_oid_unapproved" in used_indexes(nodes)
+
+
+async def test_inactive_users_use_partial_index(async_db_session: AsyncSession):
+    await seed(async_db_session)
+
+    nodes = await plan_of(
+        async_db_session,
+        lambda: NotificationRepository(async_db_session).get_inactive_users_count(),
+    )
+
+    assert "ix_users_department_oid_inactive" in used_indexes(nodes)
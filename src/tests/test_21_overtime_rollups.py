@@ -0,0 +1,62 @@
+import uuid
+from datetime import date
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models import OvertimeMonthlyRollup
+from src.api.v1.overtime.rollup import OvertimeRollupRepository
+from src.api.v1.overtime.schemas import OvertimeCreate, OvertimeUpdate, OvertimeUpdatePartial
+from src.api.v1.overtime.service import OvertimeService
+
+
+async def rollups_of(session: AsyncSession, user_oid: uuid.UUID) -> dict[tuple[int, int], tuple[int, int]]:
+    # Колонки, а не сущности: строки из identity map не обновились бы после upsert,
+    # а expire_all сделал бы атрибуты пользователя ленивыми вне greenlet
+    rows = await session.execute(
+        select(
+            OvertimeMonthlyRollup.year,
+            OvertimeMonthlyRollup.month,
+            OvertimeMonthlyRollup.hours,
+            OvertimeMonthlyRollup.overtimes_count,
+        ).where(OvertimeMonthlyRollup.user_oid == user_oid)
+    )
+    return {(year, month): (hours, count) for year, month, hours, count in rows}
+
+
+async def test_rollups_follow_overtime_writes(async_db_session: AsyncSession, user_factory):
+    user = await user_factory(async_db_session, username="rollup_user")
+    overtimes = OvertimeService(async_db_session)
+
+    first = await overtimes.create(
+        current_user=user,
+        overtime_create=OvertimeCreate(o_date=date(2024, 1, 5), hours=6, description="first"),
+    )
+    second = await overtimes.create(
+        current_user=user,
+        overtime_create=OvertimeCreate(o_date=date(2024, 1, 20), hours=3, description="second"),
+    )
+    assert await rollups_of(async_db_session, user.oid) == {(2024, 1): (9, 2)}
+
+    # Перенос в другой месяц
+    await overtimes.modify(
+        overtime=await overtimes.get_one(oid=second.oid),
+        overtime_update=OvertimeUpdatePartial(o_date=date(2024, 2, 1)),
+        partial=True,
+    )
+    assert await rollups_of(async_db_session, user.oid) == {(2024, 1): (6, 1), (2024, 2): (3, 1)}
+
+    # Изменение часов внутри месяца
+    await overtimes.replace(
+        overtime=await overtimes.get_one(oid=first.oid),
+        overtime_update=OvertimeUpdate(o_date=date(2024, 1, 6), hours=4, description="first"),
+    )
+    assert await rollups_of(async_db_session, user.oid) == {(2024, 1): (4, 1), (2024, 2): (3, 1)}
+
+    # Опустевший месяц удаляется
+    await overtimes.delete(overtime=await overtimes.get_one(oid=first.oid))
+    assert await rollups_of(async_db_session, user.oid) == {(2024, 2): (3, 1)}
+
+    rebuilt = await OvertimeRollupRepository(async_db_session).rebuild(user_oid=user.oid)
+    assert rebuilt == 1
+    assert await rollups_of(async_db_session, user.oid) == {(2024, 2): (3, 1)}
@@ -0,0 +1,123 @@
+import uuid
+from datetime import date
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models import Department, DayOff, Organization, Role
+from src.api.v1.analytics.cache import analytics_cache
+from src.api.v1.analytics.schemas import AnalyticsScope
+from src.api.v1.analytics.service import AnalyticsService
+from src.api.v1.overtime.balance import OvertimeBalanceRepository
+from src.api.v1.overtime.rollup import OvertimeRollupRepository
+
+
+async def seed(
+    session: AsyncSession,
+    user_factory,
+    overtime_factory,
+) -> tuple[Organization, Department, Department]:
+    organization = Organization(name="Analytics Org", name_boss="Boss", position="boss", rank="boss")
+    session.add(organization)
+    await session.flush()
+    first = Department(organization_oid=organization.oid, name="Analytics A", description="a")
+    second = Department(organization_oid=organization.oid, name="Analytics B", description="b")
+    session.add_all([first, second])
+    await session.flush()
+
+    alice, bob, carol = [
+        await user_factory(
+            session,
+            username=username,
+            organization_oid=organization.oid,
+            department_oid=department.oid,
+        )
+        for username, department in (("alice", first), ("bob", first), ("carol", second))
+    ]
+
+    session.add_all([
+        overtime_factory(alice, date(2023, 12, 30), hours=4, remaining_hours=0),
+        overtime_factory(alice, date(2024, 1, 10), hours=3, remaining_hours=3),
+        overtime_factory(bob, date(2024, 1, 20), hours=5, remaining_hours=2),
+        overtime_factory(carol, date(2024, 3, 1), hours=6, remaining_hours=6),
+        DayOff(user_oid=alice.oid, o_date=date(2024, 2, 1), reason="a"),
+        DayOff(user_oid=bob.oid, o_date=date(2024, 2, 2), reason="b"),
+        DayOff(user_oid=carol.oid, o_date=date(2025, 1, 1), reason="c"),
+    ])
+    await session.commit()
+    await OvertimeBalanceRepository(session).rebuild()
+    await OvertimeRollupRepository(session).rebuild()
+    return organization, first, second
+
+
+async def test_department_and_organization_summaries(
+    async_db_session: AsyncSession,
+    user_factory,
+    overtime_factory,
+):
+    analytics_cache.clear()
+    organization, first, _ = await seed(async_db_session, user_factory, overtime_factory)
+    service = AnalyticsService(async_db_session)
+
+    department = await service.get_summary(AnalyticsScope.DEPARTMENT, first.oid, 2024)
+    assert department.users == 2
+    assert department.overtime.total_hours == 8
+    assert department.overtime.overtimes_count == 2
+    assert department.overtime.monthly == {1: 8}
+    assert department.balance.remaining_hours == 5
+    assert department.day_offs.total == 2
+    assert department.day_offs.monthly == {2: 2}
+    assert [row.full_name for row in department.top_balances] == ["Alice", "Bob"]
+
+    whole = await service.get_summary(AnalyticsScope.ORGANIZATION, organization.oid, 2024)
+    assert whole.users == 3
+    assert whole.overtime.monthly == {1: 8, 3: 6}
+    assert whole.balance.total_hours == 18
+    assert whole.balance.remaining_hours == 11
+    assert whole.day_offs.total == 2
+    assert whole.top_balances[0].full_name == "Carol"
+
+
+async def test_summary_is_cached_per_scope_and_year(
+    async_db_session: AsyncSession,
+    user_factory,
+    overtime_factory,
+):
+    analytics_cache.clear()
+    _, first, _ = await seed(async_db_session, user_factory, overtime_factory)
+    service = AnalyticsService(async_db_session)
+
+    cached = await service.get_summary(AnalyticsScope.DEPARTMENT, first.oid, 2024)
+    async_db_session.add(DayOff(user_oid=cached.top_balances[0].user_oid, o_date=date(2024, 5, 1), reason="new"))
+    await async_db_session.commit()
+
+    assert await service.get_summary(AnalyticsScope.DEPARTMENT, first.oid, 2024) is cached
+
+    analytics_cache.invalidate((AnalyticsScope.DEPARTMENT, first.oid, 2024))
+    fresh = await service.get_summary(AnalyticsScope.DEPARTMENT, first.oid, 2024)
+    assert fresh.day_offs.total == 3
+
+    other_year = await service.get_summary(AnalyticsScope.DEPARTMENT, first.oid, 2023)
+    assert other_year.overtime.monthly == {12: 4}
+
+
+@pytest.mark.parametrize("path", ["/analytics/department", "/analytics/organization"])
+async def test_users_cannot_read_analytics(client_as, path: str):
+    # Даже по собственному отделу
+    department_oid = uuid.uuid4()
+
+    async with client_as(Role.USER, department_oid=department_oid) as client:
+        response = await client.get(f"{path}/{department_oid}")
+
+    assert response.status_code == 403
+
+
+async def test_moderator_is_limited_to_own_department(client_as):
+    department_oid = uuid.uuid4()
+
+    async with client_as(Role.MODERATOR, department_oid=department_oid) as client:
+        other_department = await client.get(f"/analytics/department/{uuid.uuid4()}")
+        organization = await client.get(f"/analytics/organization/{uuid.uuid4()}")
+
+    assert other_department.status_code == 403
+    assert organization.status_code == 403